@@ -1,10 +1,11 @@
 import logging
 
-from typing import List
+from typing import List, Optional
 
 from classy_fastapi import post
 from classy_fastapi.decorators import get
 from neuroglia.data.queries.generic import GetByIdQuery, ListQuery
+from neuroglia.data.queryable import QueryPage
 from neuroglia.dependency_injection.service_provider import ServiceProviderBase
 from neuroglia.mapping.mapper import Mapper
 from neuroglia.mediation.mediator import Mediator
@@ -34,6 +35,11 @@ class PersonsController(ControllerBase):
         log.debug("get all persons")
         return self.process(await self.mediator.execute_async(ListQuery[PersonDto, str]()))
 
+    @get("/page", response_model=QueryPage[PersonDto], responses=ControllerBase.error_responses)
+    async def list_persons_page(self, limit: int = 50, next_token: Optional[str] = None) -> QueryPage[PersonDto]:
+        ''' Lists registered persons, one page at a time. Pass the 'next_token' of a page to get the next one '''
+        return self.process(await self.mediator.execute_async(ListQuery[PersonDto, str](limit, next_token)))
+
     @get("/byid/{id}", response_model=PersonDto, responses=ControllerBase.error_responses)
     async def get_person_by_id(self, id: str) -> PersonDto:
         ''' Gets the person with the specified id '''
@@ -11,10 +11,11 @@ from neuroglia.hosting.configuration.data_access_layer import DataAccessLayer
 from neuroglia.hosting.web import ExceptionHandlingMiddleware, WebApplicationBuilder
 from neuroglia.log.logger import configure_logging
 from neuroglia.mapping.mapper import Mapper
-from neuroglia.mediation.mediator import Mediator, RequestHandler
+from neuroglia.data.queries.generic import GetByIdQuery, ListQuery
+from neuroglia.mediation.mediator import Mediator, MediatorOptions, RequestHandler
 from neuroglia.serialization.json import JsonSerializer
 
-from samples.openbank.application.queries.account_by_owner import AccountsByOwnerQueryHandler
+from samples.openbank.application.queries.account_by_owner import AccountsByOwnerQuery, AccountsByOwnerQueryHandler
 
 
 configure_logging()
@@ -28,7 +29,7 @@ application_module = "samples.openbank.application"
 builder = WebApplicationBuilder()
 
 Mapper.configure(builder, [application_module])
-Mediator.configure(builder, [application_module])
+Mediator.configure(builder, [application_module], MediatorOptions(coalesced_query_types={GetByIdQuery, ListQuery, AccountsByOwnerQuery}))
 JsonSerializer.configure(builder)
 builder.services.add_transient(RequestHandler, AccountsByOwnerQueryHandler)  # todo: remove when mediator is fixed
 CloudEventIngestor.configure(builder, ["samples.openbank.application.events.integration"])
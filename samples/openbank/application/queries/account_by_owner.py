@@ -22,6 +22,5 @@ class AccountsByOwnerQueryHandler(QueryHandler[AccountsByOwnerQuery, OperationRe
     repository: QueryableRepository[BankAccountDto, str]
 
     async def handle_async(self, query: AccountsByOwnerQuery) -> OperationResult[BankAccountDto]:
-        res = (await self.repository.query_async()).where(lambda u: u.owner_id == query.owner_id)
-        print(res)
-        return self.ok(res.to_list())
+        accounts_by_owner = await self.repository.compile_query_async(lambda q, owner_id: q.where(lambda u: u.owner_id == owner_id))
+        return self.ok(await accounts_by_owner.to_list_async(owner_id=query.owner_id))
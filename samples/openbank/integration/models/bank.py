@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 from decimal import Decimal
-from neuroglia.data.abstractions import Identifiable, queryable
+from neuroglia.data.abstractions import Identifiable, index, queryable
 
 
 @queryable
+@index("owner_id")
 @dataclass
 class BankAccountDto(Identifiable):
 
@@ -21,5 +21,5 @@ class ProblemDetails:
     instance: Optional[str] = None
     '''A URI reference that identifies the specific occurrence of the problem.'''
     
-    def is_success_status_code(self) -> bool: self.status >= 200 and self.status < 300
+    def is_success_status_code(self) -> bool: return self.status >= 200 and self.status < 300
     ''' Determines whether the operation is successfull or not '''
\ No newline at end of file
@@ -1,6 +1,7 @@
 from abc import ABC
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Generic, List, Type, TypeVar
+from typing import Generic, List, Optional, Tuple, Type, TypeVar
 
 TKey = TypeVar("TKey")
 ''' Represents the generic argument used to specify the type of key to use '''
@@ -122,3 +123,43 @@ TAggregate = TypeVar("TAggregate", bound=AggregateRoot)
 def queryable(cls):
     cls.__queryable__ = True
     return cls
+
+
+@dataclass
+class IndexDefinition:
+    ''' Represents the definition of an index declared on a type of entity '''
+
+    fields: List[Tuple[str, int]]
+    ''' Gets a list containing the path and the sort direction (1 for ascending, -1 for descending) of the indexed fields, in order '''
+
+    unique: bool = False
+    ''' Gets a boolean indicating whether or not the index enforces the uniqueness of the indexed values '''
+
+    expire_after_seconds: Optional[int] = None
+    ''' Gets the number of seconds after which entities expire, based on the date of their single indexed field, if any '''
+
+    name: Optional[str] = None
+    ''' Gets the name of the index, if any. Defaults to a name computed based on the indexed fields '''
+
+
+def index(*fields: str, unique: bool = False, expire_after_seconds: Optional[int] = None, name: Optional[str] = None):
+    ''' Declares an index on the decorated type. Fields are dotted paths, prefixed with '-' to sort them in descending order. The decorator can be applied several times to declare several indexes
+
+        Args:
+            fields (str): the paths of the fields to index, in order. Several fields declare a compound index
+            unique (bool): a boolean indicating whether or not the index enforces the uniqueness of the indexed values
+            expire_after_seconds (Optional[int]): the number of seconds after which entities expire, based on the date of the single indexed field. Declares a TTL index
+            name (Optional[str]): the name of the index, if any
+    '''
+    if len(fields) < 1:
+        raise Exception("An index must define at least one field")
+    if expire_after_seconds is not None and len(fields) != 1:
+        raise Exception("An index that expires entities must define exactly one field")
+    definition = IndexDefinition([(field[1:], -1) if field.startswith('-') else (field, 1) for field in fields], unique, expire_after_seconds, name)
+
+    def decorator(cls):
+        # Indexes are copied rather than appended to, so that the indexes declared on a type are not shared with its base types
+        cls.__indexes__ = [*getattr(cls, "__indexes__", []), definition]
+        return cls
+
+    return decorator
@@ -1,7 +1,61 @@
 from abc import ABC, abstractmethod
-from typing import Generic, List, Optional
+from dataclasses import dataclass
+from types import CodeType
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
 from neuroglia.data.abstractions import TEntity, TKey
-from neuroglia.data.queryable import Queryable
+from neuroglia.data.queryable import CompiledQuery, Queryable
+
+
+@dataclass
+class BulkOperationError:
+    ''' Represents an error that occurred while processing one of the items of a bulk operation '''
+
+    index: int
+    ''' Gets the index, in the bulk operation, of the item the error relates to '''
+
+    id: Any
+    ''' Gets the id of the entity the error relates to '''
+
+    message: str
+    ''' Gets a message that describes the error '''
+
+
+class BulkOperationException(Exception):
+    ''' Represents the exception raised when one or more items of a bulk operation could not be processed '''
+
+    def __init__(self, errors: List[BulkOperationError], processed_count: int):
+        super().__init__(f"Failed to process {len(errors)} item(s) of the bulk operation: {'; '.join(f'[{error.index}] {error.message}' for error in errors[:10])}")
+        self.errors = errors
+        self.processed_count = processed_count
+
+    errors: List[BulkOperationError]
+    ''' Gets the errors that occurred, ordered by item index '''
+
+    processed_count: int
+    ''' Gets the number of items that have been successfully processed '''
+
+
+class OptimisticConcurrencyException(Exception):
+    ''' Represents the exception raised when an entity could not be persisted because it has been modified concurrently since it was read '''
+
+    def __init__(self, id: Any, expected_version: int, actual_version: Optional[int] = None):
+        super().__init__(f"Failed to persist the entity with id '{id}': expected version '{expected_version}', but the stored version is '{actual_version}'")
+        self.id = id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+    id: Any
+    ''' Gets the id of the entity that could not be persisted '''
+
+    expected_version: int
+    ''' Gets the version the entity was expected to have '''
+
+    actual_version: Optional[int]
+    ''' Gets the version of the stored entity, if known '''
+
+
+TItem = TypeVar("TItem")
+''' Represents the generic argument used to specify the type of items processed by a bulk operation '''
 
 
 class Repository(Generic[TEntity, TKey], ABC):
@@ -13,8 +67,8 @@ class Repository(Generic[TEntity, TKey], ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    async def get_async(self, id: TKey) -> Optional[TEntity]:
-        ''' Gets the entity with the specified id, if any '''
+    async def get_async(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TEntity]:
+        ''' Gets the entity with the specified id, if any. If fields are specified, only the entity's specified attributes, and its id, need to be loaded, for example to avoid transferring large embedded collections: the other attributes of the returned entity are then unset '''
         raise NotImplementedError()
 
     @abstractmethod
@@ -32,6 +86,33 @@ class Repository(Generic[TEntity, TKey], ABC):
         ''' Removes the entity with the specified key '''
         raise NotImplementedError()
 
+    async def add_many_async(self, entities: List[TEntity], ordered: bool = True) -> List[TEntity]:
+        ''' Adds the specified entities. When ordered, stops at the first entity that cannot be added, otherwise attempts to add all of them. Raises a BulkOperationException if any entity could not be added '''
+        return await self._process_many_async(entities, self.add_async, lambda entity: entity.id, ordered)
+
+    async def update_many_async(self, entities: List[TEntity], ordered: bool = True) -> List[TEntity]:
+        ''' Persists the changes that were made to the specified entities. When ordered, stops at the first entity that cannot be updated, otherwise attempts to update all of them. Raises a BulkOperationException if any entity could not be updated '''
+        return await self._process_many_async(entities, self.update_async, lambda entity: entity.id, ordered)
+
+    async def remove_many_async(self, ids: List[TKey], ordered: bool = True) -> None:
+        ''' Removes the entities with the specified keys. When ordered, stops at the first entity that cannot be removed, otherwise attempts to remove all of them. Raises a BulkOperationException if any entity could not be removed '''
+        await self._process_many_async(ids, self.remove_async, lambda id: id, ordered)
+
+    async def _process_many_async(self, items: List[TItem], operation: Callable[[TItem], Awaitable[Any]], get_id: Callable[[TItem], Any], ordered: bool) -> List[Any]:
+        ''' Processes the specified items one by one, collecting the errors that occur, if any '''
+        results = list[Any]()
+        errors = list[BulkOperationError]()
+        for index, item in enumerate(items):
+            try:
+                results.append(await operation(item))
+            except Exception as ex:
+                errors.append(BulkOperationError(index, get_id(item), str(ex)))
+                if ordered:
+                    break
+        if len(errors) > 0:
+            raise BulkOperationException(errors, len(results))
+        return results
+
 
 class QueryableRepository(Generic[TEntity, TKey], Repository[TEntity, TKey], ABC):
     ''' Defines the fundamentals of a queryable repository '''
@@ -40,6 +121,17 @@ class QueryableRepository(Generic[TEntity, TKey], Repository[TEntity, TKey], ABC
     async def query_async(self) -> Queryable[TEntity]:
         raise NotImplementedError()
 
+    async def compile_query_async(self, query: Callable[..., Queryable[TEntity]]) -> CompiledQuery[TEntity]:
+        ''' Compiles the query built by the specified function, which is called with the repository's queryable and a QueryParameter for each of its other arguments. Compiled queries are cached by the code object of the function, so that handlers can compile their queries on every request at no cost. Functions that capture variables are compiled on every call rather than cached, since the values they capture are part of the compiled query: pass them as arguments instead '''
+        if len(query.__code__.co_freevars) > 0:
+            return (await self.query_async()).compile_query(query)
+        compiled_queries: Dict[CodeType, CompiledQuery[TEntity]] = self.__dict__.setdefault('_compiled_queries', dict[CodeType, CompiledQuery[TEntity]]())
+        compiled_query = compiled_queries.get(query.__code__)
+        if compiled_query is None:
+            compiled_query = (await self.query_async()).compile_query(query)
+            compiled_queries[query.__code__] = compiled_query
+        return compiled_query
+
 
 class FlexibleRepository(Generic[TEntity, TKey], Repository[TEntity, TKey], ABC):
     ''' Defines the fundamentals of a flexible repository '''
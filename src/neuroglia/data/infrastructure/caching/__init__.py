@@ -0,0 +1 @@
+from .caching_repository import CachingRepository as CachingRepository, CachingRepositoryOptions as CachingRepositoryOptions
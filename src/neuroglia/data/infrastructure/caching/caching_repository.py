@@ -0,0 +1,215 @@
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Generic, Iterable, List, Optional, Type
+from neuroglia.data.abstractions import AggregateRoot, TEntity, TKey, VersionedState
+from neuroglia.data.infrastructure.abstractions import QueryableRepository, Repository
+from neuroglia.data.queryable import Queryable
+from neuroglia.dependency_injection.service_provider import ServiceActivationPlan, ServiceDescriptor, ServiceProviderBase
+from neuroglia.hosting.abstractions import ApplicationBuilderBase
+
+
+@dataclass
+class CachingRepositoryOptions(Generic[TEntity, TKey]):
+    ''' Represents the options used to configure a caching repository '''
+
+    capacity: int = 10000
+    ''' Gets the maximum number of entries to cache. The least recently used entries are evicted first '''
+
+    time_to_live: float = 60
+    ''' Gets the number of seconds after which cached entries expire '''
+
+    cache_negative_lookups: bool = True
+    ''' Gets a boolean indicating whether or not to cache the ids of the entities that could not be found '''
+
+
+@dataclass
+class _CacheEntry:
+    ''' Represents an entry of the cache of a caching repository '''
+
+    entity: Optional[Any]
+    ''' Gets a copy of the cached entity, or None if the entity could not be found '''
+
+    cached: bool
+    ''' Gets a boolean indicating whether or not the entry caches a lookup. Entries that do not are left by the invalidation of an entity, to reject the results of the lookups that were pending when it was modified '''
+
+    expires_at: float
+    ''' Gets the monotonic time at which the entry expires '''
+
+    generation: int
+    ''' Gets the generation of the cache at which the entity was last invalidated, if ever '''
+
+    version: Optional[int]
+    ''' Gets the highest known version of the entity, if it is versioned '''
+
+
+class CachingRepository(Generic[TEntity, TKey], QueryableRepository[TEntity, TKey]):
+    ''' Represents a repository that caches, in a bounded least recently used cache, the entities read from the repository it decorates
+
+        Entries expire after a configurable time, and are invalidated whenever the entities they cache are added, updated or removed through the caching repository. Entities read concurrently with a modification, or older than a version written since, are not cached. Entities are copied when cached and when returned, so that modifications made by callers never leak into the cache. Queries are not cached, and attributes the caching repository does not define are forwarded to the decorated repository
+    '''
+
+    def __init__(self, repository: Repository[TEntity, TKey], options: CachingRepositoryOptions[TEntity, TKey]):
+        self._repository = repository
+        self._options = options
+        self._entries = OrderedDict[TKey, _CacheEntry]()
+
+    _repository: Repository[TEntity, TKey]
+    ''' Gets the decorated repository '''
+
+    _options: CachingRepositoryOptions[TEntity, TKey]
+    ''' Gets the options used to configure the caching repository '''
+
+    _entries: OrderedDict[TKey, _CacheEntry]
+    ''' Gets a mapping of entity ids to their cache entry, from the least to the most recently used '''
+
+    _generation: int = 0
+    ''' Gets the generation of the cache, which is incremented whenever an entity is invalidated '''
+
+    _evicted_generation: int = 0
+    ''' Gets the highest generation of the evicted entries. Lookups started before it cannot tell whether the entity they read has been invalidated since, and are not cached '''
+
+    hits: int = 0
+    ''' Gets the number of lookups that have been served from the cache '''
+
+    misses: int = 0
+    ''' Gets the number of lookups that have been forwarded to the decorated repository '''
+
+    evictions: int = 0
+    ''' Gets the number of cached entries that have been evicted to make room for new ones '''
+
+    async def contains_async(self, id: TKey) -> bool:
+        entry = self._get_entry(id)
+        if entry is not None:
+            return entry.entity is not None
+        return await self._repository.contains_async(id)
+
+    async def get_async(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TEntity]:
+        entry = self._get_entry(id)
+        if entry is not None:
+            return copy.deepcopy(entry.entity)
+        generation = self._generation
+        entity = await self._repository.get_async(id, fields)
+        if fields is None:
+            self._put(id, entity, generation)
+        return entity
+
+    async def add_async(self, entity: TEntity) -> TEntity:
+        try:
+            return await self._repository.add_async(entity)
+        finally:
+            self._invalidate(entity.id, self._get_version(entity))
+
+    async def update_async(self, entity: TEntity) -> TEntity:
+        try:
+            return await self._repository.update_async(entity)
+        finally:
+            self._invalidate(entity.id, self._get_version(entity))
+
+    async def remove_async(self, id: TKey) -> None:
+        try:
+            await self._repository.remove_async(id)
+        finally:
+            self._invalidate(id)
+
+    async def add_many_async(self, entities: List[TEntity], ordered: bool = True) -> List[TEntity]:
+        try:
+            return await self._repository.add_many_async(entities, ordered)
+        finally:
+            self._invalidate_many(entities)
+
+    async def update_many_async(self, entities: List[TEntity], ordered: bool = True) -> List[TEntity]:
+        try:
+            return await self._repository.update_many_async(entities, ordered)
+        finally:
+            self._invalidate_many(entities)
+
+    async def remove_many_async(self, ids: List[TKey], ordered: bool = True) -> None:
+        try:
+            await self._repository.remove_many_async(ids, ordered)
+        finally:
+            for id in ids:
+                self._invalidate(id)
+
+    async def query_async(self) -> Queryable[TEntity]:
+        if not isinstance(self._repository, QueryableRepository):
+            raise Exception(f"The repository of type '{type(self._repository).__name__}' is not queryable")
+        return await self._repository.query_async()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._repository, name)
+
+    def _get_entry(self, id: TKey) -> Optional[_CacheEntry]:
+        ''' Gets the unexpired entry that caches the lookup of the entity with the specified id, if any, and records the hit or the miss '''
+        entry = self._entries.get(id)
+        if entry is None or not entry.cached or entry.expires_at <= time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(id)
+        self.hits += 1
+        return entry
+
+    def _put(self, id: TKey, entity: Optional[TEntity], generation: int):
+        ''' Caches the specified result of a lookup started at the specified generation, unless the entity has been invalidated since or is older than its highest known version '''
+        if entity is None and not self._options.cache_negative_lookups:
+            return
+        entry = self._entries.get(id)
+        if generation < self._evicted_generation or (entry is not None and entry.generation > generation):
+            return
+        version = self._get_version(entity)
+        if entry is not None and entry.version is not None and version is not None and version < entry.version:
+            return
+        self._set_entry(id, _CacheEntry(copy.deepcopy(entity), True, time.monotonic() + self._options.time_to_live, entry.generation if entry is not None else 0, version))
+
+    def _invalidate(self, id: TKey, version: Optional[int] = None):
+        ''' Invalidates the entry of the entity with the specified id, if any, recording the generation of the invalidation and the highest known version of the entity '''
+        self._generation += 1
+        entry = self._entries.get(id)
+        if entry is not None and entry.version is not None:
+            version = entry.version if version is None else max(version, entry.version)
+        self._set_entry(id, _CacheEntry(None, False, 0, self._generation, version))
+
+    def _invalidate_many(self, entities: Iterable[TEntity]):
+        for entity in entities:
+            self._invalidate(entity.id, self._get_version(entity))
+
+    def _set_entry(self, id: TKey, entry: _CacheEntry):
+        self._entries[id] = entry
+        self._entries.move_to_end(id)
+        while len(self._entries) > self._options.capacity:
+            _, evicted_entry = self._entries.popitem(last=False)
+            self._evicted_generation = max(self._evicted_generation, evicted_entry.generation)
+            if evicted_entry.cached:
+                self.evictions += 1
+
+    def _get_version(self, entity: Optional[TEntity]) -> Optional[int]:
+        if isinstance(entity, VersionedState):
+            return entity.state_version
+        elif isinstance(entity, AggregateRoot):
+            return entity.state.state_version
+        return None
+
+    @staticmethod
+    def configure(builder: ApplicationBuilderBase, entity_type: Type, key_type: Type, options: Optional[CachingRepositoryOptions] = None) -> ApplicationBuilderBase:
+        ''' Configures the specified application to cache the entities read from the repository used to manage the specified type of entity, which must have been configured beforehand '''
+        service_type = Repository[entity_type, key_type]
+        index = next((index for index, descriptor in enumerate(builder.services) if descriptor.service_type == service_type), None)
+        if index is None:
+            raise Exception(f"Failed to find the repository used to manage entities of type '{entity_type.__name__}': it must be configured before being cached")
+        descriptor = builder.services[index]
+        builder.services.try_add_singleton(CachingRepositoryOptions[entity_type, key_type], singleton=options if options is not None else CachingRepositoryOptions[entity_type, key_type]())
+
+        def create_repository(provider: ServiceProviderBase) -> CachingRepository:
+            if descriptor.singleton is not None:
+                repository = descriptor.singleton
+            elif descriptor.implementation_factory is not None:
+                repository = descriptor.implementation_factory(provider)
+            else:
+                repository = ServiceActivationPlan.compile(descriptor.implementation_type).activate(provider, service_type)
+            return CachingRepository[entity_type, key_type](repository, provider.get_required_service(CachingRepositoryOptions[entity_type, key_type]))
+
+        builder.services[index] = ServiceDescriptor(service_type, implementation_factory=create_repository, lifetime=descriptor.lifetime)
+        return builder
@@ -0,0 +1 @@
+from .columnar_repository import ColumnarRepository as ColumnarRepository
@@ -0,0 +1,555 @@
+import ast
+import operator
+from ast import Attribute, BoolOp, Compare, Constant, Lambda, Name, UnaryOp, expr
+from inspect import isclass
+from types import UnionType
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, Type, Union, get_args, get_origin, get_type_hints
+from neuroglia.data.abstractions import TEntity, TKey
+from neuroglia.data.infrastructure.abstractions import QueryableRepository, Repository
+from neuroglia.data.infrastructure.memory.memory_repository import compile_lambda
+from neuroglia.data.queryable import T, QueryProvider, Queryable
+from neuroglia.hosting.abstractions import ApplicationBuilderBase
+
+try:
+    import numpy as np
+except ImportError as ex:
+    raise ImportError("The columnar repository requires numpy, which can be installed along with the 'columnar' extra") from ex
+
+
+class ColumnarColumn:
+    ''' Represents the values of an attribute of the entities stored by a ColumnarRepository, along with a mask of the rows that hold a value. Integers, floats and booleans are stored in native arrays, other values in object arrays '''
+
+    def __init__(self, name: str, python_type: Optional[type], capacity: int):
+        self.name = name
+        self.python_type = python_type
+        self.values = np.empty(capacity, dtype=_native_types.get(python_type, object))
+        self.valid = np.zeros(capacity, dtype=bool)
+
+    name: str
+    ''' Gets the name of the attribute the column stores '''
+
+    python_type: Optional[type]
+    ''' Gets the type of the values stored in a native array, if any. Columns fall back to object arrays as soon as they are assigned a value of another type, or one that does not fit in their native array '''
+
+    values: np.ndarray
+    ''' Gets the values of the column, by row. The values of the rows that are not valid are undefined '''
+
+    valid: np.ndarray
+    ''' Gets a mask of the rows that hold a value, as opposed to the rows whose value is None '''
+
+    def is_native(self) -> bool:
+        ''' Determines whether or not the column is stored in a native array '''
+        return self.values.dtype != object
+
+    def set(self, row: int, value: Any):
+        ''' Sets the value of the specified row '''
+        if value is None:
+            self.valid[row] = False
+            if not self.is_native():
+                self.values[row] = None
+            return
+        if self.is_native() and not _is_instance_of(value, self.python_type):
+            self._to_object()
+        try:
+            self.values[row] = value
+        except OverflowError:
+            self._to_object()
+            self.values[row] = value
+        self.valid[row] = True
+
+    def compact(self, rows: np.ndarray):
+        ''' Moves the values of the specified rows, in order, to the first rows of the column '''
+        self.values[:len(rows)] = self.values[rows]
+        self.valid[:len(rows)] = self.valid[rows]
+
+    def resize(self, capacity: int):
+        ''' Resizes the column to the specified capacity '''
+        values = np.empty(capacity, dtype=self.values.dtype)
+        values[:len(self.values)] = self.values
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:len(self.valid)] = self.valid
+        self.values, self.valid = values, valid
+
+    def get(self, rows: np.ndarray) -> List[Any]:
+        ''' Gets the values of the specified rows as Python values, None for the rows that hold no value '''
+        return [value if valid else None for value, valid in zip(self.values[rows].tolist(), self.valid[rows].tolist())]
+
+    def _to_object(self):
+        values = self.values.astype(object)
+        values[~self.valid] = None
+        self.values = values
+        self.python_type = None
+
+
+class ColumnarQuery(Generic[T], Queryable[T]):
+    ''' Represents a query on the entities stored by a ColumnarRepository '''
+
+    def __init__(self, query_provider: 'ColumnarQueryProvider', expression: Optional[expr] = None):
+        super().__init__(query_provider, expression)
+
+
+class ColumnarQueryProvider(QueryProvider):
+    ''' Represents the QueryProvider that executes queries on the columns of a ColumnarRepository: filters are evaluated as masks over whole columns, and entities are only hydrated for the rows of the results '''
+
+    def __init__(self, repository: 'ColumnarRepository'):
+        self._repository = repository
+
+    _repository: 'ColumnarRepository'
+    ''' Gets the repository to query '''
+
+    def create_query(self, element_type: Type, expression: expr) -> Queryable: return ColumnarQuery[element_type](self, expression)
+
+    def execute(self, expression: expr, query_type: Type) -> Any:
+        repository = self._repository
+        rows = repository._get_rows()
+        clauses = _get_clauses(expression)
+        projection: Optional[List[str]] = None
+        group_by: Optional[str] = None
+        sort_keys = list[Tuple[str, bool]]()
+        for index, (clause, args) in enumerate(clauses):
+            if clause in ("order_by", "order_by_descending"):
+                sort_keys.append((_get_field(args[0]), clause == "order_by_descending"))
+                if index + 1 < len(clauses) and clauses[index + 1][0] in ("order_by", "order_by_descending"):
+                    continue
+                rows = rows[self._sort(rows, sort_keys)]
+                sort_keys = list[Tuple[str, bool]]()
+            elif clause == "where":
+                rows = self._filter(rows, args[0])
+            elif clause == "first":
+                rows = (self._filter(rows, args[0]) if len(args) > 0 else rows)[:1]
+            elif clause == "last":
+                rows = (self._filter(rows, args[0]) if len(args) > 0 else rows)[-1:]
+            elif clause == "skip":
+                rows = rows[args[0].value:]
+            elif clause == "take":
+                rows = rows[:args[0].value]
+            elif clause == "select" and isinstance(args[0].body, ast.List):
+                projection = [_get_field(ast.Lambda(args=args[0].args, body=element)) for element in args[0].body.elts]
+            elif clause == "select" and isinstance(args[0].body, ast.Dict) and group_by is not None:
+                return self._group(rows, group_by, args[0])
+            elif clause == "group_by":
+                group_by = _get_field(args[0])
+            elif clause == "distinct_by":
+                _, first_rows = np.unique(self._rank(rows, _get_field(args[0])), return_index=True)
+                rows = rows[np.sort(first_rows)]
+            elif clause == "count":
+                return len(rows)
+            elif clause == "any":
+                return len(rows) > 0
+            elif clause in ("sum", "min", "max", "distinct"):
+                column = repository._get_column(_get_field(args[0]))
+                values = column.values[rows][column.valid[rows]]
+                if clause == "distinct":
+                    return list(dict.fromkeys(values.tolist()))
+                elif len(values) < 1:
+                    return 0 if clause == "sum" else None
+                return _to_python(values.sum() if clause == "sum" else values.min() if clause == "min" else values.max())
+            else:
+                raise Exception(f"The clause '{clause}' is not supported by the columnar query provider")
+        if group_by is not None:
+            raise Exception("Grouped sequences must be projected using 'select', with a lambda that returns a dictionary")
+        items = repository._hydrate(rows, projection)
+        type_ = query_type if isclass(query_type) or query_type == List else type(query_type)
+        if issubclass(type_, List):
+            return items
+        return items[0] if len(items) > 0 else None
+
+    def _filter(self, rows: np.ndarray, predicate: Lambda) -> np.ndarray:
+        ''' Filters the specified rows using the specified predicate. Conjuncts that cannot be evaluated on columns are evaluated on the entities of the rows that match the others '''
+        argument_name = predicate.args.args[0].arg
+        conjuncts = predicate.body.values if isinstance(predicate.body, BoolOp) and isinstance(predicate.body.op, ast.And) else [predicate.body]
+        unsupported_conjuncts = list[expr]()
+        for conjunct in conjuncts:
+            try:
+                mask = _MaskEvaluator(self._repository, rows, argument_name).evaluate(conjunct)
+            except _UnsupportedExpression:
+                unsupported_conjuncts.append(conjunct)
+                continue
+            rows = rows[mask]
+        if len(unsupported_conjuncts) > 0:
+            body = unsupported_conjuncts[0] if len(unsupported_conjuncts) == 1 else BoolOp(op=ast.And(), values=unsupported_conjuncts)
+            function = compile_lambda(Lambda(args=predicate.args, body=body))
+            mask = np.fromiter((_evaluate(function, entity) for entity in self._repository._hydrate(rows)), dtype=bool, count=len(rows))
+            rows = rows[mask]
+        return rows
+
+    def _sort(self, rows: np.ndarray, sort_keys: List[Tuple[str, bool]]) -> np.ndarray:
+        ''' Gets the order of the specified rows, given the specified keys, the first one being the primary key. Like in Mongo, null values come first '''
+        keys = list[np.ndarray]()
+        for field, descending in reversed(sort_keys):
+            ranks = self._rank(rows, field)
+            keys.append(-ranks if descending else ranks)
+        return np.lexsort(keys)
+
+    def _rank(self, rows: np.ndarray, field: str) -> np.ndarray:
+        ''' Gets the rank of the value of the specified field of the specified rows, -1 for the rows that hold no value. Equal values have the same rank '''
+        column = self._repository._get_column(field)
+        valid = column.valid[rows]
+        ranks = np.full(len(rows), -1, dtype=np.int64)
+        _, ranks[valid] = np.unique(column.values[rows][valid], return_inverse=True)
+        return ranks
+
+    def _group(self, rows: np.ndarray, group_by: str, projection: Lambda) -> List[Dict[str, Any]]:
+        ''' Groups the specified rows by the specified field, then computes the specified projection of each group '''
+        argument_name = projection.args.args[0].arg
+        keys, inverse = self._get_groups(rows, group_by)
+        group_count = len(keys)
+        results = [dict[str, Any]() for _ in range(group_count)]
+        for key_expression, value_expression in zip(projection.body.keys, projection.body.values):
+            if not isinstance(key_expression, Constant) or not isinstance(key_expression.value, str):
+                raise Exception(f"The keys of the projection '{ast.unparse(projection)}' must be string constants")
+            name = key_expression.value
+            if isinstance(value_expression, Attribute) and isinstance(value_expression.value, Name) and value_expression.value.id == argument_name and value_expression.attr == "key":
+                values = keys
+            elif isinstance(value_expression, ast.Call) and isinstance(value_expression.func, Attribute) and value_expression.func.attr == "count":
+                values = np.bincount(inverse, minlength=group_count).tolist()
+            elif isinstance(value_expression, ast.Call) and isinstance(value_expression.func, Attribute) and value_expression.func.attr in ("sum", "min", "max", "average") and len(value_expression.args) == 1:
+                values = self._aggregate(rows, inverse, group_count, value_expression.func.attr, _get_field(value_expression.args[0]))
+            else:
+                raise Exception(f"The expression '{ast.unparse(value_expression)}' cannot be computed on groups: group projections only support the key of the group and the 'count', 'sum', 'min', 'max' and 'average' aggregates")
+            for result, value in zip(results, values):
+                result[name] = value
+        return results
+
+    def _get_groups(self, rows: np.ndarray, field: str) -> Tuple[List[Any], np.ndarray]:
+        ''' Gets the distinct values of the specified field of the specified rows, in order of first occurrence, along with the index of the group of each row '''
+        column = self._repository._get_column(field)
+        valid = column.valid[rows]
+        if not column.is_native() or not valid.all():
+            # Sorting Python objects is slower than hashing them: they are grouped using a dictionary
+            groups = dict[Any, int]()
+            group_ids = np.fromiter((groups.setdefault(key, len(groups)) for key in column.get(rows)), dtype=np.int64, count=len(rows))
+            return list(groups.keys()), group_ids
+        keys, first_indexes, inverse = np.unique(column.values[rows], return_index=True, return_inverse=True)
+        order = np.argsort(first_indexes)
+        group_ids = np.empty(len(order), dtype=np.int64)
+        group_ids[order] = np.arange(len(order))
+        return keys[order].tolist(), group_ids[inverse]
+
+    def _aggregate(self, rows: np.ndarray, inverse: np.ndarray, group_count: int, aggregate: str, field: str) -> List[Any]:
+        ''' Computes the specified aggregate of the specified field for each group, using reductions over the values sorted by group '''
+        column = self._repository._get_column(field)
+        valid = column.valid[rows]
+        group_ids = inverse[valid]
+        values = column.values[rows][valid]
+        order = np.argsort(group_ids, kind="stable")
+        group_ids, values = group_ids[order], values[order]
+        results = [0 if aggregate == "sum" else None] * group_count
+        if len(values) < 1:
+            return results
+        starts = np.flatnonzero(np.concatenate(([True], group_ids[1:] != group_ids[:-1])))
+        ufunc = np.add if aggregate in ("sum", "average") else np.minimum if aggregate == "min" else np.maximum
+        reduced = ufunc.reduceat(values, starts).tolist()
+        counts = np.diff(np.append(starts, len(values))).tolist()
+        for group_id, value, count in zip(group_ids[starts].tolist(), reduced, counts):
+            results[group_id] = value / count if aggregate == "average" else value
+        return results
+
+
+class ColumnarRepository(Generic[TEntity, TKey], QueryableRepository[TEntity, TKey]):
+    ''' Represents a queryable repository that stores entities in memory, as NumPy arrays holding the values of each of their annotated attributes, for analytical queries that scan many entities
+
+        Filters, aggregates and sorts are evaluated on whole columns, and entities are only hydrated, without their constructor being invoked, for the rows of the results. Entities are stored, and returned by unordered queries, in the order they have been added. Attributes that are not annotated on the type of entity are not stored. Requires numpy
+    '''
+
+    def __init__(self):
+        self._rows = dict[TKey, int]()
+        self._ids = np.empty(_initial_capacity, dtype=object)
+        self._live = np.zeros(_initial_capacity, dtype=bool)
+
+    _columns: Optional[Dict[str, ColumnarColumn]] = None
+    ''' Gets a mapping of the annotated attributes of the type of entity to the column that stores their values, created on first use, since the type of entity is not yet known when the repository is initialized '''
+
+    _rows: Dict[TKey, int]
+    ''' Gets a mapping of the ids of the stored entities to the row that stores them '''
+
+    _ids: np.ndarray
+    ''' Gets the ids of the stored entities, by row '''
+
+    _live: np.ndarray
+    ''' Gets a mask of the rows that store an entity, as opposed to the rows of removed entities '''
+
+    _size: int = 0
+    ''' Gets the number of stored entities '''
+
+    _end: int = 0
+    ''' Gets the number of rows in use, including the rows of the removed entities that have not yet been compacted '''
+
+    async def contains_async(self, id: TKey) -> bool: return id in self._rows
+
+    async def get_async(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TEntity]:
+        row = self._rows.get(id)
+        if row is None:
+            return None
+        return self._hydrate(np.array([row]), ["id", *fields] if fields is not None else None)[0]
+
+    async def add_async(self, entity: TEntity) -> TEntity:
+        if entity.id in self._rows:
+            raise Exception(f"An entity with the same id '{entity.id}' already exists")
+        if self._end == len(self._ids):
+            self._resize(len(self._ids) * 2)
+        row = self._end
+        self._write(row, entity)
+        self._ids[row] = entity.id
+        self._live[row] = True
+        self._rows[entity.id] = row
+        self._size += 1
+        self._end += 1
+        return entity
+
+    async def update_async(self, entity: TEntity) -> TEntity:
+        row = self._rows.get(entity.id)
+        if row is None:
+            raise Exception(f"Failed to find an entity with the specified id '{entity.id}'")
+        self._write(row, entity)
+        return entity
+
+    async def remove_async(self, id: TKey) -> None:
+        row = self._rows.pop(id, None)
+        if row is None:
+            raise Exception(f"Failed to find an entity with the specified id '{id}'")
+        self._ids[row] = None
+        self._live[row] = False
+        self._size -= 1
+        # Rows are left empty rather than filled with the last one, to preserve the order of the stored entities, and compacted once most of them are empty
+        if self._size < self._end // 2:
+            self._compact()
+
+    async def query_async(self) -> Queryable[TEntity]: return ColumnarQuery[self._get_entity_type()](ColumnarQueryProvider(self))
+
+    def _get_entity_type(self) -> Type: return self.__orig_class__.__args__[0]
+
+    def _get_columns(self) -> Dict[str, ColumnarColumn]:
+        if self._columns is None:
+            self._columns = {name: ColumnarColumn(name, _get_native_type(attribute_type), len(self._ids)) for name, attribute_type in get_type_hints(self._get_entity_type()).items() if not name.startswith("_")}
+        return self._columns
+
+    def _get_column(self, name: str) -> ColumnarColumn:
+        column = self._get_columns().get(name)
+        if column is None:
+            raise Exception(f"The type '{self._get_entity_type().__name__}' has no annotated attribute '{name}'")
+        return column
+
+    def _write(self, row: int, entity: TEntity):
+        for name, column in self._get_columns().items():
+            column.set(row, getattr(entity, name, None))
+
+    def _get_rows(self) -> np.ndarray:
+        ''' Gets the rows that store an entity, in the order the entities have been added '''
+        if self._size == self._end:
+            return np.arange(self._end)
+        return np.flatnonzero(self._live[:self._end])
+
+    def _resize(self, capacity: int):
+        for column in self._get_columns().values():
+            column.resize(capacity)
+        ids = np.empty(capacity, dtype=object)
+        ids[:len(self._ids)] = self._ids
+        self._ids = ids
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(self._live)] = self._live
+        self._live = live
+
+    def _compact(self):
+        ''' Moves the stored entities, in order, to the first rows '''
+        rows = self._get_rows()
+        for column in self._get_columns().values():
+            column.compact(rows)
+        self._ids[:self._size] = self._ids[rows]
+        self._ids[self._size:self._end] = None
+        self._live[:self._size] = True
+        self._live[self._size:self._end] = False
+        self._end = self._size
+        self._rows = {id: row for row, id in enumerate(self._ids[:self._size].tolist())}
+
+    def _hydrate(self, rows: np.ndarray, fields: Optional[List[str]] = None) -> List[TEntity]:
+        ''' Creates the entities stored in the specified rows. If fields are specified, only the entities' specified attributes are set '''
+        entity_type = self._get_entity_type()
+        columns = self._get_columns()
+        names = list(columns.keys()) if fields is None else list(dict.fromkeys(field.split(".")[0] for field in fields))
+        values = [self._get_column(name).get(rows) for name in names]
+        entities = list[TEntity]()
+        for row_values in zip(*values) if len(values) > 0 else ([] for _ in range(len(rows))):
+            entity = object.__new__(entity_type)
+            for name, value in zip(names, row_values):
+                object.__setattr__(entity, name, value)
+            entities.append(entity)
+        return entities
+
+    @staticmethod
+    def configure(builder: ApplicationBuilderBase, entity_type: Type, key_type: Type) -> ApplicationBuilderBase:
+        ''' Configures the specified application to use a columnar repository implementation to manage the specified type of entity '''
+        builder.services.try_add_singleton(Repository[entity_type, key_type], ColumnarRepository[entity_type, key_type])
+        builder.services.try_add_singleton(QueryableRepository[entity_type, key_type], implementation_factory=lambda provider: provider.get_required_service(Repository[entity_type, key_type]))
+        return builder
+
+
+class _MaskEvaluator:
+    ''' Represents the service used to evaluate predicates as boolean masks over the columns of a ColumnarRepository '''
+
+    def __init__(self, repository: ColumnarRepository, rows: np.ndarray, argument_name: str):
+        self._repository = repository
+        self._rows = rows
+        self._argument_name = argument_name
+
+    def evaluate(self, expression: expr) -> np.ndarray:
+        ''' Evaluates the specified expression into a mask of the rows that match it. Raises an _UnsupportedExpression if it cannot be evaluated on columns '''
+        if isinstance(expression, BoolOp):
+            masks = [self.evaluate(value) for value in expression.values]
+            return np.logical_and.reduce(masks) if isinstance(expression.op, ast.And) else np.logical_or.reduce(masks)
+        elif isinstance(expression, UnaryOp) and isinstance(expression.op, ast.Not):
+            return ~self.evaluate(expression.operand)
+        elif isinstance(expression, Compare):
+            mask = np.ones(len(self._rows), dtype=bool)
+            left = expression.left
+            for comparison_operator, right in zip(expression.ops, expression.comparators):
+                mask &= self._compare(left, comparison_operator, right)
+                left = right
+            return mask
+        elif isinstance(expression, Constant) and isinstance(expression.value, bool):
+            return np.full(len(self._rows), expression.value, dtype=bool)
+        column = self._get_column(expression)
+        if column is not None:
+            values, valid = column.values[self._rows], column.valid[self._rows]
+            return valid & (values.astype(bool) if column.is_native() else np.fromiter((bool(value) for value in values.tolist()), dtype=bool, count=len(values)))
+        raise _UnsupportedExpression()
+
+    def _compare(self, left: expr, comparison_operator: ast.cmpop, right: expr) -> np.ndarray:
+        left_column, right_column = self._get_column(left), self._get_column(right)
+        if left_column is None and right_column is not None and type(comparison_operator) in _reversed_operators:
+            left, right, left_column, right_column = right, left, right_column, left_column
+            comparison_operator = _reversed_operators[type(comparison_operator)]
+        if left_column is None:
+            raise _UnsupportedExpression()
+        values, valid = left_column.values[self._rows], left_column.valid[self._rows]
+        if right_column is not None:
+            function = _comparison_operators.get(type(comparison_operator))
+            if function is None:
+                raise _UnsupportedExpression()
+            right_values, right_valid = right_column.values[self._rows], right_column.valid[self._rows]
+            both_valid = valid & right_valid
+            mask = np.zeros(len(self._rows), dtype=bool)
+            mask[both_valid] = np.asarray(function(values[both_valid], right_values[both_valid]), dtype=bool)
+            return mask
+        if not isinstance(right, Constant):
+            raise _UnsupportedExpression()
+        value = right.value
+        if isinstance(comparison_operator, (ast.In, ast.NotIn)):
+            if isinstance(value, (str, bytes, dict)) or not hasattr(value, '__iter__'):
+                raise _UnsupportedExpression()
+            mask = np.zeros(len(self._rows), dtype=bool)
+            candidates = list(value)
+            mask[valid] = np.isin(values[valid], np.array(candidates, dtype=values.dtype if left_column.is_native() else object)) if len(candidates) > 0 else False
+            if None in candidates:
+                mask |= ~valid
+            return mask if isinstance(comparison_operator, ast.In) else ~mask
+        if value is None:
+            if isinstance(comparison_operator, (ast.Eq, ast.Is)):
+                return ~valid
+            elif isinstance(comparison_operator, (ast.NotEq, ast.IsNot)):
+                return valid.copy()
+            raise _UnsupportedExpression()
+        function = _comparison_operators.get(type(comparison_operator))
+        if function is None:
+            raise _UnsupportedExpression()
+        mask = np.zeros(len(self._rows), dtype=bool)
+        mask[valid] = np.asarray(function(values[valid], value), dtype=bool)
+        if isinstance(comparison_operator, ast.NotEq):
+            # Like in Python and Mongo, null values are not equal to any value
+            mask |= ~valid
+        return mask
+
+    def _get_column(self, expression: expr) -> Optional[ColumnarColumn]:
+        ''' Gets the column referenced by the specified expression, if it references an attribute of the lambda argument '''
+        if isinstance(expression, Attribute) and isinstance(expression.value, Name) and expression.value.id == self._argument_name:
+            column = self._repository._get_columns().get(expression.attr)
+            if column is None:
+                raise _UnsupportedExpression()
+            return column
+        return None
+
+
+class _UnsupportedExpression(Exception):
+    ''' Represents the exception raised when an expression cannot be evaluated on columns '''
+    pass
+
+
+_initial_capacity = 1024
+''' Gets the number of rows the columns are initially allocated with. Columns double in size whenever they are full '''
+
+
+_native_types = {
+    bool: np.bool_,
+    int: np.int64,
+    float: np.float64,
+}
+''' Gets a mapping of the Python types whose values are stored in native arrays to the type of these arrays '''
+
+
+_comparison_operators = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+''' Gets a mapping of Python comparison operators to the function used to compare columns '''
+
+
+_reversed_operators = {
+    ast.Eq: ast.Eq(),
+    ast.NotEq: ast.NotEq(),
+    ast.Lt: ast.Gt(),
+    ast.LtE: ast.GtE(),
+    ast.Gt: ast.Lt(),
+    ast.GtE: ast.LtE(),
+}
+''' Gets a mapping of Python comparison operators to the operator to use when swapping their operands '''
+
+
+def _get_native_type(attribute_type: Any) -> Optional[type]:
+    ''' Gets the Python type of the values of the specified attribute type, if they can be stored in a native array '''
+    if get_origin(attribute_type) in (Union, UnionType):
+        type_args = [type_arg for type_arg in get_args(attribute_type) if type_arg is not type(None)]
+        attribute_type = type_args[0] if len(type_args) == 1 else None
+    return attribute_type if attribute_type in _native_types else None
+
+
+def _is_instance_of(value: Any, python_type: type) -> bool:
+    value_type = type(value)
+    if python_type is float:
+        return value_type is float or value_type is int
+    return value_type is python_type
+
+
+def _to_python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _evaluate(function: Callable[[Any], Any], entity: Any) -> bool:
+    try:
+        return bool(function(entity))
+    except AttributeError as ex:
+        if ex.obj is not entity:
+            raise
+        # Entities are hydrated from their columns, and only have the attributes that have been stored
+        raise AttributeError(f"Failed to evaluate the predicate on an entity of type '{type(entity).__name__}': it has no stored attribute '{ex.name}'", name=ex.name, obj=entity) from ex
+
+
+def _get_clauses(expression: expr) -> List[Tuple[str, List[expr]]]:
+    ''' Gets the clauses of the specified query expression, in the order they have been applied '''
+    clauses = list[Tuple[str, List[expr]]]()
+    while isinstance(expression, ast.Call) and isinstance(expression.func, Attribute):
+        clauses.append((expression.func.attr, expression.args))
+        expression = expression.func.value
+    clauses.reverse()
+    return clauses
+
+
+def _get_field(selector: Lambda) -> str:
+    ''' Gets the name of the attribute selected by the specified lambda, which must be an attribute of its argument '''
+    expression = selector.body
+    if not isinstance(expression, Attribute) or not isinstance(expression.value, Name):
+        raise Exception(f"The expression '{ast.unparse(selector)}' must select an attribute of its argument")
+    return expression.attr
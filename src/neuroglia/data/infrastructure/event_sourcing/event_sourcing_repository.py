@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Generic, Optional, Type
+from typing import Generic, List, Optional, Type
 from neuroglia.data.infrastructure.abstractions import Repository
 from neuroglia.data.abstractions import DomainEvent, TAggregate, TKey
 from neuroglia.data.infrastructure.event_sourcing.abstractions import Aggregator, EventDescriptor, EventStore, StreamReadDirection
@@ -28,8 +28,8 @@ class EventSourcingRepository(Generic[TAggregate, TKey], Repository[TAggregate,
 
     async def contains_async(self, id: TKey) -> bool: return self._eventstore.contains_stream(self._build_stream_id_for(id))
 
-    async def get_async(self, id: TKey) -> Optional[TAggregate]:
-        ''' Gets the aggregate with the specified id, if any '''
+    async def get_async(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TAggregate]:
+        ''' Gets the aggregate with the specified id, if any. Aggregates are always fully loaded, since their state is built by replaying all of their events '''
         stream_id = self._build_stream_id_for(id)
         events = await self._eventstore.read_async(stream_id, StreamReadDirection.FORWARDS, 0)
         return self._aggregator.aggregate(events, self.__orig_class__.__args__[0])
@@ -126,15 +126,13 @@ class ESEventStore(EventStore):
         return metadata
 
     def _decode_recorded_event(self, stream_id: str, e: RecordedEvent) -> EventRecord:
-        text = e.metadata.decode()
-        metadata = self._serializer.deserialize_from_text(text)
+        metadata = self._serializer.deserialize(e.metadata)
         type_qualified_name_parts = metadata[self._metadata_type].split('.')
         module_name = '.'.join(type_qualified_name_parts[:-1])
         type_name = type_qualified_name_parts[-1]
         module = __import__(module_name, fromlist=[type_name])
         expected_type = getattr(module, type_name)
-        text = e.data.decode()
-        data = None if text is None or text.isspace() else self._serializer.deserialize_from_text(text, expected_type)
+        data = None if e.data is None or e.data.isspace() else self._serializer.deserialize(e.data, expected_type)
         if isinstance(data, Dict) and not isinstance(data, expected_type):
             typed_data = expected_type.__new__(expected_type)
             typed_data.__dict__ = data
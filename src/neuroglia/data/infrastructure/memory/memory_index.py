@@ -0,0 +1,121 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from neuroglia.data.abstractions import IndexDefinition
+
+
+class MemoryIndex:
+    ''' Represents a secondary index on the entities stored in memory, which maps the values of the first field of its definition to the ids of the entities that hold them, both by hash, for equality lookups, and in order, for range scans '''
+
+    def __init__(self, definition: IndexDefinition):
+        self.definition = definition
+        self.field = definition.fields[0][0]
+        self._entries = dict[Any, Set[Any]]()
+        self._sorted_entries = list[Tuple[Any, Any]]()
+        self._unique_keys = dict[Tuple[Any, ...], Any]()
+
+    definition: IndexDefinition
+    ''' Gets the definition of the index '''
+
+    field: str
+    ''' Gets the path of the field the index serves lookups on '''
+
+    hashable: bool = True
+    ''' Gets a boolean indicating whether or not all the indexed values are hashable, and therefore whether or not the index can serve equality lookups '''
+
+    sortable: bool = True
+    ''' Gets a boolean indicating whether or not all the indexed values are comparable, and therefore whether or not the index can serve range scans '''
+
+    _entries: Dict[Any, Set[Any]]
+    ''' Gets a mapping of the indexed values to the ids of the entities that hold them '''
+
+    _sorted_entries: List[Tuple[Any, Any]]
+    ''' Gets the indexed values, along with the id of the entity that holds them, in ascending order. Null values, which are not comparable, are omitted '''
+
+    _unique_keys: Dict[Tuple[Any, ...], Any]
+    ''' Gets a mapping of the values of all the fields of unique indexes to the id of the entity that holds them '''
+
+    def get_key(self, entity: Any) -> Tuple[Any, ...]:
+        ''' Gets the values of the indexed fields of the specified entity '''
+        return tuple(get_path_value(entity, path) for path, _ in self.definition.fields)
+
+    def check(self, id: Any, key: Tuple[Any, ...]) -> None:
+        ''' Raises an exception if the index is unique and already contains the specified key for another entity '''
+        if not self.definition.unique:
+            return
+        existing_id = self._unique_keys.get(key, id)
+        if existing_id != id:
+            raise Exception(f"An entity with the same {[path for path, _ in self.definition.fields]} as entity with id '{id}' already exists")
+
+    def add(self, id: Any, key: Tuple[Any, ...]) -> None:
+        ''' Indexes the entity with the specified id and key '''
+        value = key[0]
+        if self.hashable:
+            try:
+                self._entries.setdefault(value, set()).add(id)
+            except TypeError:
+                self.hashable = False
+                self._entries.clear()
+        if self.sortable and value is not None:
+            try:
+                insort(self._sorted_entries, (value, id))
+            except TypeError:
+                self.sortable = False
+                self._sorted_entries.clear()
+        if self.definition.unique:
+            self._unique_keys[key] = id
+
+    def remove(self, id: Any, key: Tuple[Any, ...]) -> None:
+        ''' Removes the entity with the specified id and key from the index '''
+        value = key[0]
+        if self.hashable:
+            ids = self._entries.get(value)
+            if ids is not None:
+                ids.discard(id)
+                if len(ids) < 1:
+                    del self._entries[value]
+        if self.sortable and value is not None:
+            index = bisect_left(self._sorted_entries, (value, id))
+            if index < len(self._sorted_entries) and self._sorted_entries[index] == (value, id):
+                del self._sorted_entries[index]
+        if self.definition.unique and self._unique_keys.get(key) == id:
+            del self._unique_keys[key]
+
+    def find(self, values: Iterable[Any]) -> Optional[Set[Any]]:
+        ''' Gets the ids of the entities whose indexed value equals any of the specified values, or None if the index cannot serve the lookup '''
+        if not self.hashable:
+            return None
+        ids = set()
+        try:
+            for value in values:
+                ids.update(self._entries.get(value, ()))
+        except TypeError:
+            return None
+        return ids
+
+    def scan(self, lower: Any = None, lower_inclusive: bool = True, upper: Any = None, upper_inclusive: bool = True) -> Optional[List[Any]]:
+        ''' Gets the ids, in ascending order of indexed value, of the entities whose indexed value is within the specified bounds, if any, or None if the index cannot serve the scan '''
+        if not self.sortable:
+            return None
+        try:
+            start = 0
+            if lower is not None:
+                start = bisect_left(self._sorted_entries, lower, key=_get_value) if lower_inclusive else bisect_right(self._sorted_entries, lower, key=_get_value)
+            end = len(self._sorted_entries)
+            if upper is not None:
+                end = bisect_right(self._sorted_entries, upper, key=_get_value) if upper_inclusive else bisect_left(self._sorted_entries, upper, key=_get_value)
+        except TypeError:
+            return None
+        return [id for _, id in self._sorted_entries[start:end]]
+
+
+def get_path_value(item: Any, path: str) -> Any:
+    ''' Gets the value at the specified dotted path of the specified item, or None if any of its segments is unset '''
+    for attribute in path.split('.'):
+        if item is None:
+            return None
+        item = item.get(attribute) if isinstance(item, dict) else getattr(item, attribute, None)
+    return item
+
+
+def _get_value(entry: Tuple[Any, Any]) -> Any:
+    return entry[0]
@@ -1,29 +1,329 @@
-from typing import Optional
-from neuroglia.data.infrastructure.abstractions import Repository
+import ast
+from ast import Attribute, Compare, Constant, Eq, Gt, GtE, In, Lambda, Lt, LtE, Name, expr
+from inspect import isclass
+from types import CodeType
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Set, Tuple, Type
 from neuroglia.data.abstractions import TEntity, TKey
+from neuroglia.data.infrastructure.abstractions import QueryableRepository, Repository
+from neuroglia.data.infrastructure.memory.memory_index import MemoryIndex, get_path_value
+from neuroglia.data.queryable import T, QueryProvider, Queryable
+from neuroglia.hosting.abstractions import ApplicationBuilderBase
 
 
-class MemoryRepository(Repository[TEntity, TKey]):
+class MemoryQuery(Generic[T], Queryable[T]):
+    ''' Represents a query on the entities stored in memory '''
 
-    entities: dict = {}
+    def __init__(self, query_provider: 'MemoryQueryProvider', expression: Optional[expr] = None):
+        super().__init__(query_provider, expression)
+
+
+class MemoryQueryProvider(QueryProvider):
+    ''' Represents the QueryProvider that executes queries on the entities stored in a MemoryRepository, by compiling their expressions into Python functions. Leading filters are served by the repository's indexes, when possible '''
+
+    def __init__(self, repository: 'MemoryRepository'):
+        self._repository = repository
+
+    _repository: 'MemoryRepository'
+    ''' Gets the repository to query '''
+
+    def create_query(self, element_type: Type, expression: expr) -> Queryable: return MemoryQuery[element_type](self, expression)
+
+    def execute(self, expression: expr, query_type: Type) -> Any:
+        clauses = _get_clauses(expression)
+        items: Optional[List[Any]] = None
+        if len(clauses) > 0 and clauses[0][0] in ("where", "first", "last") and len(clauses[0][1]) > 0:
+            items = self._repository._find(clauses[0][1][0])
+        if items is None:
+            items = list(self._repository.entities.values())
+        sort_keys = list[Tuple[str, bool]]()
+        for index, (clause, args) in enumerate(clauses):
+            if clause in ("order_by", "order_by_descending"):
+                sort_keys.append((_get_field(args[0]), clause == "order_by_descending"))
+                if index + 1 < len(clauses) and clauses[index + 1][0] in ("order_by", "order_by_descending"):
+                    continue
+                # Consecutive clauses are combined, the first one being the primary key: stable sorts are applied from the last key to the first
+                for field, descending in reversed(sort_keys):
+                    items.sort(key=lambda item: _get_sort_key(get_path_value(item, field)), reverse=descending)
+                sort_keys.clear()
+            elif clause == "where":
+                items = _filter(items, args[0])
+            elif clause == "first":
+                items = _filter(items, args[0])[:1] if len(args) > 0 else items[:1]
+            elif clause == "last":
+                items = _filter(items, args[0])[-1:] if len(args) > 0 else items[-1:]
+            elif clause == "skip":
+                items = items[args[0].value:]
+            elif clause == "take":
+                items = items[:args[0].value]
+            elif clause == "select" and isinstance(args[0].body, ast.List):
+                fields = [_get_field(ast.Lambda(args=args[0].args, body=element)) for element in args[0].body.elts]
+                items = [_project(item, fields) for item in items]
+            elif clause == "distinct_by":
+                field = _get_field(args[0])
+                keys = set()
+                distinct_items = list[Any]()
+                for item in items:
+                    key = get_path_value(item, field)
+                    if key not in keys:
+                        keys.add(key)
+                        distinct_items.append(item)
+                items = distinct_items
+            elif clause == "count":
+                return len(items)
+            elif clause == "any":
+                return len(items) > 0
+            elif clause in ("sum", "min", "max", "distinct"):
+                field = _get_field(args[0])
+                values = [value for value in (get_path_value(item, field) for item in items) if value is not None]
+                if clause == "sum":
+                    return sum(values, 0)
+                elif clause == "min":
+                    return min(values, default=None)
+                elif clause == "max":
+                    return max(values, default=None)
+                return list(dict.fromkeys(values))
+            else:
+                raise Exception(f"The clause '{clause}' is not supported by the in-memory query provider")
+        type_ = query_type if isclass(query_type) or query_type == List else type(query_type)
+        if issubclass(type_, List):
+            return items
+        return items[0] if len(items) > 0 else None
+
+
+class MemoryRepository(Generic[TEntity, TKey], QueryableRepository[TEntity, TKey]):
+    ''' Represents a queryable repository that stores entities in memory. Each instance has its own storage
+
+        The indexes declared on the type of entity, using the 'index' decorator, are maintained in memory: filters that start with an equality on the first field of an index are served by hash lookups, and filters that start with a range on it by binary searches. Unique indexes are enforced. Expiration is not
+    '''
+
+    def __init__(self):
+        self.entities = dict[TKey, TEntity]()
+        self._indexed_keys = dict[TKey, List[Tuple[Any, ...]]]()
+
+    entities: Dict[TKey, TEntity]
+    ''' Gets a mapping of the ids of the stored entities to the entities themselves '''
+
+    _indexes: Optional[List[MemoryIndex]] = None
+    ''' Gets the indexes declared on the type of entity, created on first use, since the type of entity is not yet known when the repository is initialized '''
+
+    _indexed_keys: Dict[TKey, List[Tuple[Any, ...]]]
+    ''' Gets a mapping of the ids of the stored entities to the keys they have been indexed with, in the order of the indexes, so that they can be unindexed even if they have been modified since '''
 
     async def contains_async(self, id: TKey) -> bool:
         return self.entities.get(id) is not None
 
-    async def get_async(self, id: TKey) -> Optional[TEntity]:
+    async def get_async(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TEntity]:
         return self.entities.get(id, None)
 
     async def add_async(self, entity: TEntity) -> TEntity:
         if entity.id in self.entities:
             raise Exception()
+        self._index(entity)
         self.entities[entity.id] = entity
         return entity
 
     async def update_async(self, entity: TEntity) -> TEntity:
+        self._index(entity)
         self.entities[entity.id] = entity
         return entity
 
     async def remove_async(self, id: TKey) -> None:
         if not id in self.entities:
             raise Exception()
+        self._unindex(id)
         del self.entities[id]
+
+    async def query_async(self) -> Queryable[TEntity]: return MemoryQuery[self._get_entity_type()](MemoryQueryProvider(self))
+
+    def _get_entity_type(self) -> Type: return self.__orig_class__.__args__[0]
+
+    def _get_indexes(self) -> List[MemoryIndex]:
+        if self._indexes is None:
+            try:
+                entity_type = self._get_entity_type()
+            except AttributeError:
+                # The repository has not been parameterized, and cannot know the type of entity it stores
+                return []
+            self._indexes = [MemoryIndex(definition) for definition in getattr(entity_type, "__indexes__", [])]
+        return self._indexes
+
+    def _index(self, entity: TEntity):
+        ''' Indexes the specified entity, replacing the entries of its previous version, if any. Raises an exception if the entity violates a unique index '''
+        indexes = self._get_indexes()
+        if len(indexes) < 1:
+            return
+        keys = [index.get_key(entity) for index in indexes]
+        for index, key in zip(indexes, keys):
+            index.check(entity.id, key)
+        self._unindex(entity.id)
+        for index, key in zip(indexes, keys):
+            index.add(entity.id, key)
+        self._indexed_keys[entity.id] = keys
+
+    def _unindex(self, id: TKey):
+        keys = self._indexed_keys.pop(id, None)
+        if keys is not None:
+            for index, key in zip(self._get_indexes(), keys):
+                index.remove(id, key)
+
+    def _find(self, predicate: Lambda) -> Optional[List[TEntity]]:
+        ''' Gets the entities that may match the specified predicate, using the ids or the indexes of the stored entities, or None if none of the predicate's conjuncts can be served by them. The predicate must still be applied to the returned entities '''
+        if not isinstance(predicate, Lambda) or len(predicate.args.args) != 1:
+            return None
+        argument_name = predicate.args.args[0].arg
+        body = predicate.body
+        conjuncts = body.values if isinstance(body, ast.BoolOp) and isinstance(body.op, ast.And) else [body]
+        ranges = list[Tuple[MemoryIndex, Any, bool, Any, bool]]()
+        for conjunct in conjuncts:
+            comparison = _get_comparison(conjunct, argument_name)
+            if comparison is None:
+                continue
+            field, operator, value = comparison
+            if isinstance(operator, (Eq, In)):
+                values = [value] if isinstance(operator, Eq) else value
+                if field == "id":
+                    return [entity for entity in (self.entities.get(id) for id in dict.fromkeys(values)) if entity is not None]
+                index = self._get_index(field)
+                ids = index.find(values) if index is not None else None
+                if ids is not None:
+                    return [self.entities[id] for id in ids]
+            else:
+                index = self._get_index(field)
+                if index is not None:
+                    ranges.append((index, value if isinstance(operator, (Gt, GtE)) else None, isinstance(operator, GtE), value if isinstance(operator, (Lt, LtE)) else None, isinstance(operator, LtE)))
+        for index, lower, lower_inclusive, upper, upper_inclusive in ranges:
+            ids = index.scan(lower, lower_inclusive, upper, upper_inclusive)
+            if ids is not None:
+                return [self.entities[id] for id in ids]
+        return None
+
+    def _get_index(self, field: str) -> Optional[MemoryIndex]:
+        return next((index for index in self._get_indexes() if index.field == field), None)
+
+    @staticmethod
+    def configure(builder: ApplicationBuilderBase, entity_type: Type, key_type: Type) -> ApplicationBuilderBase:
+        ''' Configures the specified application to use an in-memory repository implementation to manage the specified type of entity '''
+        builder.services.try_add_singleton(Repository[entity_type, key_type], MemoryRepository[entity_type, key_type])
+        builder.services.try_add_singleton(QueryableRepository[entity_type, key_type], implementation_factory=lambda provider: provider.get_required_service(Repository[entity_type, key_type]))
+        return builder
+
+
+_compiled_lambdas = dict[str, CodeType]()
+''' Gets a mapping of the structure of the lambdas compiled by in-memory queries, whose constants have been replaced by variables, to their compiled code '''
+
+
+def compile_lambda(expression: Lambda) -> Callable[..., Any]:
+    ''' Compiles the specified lambda expression into a Python function. Constants, which may be of any type, are passed as globals, so that lambdas of the same structure share their compiled code '''
+    constants = dict[str, Any]()
+
+    def hoist(node: ast.AST) -> ast.AST:
+        if isinstance(node, Constant):
+            name = f"__constant_{len(constants)}"
+            constants[name] = node.value
+            return ast.Name(id=name, ctx=ast.Load())
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, ast.AST):
+                setattr(node, field, hoist(value))
+            elif isinstance(value, list):
+                setattr(node, field, [hoist(item) if isinstance(item, ast.AST) else item for item in value])
+        return node
+
+    # Cached expressions are shared by the queryables, and must not be mutated: the hoisting is performed on a copy
+    expression = hoist(_copy(expression))
+    structure = ast.dump(expression)
+    code = _compiled_lambdas.get(structure)
+    if code is None:
+        code = compile(ast.fix_missing_locations(ast.Expression(body=expression)), "<query>", "eval")
+        _compiled_lambdas[structure] = code
+    return eval(code, constants)
+
+
+def _copy(node: ast.AST) -> ast.AST:
+    fields = dict[str, Any]()
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, ast.AST):
+            fields[field] = _copy(value)
+        elif isinstance(value, list):
+            fields[field] = [_copy(item) if isinstance(item, ast.AST) else item for item in value]
+        else:
+            fields[field] = value
+    return type(node)(**fields)
+
+
+def _filter(items: Iterable[Any], predicate: Lambda) -> List[Any]:
+    function = compile_lambda(predicate)
+    results = list[Any]()
+    for item in items:
+        try:
+            if function(item):
+                results.append(item)
+        except (AttributeError, TypeError):
+            # Like in Mongo, entities that miss the filtered attributes, or whose attributes cannot be compared to the filter's values, do not match
+            continue
+    return results
+
+
+def _get_clauses(expression: expr) -> List[Tuple[str, List[expr]]]:
+    ''' Gets the clauses of the specified query expression, in the order they have been applied '''
+    clauses = list[Tuple[str, List[expr]]]()
+    while isinstance(expression, ast.Call) and isinstance(expression.func, Attribute):
+        clauses.append((expression.func.attr, expression.args))
+        expression = expression.func.value
+    clauses.reverse()
+    return clauses
+
+
+def _get_field(selector: Lambda) -> str:
+    ''' Gets the dotted path of the attribute selected by the specified lambda '''
+    path = list[str]()
+    expression = selector.body
+    while isinstance(expression, Attribute):
+        path.insert(0, expression.attr)
+        expression = expression.value
+    if not isinstance(expression, Name) or len(path) < 1:
+        raise Exception(f"The expression '{ast.unparse(selector)}' must select an attribute")
+    return ".".join(path)
+
+
+def _get_comparison(expression: expr, argument_name: str) -> Optional[Tuple[str, ast.cmpop, Any]]:
+    ''' Gets the field, operator and value of the specified comparison between a field of the lambda argument and a constant, if it is one '''
+    if not isinstance(expression, Compare) or len(expression.ops) != 1:
+        return None
+    left, operator, right = expression.left, expression.ops[0], expression.comparators[0]
+    if isinstance(left, Constant) and not isinstance(operator, In):
+        left, right = right, left
+        operator = _reversed_operators.get(type(operator), operator)
+    if not isinstance(right, Constant) or not isinstance(operator, (Eq, Gt, GtE, Lt, LtE, In)):
+        return None
+    if isinstance(operator, In) and (isinstance(right.value, (str, bytes, dict)) or not hasattr(right.value, '__iter__')):
+        return None
+    path = list[str]()
+    while isinstance(left, Attribute):
+        path.insert(0, left.attr)
+        left = left.value
+    if not isinstance(left, Name) or left.id != argument_name or len(path) < 1:
+        return None
+    return ".".join(path), operator, right.value
+
+
+def _get_sort_key(value: Any) -> Tuple[bool, Any]:
+    # Like in Mongo, null values come first
+    return (value is not None, value)
+
+
+def _project(item: Any, fields: List[str]) -> Any:
+    ''' Creates a partial copy of the specified item, with only the first attribute of each of the specified paths set '''
+    projection = object.__new__(type(item))
+    for field in fields:
+        name = field.split(".")[0]
+        object.__setattr__(projection, name, getattr(item, name, None))
+    return projection
+
+
+_reversed_operators = {
+    Lt: Gt(),
+    LtE: GtE(),
+    Gt: Lt(),
+    GtE: LtE(),
+}
+''' Gets a mapping of Python comparison operators to the operator to use when swapping their operands '''
@@ -0,0 +1,275 @@
+import threading
+import typing
+from dataclasses import MISSING, Field, fields, is_dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal, Inexact
+from enum import Enum
+from types import UnionType
+from typing import Any, Callable, Dict, Optional, Type, Union, get_args, get_origin
+from bson import Binary, Decimal128, Int64, ObjectId, Regex, Timestamp
+
+
+_bson_native_types = (str, int, float, bool, bytes, datetime, ObjectId, Decimal128, Binary, Int64, Regex, Timestamp)
+''' Gets the types that are natively supported by BSON, and that are therefore stored as is '''
+
+
+class MongoEntityCodec:
+    ''' Represents the service used to convert entities to and from BSON-compatible documents, without going through an intermediate text representation '''
+
+    _encoders: Dict[type, Callable[[Any], Any]]
+    ''' Gets a mapping of the encoders compiled for each type of value '''
+
+    _decoders: Dict[Any, Callable[[Any], Any]]
+    ''' Gets a mapping of the decoders compiled for each expected type '''
+
+    _lock: threading.RLock
+    ''' Gets the lock used to synchronize the compilation of encoders and decoders '''
+
+    def __init__(self):
+        self._encoders = dict[type, Callable[[Any], Any]]()
+        self._decoders = dict[Any, Callable[[Any], Any]]()
+        self._lock = threading.RLock()
+
+    def encode(self, entity: Any) -> dict:
+        ''' Encodes the specified entity into a new BSON-compatible document '''
+        return self._encode(entity)
+
+    def encode_value(self, value: Any) -> Any:
+        ''' Encodes the specified value into its BSON-compatible representation, as stored in entity documents '''
+        return self._encode(value)
+
+    def decode(self, document: dict, expected_type: Type) -> Any:
+        ''' Decodes the specified BSON document into a new instance of the specified type '''
+        if document is None:
+            return None
+        return self._get_decoder(expected_type, True)(document)
+
+    def decode_value(self, value: Any, expected_type: Type) -> Any:
+        ''' Decodes the specified BSON value, as stored in entity documents, into a value of the specified type '''
+        return self._get_decoder(expected_type)(value)
+
+    def _encode(self, value: Any) -> Any:
+        ''' Encodes the specified value into a BSON-compatible value '''
+        value_type = type(value)
+        encoder = self._encoders.get(value_type)
+        if encoder is None:
+            encoder = self._compile_encoder(value)
+            self._encoders[value_type] = encoder
+        return encoder(value)
+
+    def _compile_encoder(self, value: Any) -> Callable[[Any], Any]:
+        ''' Compiles the encoder used to convert values of the specified value's type into BSON-compatible values '''
+        value_type = type(value)
+        if issubclass(value_type, Enum):
+            return _encode_enum
+        elif issubclass(value_type, datetime):
+            return _encode_datetime
+        elif value is None or issubclass(value_type, _bson_native_types):
+            return _encode_as_is
+        elif issubclass(value_type, date):
+            return value_type.isoformat
+        elif issubclass(value_type, Decimal):
+            # Decimals are stored as Decimal128, rather than as strings, so that Mongo compares and sorts them numerically
+            return _encode_decimal
+        elif issubclass(value_type, (list, tuple, set, frozenset)):
+            encode = self._encode
+            return lambda items: [encode(item) for item in items]
+        elif issubclass(value_type, dict):
+            encode = self._encode
+            return lambda mapping: {key if isinstance(key, str) else str(key): encode(item) for key, item in mapping.items()}
+        slots = tuple(
+            slot
+            for base_type in reversed(value_type.__mro__)
+            for slot in _get_slots(base_type)
+            if slot not in ('__dict__', '__weakref__') and not slot.startswith('_')
+        )
+        has_dict = hasattr(value, '__dict__')
+        if not slots and not has_dict:
+            return str
+        encode = self._encode
+
+        def encode_object(obj: Any) -> dict:
+            document = dict()
+            for slot in slots:
+                attribute = getattr(obj, slot, None)
+                if attribute is not None:
+                    document[slot] = encode(attribute)
+            if has_dict:
+                for key, attribute in obj.__dict__.items():
+                    if attribute is not None and not key.startswith('_'):
+                        document[key] = encode(attribute)
+            return document
+
+        return encode_object
+
+    def _get_decoder(self, expected_type: Any, root: bool = False) -> Callable[[Any], Any]:
+        ''' Gets the decoder used to convert BSON values into values of the specified type, compiling it on first use '''
+        key = (expected_type, root)
+        try:
+            decoder = self._decoders.get(key)
+        except TypeError:
+            # The type hint is not hashable (e.g. Annotated metadata) and cannot be cached
+            return self._compile_decoder(expected_type, root)
+        if decoder is not None:
+            return decoder
+        with self._lock:
+            decoder = self._decoders.get(key)
+            if decoder is not None:
+                return decoder
+            compiled_decoder = None
+            # Registers a forwarding decoder first, so that recursive types can reference the decoder being compiled
+            self._decoders[key] = lambda value: compiled_decoder(value)
+            try:
+                compiled_decoder = self._compile_decoder(expected_type, root)
+            except BaseException:
+                del self._decoders[key]
+                raise
+            self._decoders[key] = compiled_decoder
+            return compiled_decoder
+
+    def _compile_decoder(self, expected_type: Any, root: bool) -> Callable[[Any], Any]:
+        ''' Compiles the decoder used to convert BSON values into values of the specified type '''
+        origin_type = get_origin(expected_type)
+        if origin_type is not None:
+            type_args = get_args(expected_type)
+            if origin_type in (Union, UnionType) and type(None) in type_args:
+                return self._get_decoder(next(t for t in type_args if t is not type(None)))
+            elif origin_type in (list, typing.List):
+                if len(type_args) < 1:
+                    return _decode_as_is
+                item_decoder = self._get_decoder(type_args[0])
+                return lambda value: None if value is None else [item_decoder(item) for item in value]
+            elif origin_type is dict:
+                if len(type_args) < 2:
+                    return _decode_as_is
+                key_decoder = self._get_decoder(type_args[0])
+                value_decoder = self._get_decoder(type_args[1])
+                return lambda value: None if value is None else {key_decoder(k): value_decoder(v) for k, v in value.items()}
+            return _decode_as_is
+        if not isinstance(expected_type, type):
+            return _decode_as_is
+        elif root or is_dataclass(expected_type):
+            if root:
+                attributes = dict[str, Any]()
+                for base_type in reversed(expected_type.__mro__):
+                    if hasattr(base_type, '__annotations__'):
+                        attributes.update(base_type.__annotations__)
+            else:
+                attributes = {field.name: field.type for field in fields(expected_type)}
+            attribute_decoders = tuple((name, self._get_decoder(attribute_type)) for name, attribute_type in attributes.items())
+
+            def decode_object(value: Any) -> Any:
+                if not isinstance(value, dict):
+                    return value
+                obj = object.__new__(expected_type)
+                obj.__dict__ = {
+                    name: decode(value[name])
+                    for name, decode in attribute_decoders
+                    if name in value
+                }
+                return obj
+
+            # Slotted objects have no class-level fallback for the attributes that were omitted because they were None
+            defaults = {field.name: field for field in fields(expected_type)} if is_dataclass(expected_type) else {}
+
+            def decode_slotted_object(value: Any) -> Any:
+                if not isinstance(value, dict):
+                    return value
+                obj = object.__new__(expected_type)
+                for name, decode in attribute_decoders:
+                    if name in value:
+                        object.__setattr__(obj, name, decode(value[name]))
+                    else:
+                        object.__setattr__(obj, name, _get_default_value(defaults.get(name)))
+                return obj
+
+            return decode_object if expected_type.__dictoffset__ != 0 else decode_slotted_object
+        elif issubclass(expected_type, Enum):
+            return _compile_enum_decoder(expected_type)
+        elif issubclass(expected_type, datetime):
+            return _decode_datetime
+        elif issubclass(expected_type, date):
+            return lambda value: expected_type.fromisoformat(value) if isinstance(value, str) else value
+        elif issubclass(expected_type, Decimal):
+            return _decode_decimal
+        return _decode_as_is
+
+
+def _encode_as_is(value: Any) -> Any:
+    return value
+
+
+def _decode_as_is(value: Any) -> Any:
+    return value
+
+
+def _encode_enum(value: Enum) -> str:
+    return value.name
+
+
+def _encode_datetime(value: datetime) -> datetime:
+    ''' Encodes the specified datetime as BSON stores it: in UTC, truncated to milliseconds. Naive datetimes are assumed to be in UTC '''
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _decode_datetime(value: Any) -> Any:
+    ''' Decodes the specified datetime, which is naive unless the Mongo client is configured with tz_aware=True, in which case it is in UTC. Documents written before datetimes were stored as BSON dates hold ISO 8601 strings, which are parsed '''
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _encode_decimal(value: Decimal) -> Decimal128:
+    try:
+        return Decimal128(value)
+    except Inexact:
+        raise ValueError(f"Failed to encode the decimal '{value}': it has more significant digits than the 34 a Decimal128 can store")
+
+
+def _decode_decimal(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is str or value_type is int:
+        return Decimal(value)
+    elif value_type is float:
+        return Decimal(str(value))
+    elif value_type is Decimal128:
+        return value.to_decimal()
+    return value
+
+
+def _get_default_value(field: Optional[Field]) -> Any:
+    if field is None:
+        return None
+    elif field.default is not MISSING:
+        return field.default
+    elif field.default_factory is not MISSING:
+        return field.default_factory()
+    return None
+
+
+def _compile_enum_decoder(enum_type: Type[Enum]) -> Callable[[Any], Any]:
+    ''' Compiles the decoder used to convert BSON values into members of the specified enum type. Enums are stored by name, but values are matched too, for documents written by other means '''
+    members = dict[Any, Enum]()
+    for enum_member in enum_type:
+        try:
+            members.setdefault(enum_member.value, enum_member)
+        except TypeError:
+            pass
+    members.update(enum_type.__members__)
+
+    def decode_enum(value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return members[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid enum value for {enum_type.__name__}: {value}")
+
+    return decode_enum
+
+
+def _get_slots(value_type: type) -> tuple:
+    slots = value_type.__dict__.get('__slots__', ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+import logging
+import threading
+from typing import Any, Dict, List, Set, Tuple
+from pymongo.collection import Collection
+from neuroglia.data.abstractions import IndexDefinition
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class MongoCollectionScan:
+    ''' Represents a query, identified by the fields it filters on, that is not backed by any index and therefore scans its collection '''
+
+    collection_name: str
+    ''' Gets the full name of the scanned collection '''
+
+    fields: List[str]
+    ''' Gets the paths of the fields the query filters on '''
+
+    occurrences: int = 0
+    ''' Gets the number of times the query has been executed '''
+
+
+class MongoIndexManager:
+    ''' Represents the service used to create and verify the indexes declared on the entities stored in Mongo, and to report the queries that are not backed by any of them '''
+
+    _leading_fields: Dict[str, Set[str]]
+    ''' Gets a mapping of the full name of the known collections to the first field of each of their indexes, which are the only fields an index can serve a query on '''
+
+    _collection_scans: Dict[Tuple[str, Tuple[str, ...]], MongoCollectionScan]
+    ''' Gets a mapping of the queries that have been reported to scan their collection, keyed by collection and filtered fields '''
+
+    _lock: threading.Lock
+    ''' Gets the lock used to synchronize accesses to the report '''
+
+    def __init__(self):
+        self._leading_fields = dict[str, Set[str]]()
+        self._collection_scans = dict[Tuple[str, Tuple[str, ...]], MongoCollectionScan]()
+        self._lock = threading.Lock()
+
+    def ensure_indexes(self, collection: Collection, indexes: List[IndexDefinition]) -> None:
+        ''' Creates the specified indexes, as well as the unique index on entity ids, on the specified collection, unless they already exist. Raises an exception if an existing index defines the same fields with different options '''
+        existing_indexes = {
+            tuple((field, self._normalize_direction(direction)) for field, direction in information["key"]): (name, information)
+            for name, information in collection.index_information().items()
+        }
+        for index in [IndexDefinition([("id", 1)], unique=True), *indexes]:
+            key = tuple(index.fields)
+            existing_index = existing_indexes.get(key)
+            if existing_index is None:
+                options = dict[str, Any](unique=index.unique)
+                if index.expire_after_seconds is not None:
+                    options["expireAfterSeconds"] = index.expire_after_seconds
+                if index.name is not None:
+                    options["name"] = index.name
+                collection.create_index(list(key), **options)
+                existing_indexes[key] = (index.name, options)
+                continue
+            name, information = existing_index
+            if bool(information.get("unique", False)) != index.unique or information.get("expireAfterSeconds") != index.expire_after_seconds:
+                raise Exception(f"The index '{name}' of the collection '{collection.full_name}' does not match its declaration: expected unique={index.unique} and expire_after_seconds={index.expire_after_seconds}, got unique={information.get('unique', False)} and expire_after_seconds={information.get('expireAfterSeconds')}")
+        self._leading_fields[collection.full_name] = {key[0][0] for key in existing_indexes.keys()}
+
+    def check_filter(self, collection: Collection, filter: Dict[str, Any]) -> bool:
+        ''' Determines whether or not the specified filter can be served by one of the indexes of the specified collection. Filters that cannot are logged and recorded in the report '''
+        if len(filter) < 1:
+            return True
+        leading_fields = self._leading_fields.get(collection.full_name)
+        if leading_fields is None:
+            # The indexes of collections that have not been ensured are read once, then cached
+            leading_fields = {information["key"][0][0] for information in collection.index_information().values()}
+            self._leading_fields[collection.full_name] = leading_fields
+        if self._is_indexed(filter, leading_fields):
+            return True
+        fields = tuple(sorted(self._get_filtered_fields(filter)))
+        key = (collection.full_name, fields)
+        with self._lock:
+            collection_scan = self._collection_scans.get(key)
+            if collection_scan is None:
+                collection_scan = MongoCollectionScan(collection.full_name, list(fields))
+                self._collection_scans[key] = collection_scan
+                log.warning(f"A query on the collection '{collection.full_name}' filters on fields {list(fields)}, none of which is the first field of an index: the query scans the whole collection")
+            collection_scan.occurrences += 1
+        return False
+
+    def get_collection_scans(self) -> List[MongoCollectionScan]:
+        ''' Gets a report of the queries that have been executed without being backed by any index, most frequent first '''
+        with self._lock:
+            return sorted(self._collection_scans.values(), key=lambda collection_scan: collection_scan.occurrences, reverse=True)
+
+    def _normalize_direction(self, direction: Any) -> Any:
+        ''' Normalizes the specified index direction, which Mongo may report as a float. Directions of special indexes, such as 'text', 'hashed' or '2dsphere', are returned as is '''
+        return int(direction) if isinstance(direction, (int, float)) else direction
+
+    def _is_indexed(self, filter: Dict[str, Any], leading_fields: Set[str]) -> bool:
+        for key, value in filter.items():
+            if key == "$and" and any(self._is_indexed(clause, leading_fields) for clause in value):
+                return True
+            elif key == "$or" and all(self._is_indexed(clause, leading_fields) for clause in value):
+                return True
+            elif not key.startswith("$") and key in leading_fields:
+                return True
+        return False
+
+    def _get_filtered_fields(self, filter: Dict[str, Any]) -> Set[str]:
+        fields = set[str]()
+        for key, value in filter.items():
+            if key in ("$and", "$or", "$nor"):
+                for clause in value:
+                    fields.update(self._get_filtered_fields(clause))
+            else:
+                # Operators such as '$where' or '$expr' are reported as is
+                fields.add(key)
+        return fields
@@ -1,18 +1,30 @@
 import ast
+import asyncio
+import copy
+from bson import Decimal128
+from concurrent.futures import ThreadPoolExecutor
 from inspect import isclass
+from itertools import islice
 import pymongo
 from ast import NodeVisitor, expr
 from dataclasses import dataclass
-from neuroglia.data.queryable import T, QueryProvider, Queryable
-from neuroglia.data.infrastructure.abstractions import FlexibleRepository, QueryableRepository, Repository
+from decimal import Decimal
+from neuroglia.data.queryable import T, CompiledQuery, QueryParameter, QueryProvider, Queryable
+from neuroglia.data.infrastructure.abstractions import BulkOperationError, BulkOperationException, FlexibleRepository, OptimisticConcurrencyException, QueryableRepository, Repository
 from neuroglia.data.abstractions import TEntity, TKey, VersionedState
-from pymongo import MongoClient
+from neuroglia.data.infrastructure.mongo.mongo_entity_codec import MongoEntityCodec
+from neuroglia.data.infrastructure.mongo.mongo_index_manager import MongoIndexManager
+from pymongo import DeleteOne, MongoClient, ReplaceOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from pymongo.collection import Collection
+from pymongo.command_cursor import CommandCursor
 from pymongo.cursor import Cursor
 from pymongo.database import Database
-from typing import Any, Dict, Generic, Optional, List, Type
+from types import UnionType
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Mapping, Optional, List, Set, Tuple, Type, Union, get_args, get_origin, get_type_hints
 from neuroglia.expressions.javascript_expression_translator import JavaScriptExpressionTranslator
-from neuroglia.hosting.abstractions import ApplicationBuilderBase
+from neuroglia.expressions.mongo_expression_translator import MongoExpressionTranslator
+from neuroglia.hosting.abstractions import ApplicationBuilderBase, HostedService
 from neuroglia.serialization.json import JsonSerializer
 
 
@@ -24,25 +36,152 @@ class MongoRepositoryOptions(Generic[TEntity, TKey]):
     ''' Gets the name of the Mongo database to use '''
 
 
+_duplicate_key_error_code = 11000
+''' Gets the code of the error returned by Mongo when a write violates a unique index '''
+
+
+_default_batch_size = 1000
+''' Gets the number of documents fetched per round trip when streaming query results, unless specified otherwise '''
+
+
+_group_accumulators = {
+    "count": "$sum",
+    "sum": "$sum",
+    "min": "$min",
+    "max": "$max",
+    "average": "$avg"
+}
+''' Gets a mapping of the aggregates that can be computed on groups to the Mongo accumulator they translate to '''
+
+
+async def _run_inline(operation: Callable[..., Any], *args) -> Any:
+    ''' Runs the specified blocking Mongo operation on the calling thread '''
+    return operation(*args)
+
+
+class _UncompilableQueryException(Exception):
+    ''' Represents the exception raised when the parameters of a compiled query cannot be bound into its translation, which must therefore be performed on every execution '''
+    pass
+
+
+def _bind_query_parameters(value: Any, parameters: Mapping[str, Any], encode: Callable[[Any], Any]) -> Any:
+    ''' Replaces the query parameters found in the specified translated query clause by the encoded value of the specified parameters '''
+    value_type = type(value)
+    if value_type is QueryParameter:
+        return encode(parameters[value.name])
+    elif value_type is dict:
+        return {key: _bind_query_parameters(item, parameters, encode) for key, item in value.items()}
+    elif value_type is list:
+        return [_bind_query_parameters(item, parameters, encode) for item in value]
+    return value
+
+
+def _build_projection(fields: List[str]) -> Dict[str, int]:
+    ''' Builds the Mongo projection that only includes the specified fields '''
+    return {"_id": 0, **{field: 1 for field in fields}}
+
+
+def _decode_as_is(document: Any) -> Any:
+    return document
+
+
+_decimal_fields = dict[Type, Tuple[str, ...]]()
+''' Gets a mapping of the queried types to the names of their decimal attributes '''
+
+
+def _get_decimal_fields(element_type: Type) -> Tuple[str, ...]:
+    fields = _decimal_fields.get(element_type)
+    if fields is None:
+        try:
+            type_hints = get_type_hints(element_type)
+        except Exception:
+            type_hints = dict[str, Any]()
+        fields = tuple(name for name, type_hint in type_hints.items() if type_hint is Decimal or (get_origin(type_hint) in (Union, UnionType) and Decimal in get_args(type_hint)))
+        _decimal_fields[element_type] = fields
+    return fields
+
+
+def _fetch_batch(cursor: Cursor, batch_size: int) -> List[Any]:
+    ''' Fetches the next batch of documents from the specified cursor '''
+    return list(islice(cursor, batch_size))
+
+
+class MongoExecutor:
+    ''' Represents the bounded pool of threads dedicated to running blocking Mongo operations outside of the event loop '''
+
+    def __init__(self, max_workers: int = 32):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mongo")
+
+    _executor: ThreadPoolExecutor
+    ''' Gets the pool of threads used to run blocking Mongo operations '''
+
+    async def run_async(self, operation: Callable[..., Any], *args) -> Any:
+        ''' Runs the specified blocking operation on a dedicated thread, and waits for it to complete without blocking the event loop '''
+        return await asyncio.get_running_loop().run_in_executor(self._executor, operation, *args)
+
+    def dispose(self):
+        ''' Shuts the executor down '''
+        self._executor.shutdown(wait=False)
+
+
 class MongoQuery(Generic[T], Queryable[T]):
     ''' Represents a Mongo query '''
 
     def __init__(self, query_provider: 'MongoQueryProvider', expression: Optional[expr] = None):
         super().__init__(query_provider, expression)
 
+    def to_filter(self) -> Dict[str, Any]:
+        ''' Gets the Mongo filter the query translates to '''
+        return self.provider.build_filter(self.expression)
+
+    def explain(self) -> Dict[str, Any]:
+        ''' Explains how Mongo executes the query, which can be used to check whether or not it is backed by an index '''
+        return self.provider.explain(self.expression)
+
 
 class MongoQueryBuilder(NodeVisitor):
     ''' Represents the service used to build mongo queries '''
 
-    def __init__(self, collection: Collection, translator: JavaScriptExpressionTranslator):
+    def __init__(self, collection: Collection, translator: JavaScriptExpressionTranslator, filter_translator: Optional[MongoExpressionTranslator] = None, element_type: Optional[Type] = None):
         self._collection = collection
         self._translator = translator
+        self._filter_translator = filter_translator if filter_translator is not None else MongoExpressionTranslator()
+        self._element_type = element_type
+        self._order_by_clauses = dict[str, int]()
+        self._where_clauses = list[Dict[str, Any]]()
+        self._pipeline = list[Dict[str, Any]]()
+        self._result_types = dict[str, Optional[Type]]()
 
     _collection: Collection
 
+    _element_type: Optional[Type]
+    ''' Gets the type of the queried elements, if known, used to determine how the aggregated fields are stored '''
+
+    _pipeline: List[Dict[str, Any]]
+    ''' Gets the stages of the aggregation pipeline the query translates to, in the order the clauses have been applied '''
+
+    _group_by_clause: Optional[str] = None
+    ''' Gets the path of the field the elements are grouped by, if the groups have not been projected yet '''
+
+    _aggregate_clause: Optional[str] = None
+    ''' Gets the name of the aggregate the query terminates with, if any '''
+
+    _aggregate_field: Optional[str] = None
+    ''' Gets the path of the field the aggregate the query terminates with applies to, if any '''
+
+    _requires_pipeline: bool = False
+    ''' Gets a boolean indicating whether or not the query can only be executed as an aggregation pipeline '''
+
+    _result_types: Dict[str, Optional[Type]]
+    ''' Gets a mapping of the keys of the documents produced by the projection of groups to the type of their values, if known '''
+
     _translator: JavaScriptExpressionTranslator
+    ''' Gets the service used to translate expressions that have no native Mongo equivalent into JavaScript '''
+
+    _filter_translator: MongoExpressionTranslator
+    ''' Gets the service used to translate predicates into native Mongo filters '''
 
-    _order_by_clauses: Dict[str, int] = dict[str, int]()
+    _order_by_clauses: Dict[str, int]
 
     _select_clause: Optional[List[str]] = None
 
@@ -50,68 +189,234 @@ class MongoQueryBuilder(NodeVisitor):
 
     _take_clause: Optional[int] = None
 
-    _where_clauses: List[str] = list[str]()
+    _where_clauses: List[Dict[str, Any]]
 
     def build(self, expression: expr) -> Cursor:
         self.visit(expression)
-        cursor: Cursor = self._collection.find(projection=self._select_clause)
+        return self._build_cursor()
+
+    def _build_cursor(self) -> Cursor | CommandCursor:
+        if self._requires_pipeline:
+            return self._collection.aggregate(self._build_pipeline())
+        cursor: Cursor = self._collection.find(self._build_filter(), projection=_build_projection(self._select_clause) if self._select_clause is not None else None)
         if len(self._order_by_clauses) > 0:
             cursor = cursor.sort(self._order_by_clauses)
-        if len(self._where_clauses) > 0:
-            cursor = cursor.where(" && ".join(self._where_clauses))
         if self._skip_clause is not None:
             cursor = cursor.skip(self._skip_clause)
         if self._take_clause is not None:
             cursor = cursor.limit(self._take_clause)
         return cursor
 
+    def build_filter(self, expression: expr) -> Dict[str, Any]:
+        ''' Builds the Mongo filter the specified query expression translates to '''
+        self.visit(expression)
+        return self._build_filter()
+
+    def build_pipeline(self, expression: expr) -> List[Dict[str, Any]]:
+        ''' Builds the Mongo aggregation pipeline the specified query expression translates to, excluding the aggregate it terminates with, if any '''
+        self.visit(expression)
+        return self._build_pipeline()
+
+    def bind(self, parameters: Mapping[str, Any], encode: Callable[[Any], Any]) -> 'MongoQueryBuilder':
+        ''' Creates a copy of the builder, which must have visited the expression of a compiled query, in which the query's parameters are replaced by the specified values, encoded using the specified function '''
+        query_builder = copy.copy(self)
+        query_builder._where_clauses = _bind_query_parameters(self._where_clauses, parameters, encode)
+        query_builder._pipeline = _bind_query_parameters(self._pipeline, parameters, encode)
+        query_builder._skip_clause = _bind_query_parameters(self._skip_clause, parameters, encode)
+        query_builder._take_clause = _bind_query_parameters(self._take_clause, parameters, encode)
+        return query_builder
+
     def visit_Call(self, node):
         clause = node.func.attr
-        expression = node.args[0]
+        expression = node.args[0] if len(node.args) > 0 else None
         self.visit(node.func.value)
-        javascript = self._translator.translate(expression)
         if clause == "distinct_by":
-            self._distinct_by_clauses.append(javascript.replace("this.", ""))
+            field = self._translate_field(expression)
+            self._pipeline.append({"$group": {"_id": f"${field}", "document": {"$first": "$$ROOT"}}})
+            self._pipeline.append({"$replaceRoot": {"newRoot": "$document"}})
+            self._requires_pipeline = True
+        elif clause == "group_by":
+            self._group_by_clause = self._translate_field(expression)
+            self._requires_pipeline = True
+        elif clause in ("count", "any"):
+            self._aggregate_clause = clause
+        elif clause in ("sum", "min", "max", "distinct"):
+            self._aggregate_clause = clause
+            self._aggregate_field = self._translate_field(expression)
         elif clause == "first":
-            self._where_clauses.append(javascript)
+            self._where_clauses.append(self._translate_predicate(expression))
             self._take_clause = 1
+            self._pipeline.append({"$match": self._where_clauses[-1]})
+            self._pipeline.append({"$limit": 1})
         elif clause == "last":
-            self._where_clauses.append(javascript)
+            self._where_clauses.append(self._translate_predicate(expression))
             self._take_clause = 1
             # todo: could be anything, really
             self._order_by_clauses["created_at"] = pymongo.DESCENDING
+            self._pipeline.append({"$match": self._where_clauses[-1]})
+            self._pipeline.append({"$sort": {"created_at": pymongo.DESCENDING}})
+            self._pipeline.append({"$limit": 1})
         elif clause == "order_by":
-            self._order_by_clauses[javascript.replace(
-                "this.", "")] = pymongo.ASCENDING
+            self._add_sort_stage(self._translate_field(expression), pymongo.ASCENDING)
         elif clause == "order_by_descending":
-            self._order_by_clauses[javascript.replace(
-                "this.", "")] = pymongo.DESCENDING
+            self._add_sort_stage(self._translate_field(expression), pymongo.DESCENDING)
+        elif clause == "select" and isinstance(expression.body, ast.Dict) and self._group_by_clause is not None:
+            self._pipeline.extend(self._translate_group_projection(expression))
+            self._group_by_clause = None
         elif clause == "select" and isinstance(expression.body, ast.List):
             self._select_clause = [self._translator.translate(
                 elt).replace("this.", "") for elt in expression.body.elts]
+            self._pipeline.append({"$project": _build_projection(self._select_clause)})
         elif clause == "skip" and isinstance(expression, ast.Constant):
             self._skip_clause = expression.value
+            self._pipeline.append({"$skip": expression.value})
         elif clause == "take" and isinstance(expression, ast.Constant):
             self._take_clause = expression.value
+            self._pipeline.append({"$limit": expression.value})
         elif clause == "where":
-            self._where_clauses.append(javascript)
+            self._where_clauses.append(self._translate_predicate(expression))
+            self._pipeline.append({"$match": self._where_clauses[-1]})
         pass
 
+    def _translate_field(self, expression: expr) -> str:
+        ''' Translates the specified attribute selector into the path of the field it selects '''
+        return self._translator.translate(expression).replace("this.", "")
+
+    def _add_sort_stage(self, field: str, direction: int):
+        self._order_by_clauses[field] = direction
+        if len(self._pipeline) > 0 and "$sort" in self._pipeline[-1]:
+            self._pipeline[-1]["$sort"][field] = direction
+        else:
+            self._pipeline.append({"$sort": {field: direction}})
+
+    def _translate_group_projection(self, expression: ast.Lambda) -> List[Dict[str, Any]]:
+        ''' Translates the specified projection of groups, whose values must either be the key of the group or an aggregate of its elements, into '$group' and '$project' stages '''
+        argument_name = expression.args.args[0].arg
+        accumulators = dict[str, Any]()
+        projection = dict[str, Any](_id=0)
+        for key_expression, value_expression in zip(expression.body.keys, expression.body.values):
+            if not isinstance(key_expression, ast.Constant) or not isinstance(key_expression.value, str):
+                raise Exception(f"The keys of the projection '{ast.unparse(expression)}' must be string constants")
+            key = key_expression.value
+            if isinstance(value_expression, ast.Attribute) and isinstance(value_expression.value, ast.Name) and value_expression.value.id == argument_name and value_expression.attr == "key":
+                projection[key] = "$_id"
+                self._result_types[key] = self._get_field_type(self._group_by_clause)
+                continue
+            if not isinstance(value_expression, ast.Call) or not isinstance(value_expression.func, ast.Attribute) or value_expression.func.attr not in _group_accumulators:
+                raise Exception(f"The expression '{ast.unparse(value_expression)}' cannot be translated into a Mongo aggregate: group projections only support the key of the group and the 'count', 'sum', 'min', 'max' and 'average' aggregates")
+            aggregate = value_expression.func.attr
+            if aggregate == "count":
+                accumulators[key] = {"$sum": 1}
+                self._result_types[key] = int
+            else:
+                if len(value_expression.args) != 1:
+                    raise Exception(f"The aggregate '{ast.unparse(value_expression)}' must specify the attribute to aggregate")
+                field = self._translate_field(value_expression.args[0])
+                accumulators[key] = {_group_accumulators[aggregate]: self._build_operand(field)}
+                field_type = self._get_field_type(field)
+                self._result_types[key] = field_type if aggregate != "average" or field_type is Decimal else None
+            projection[key] = f"${key}"
+        return [{"$group": {"_id": f"${self._group_by_clause}", **accumulators}}, {"$project": projection}]
+
+    def _build_operand(self, field: str) -> Any:
+        ''' Builds the operand used to aggregate the specified field, converting the decimals written as strings by earlier versions into Decimal128 numbers '''
+        return {"$toDecimal": f"${field}"} if self._get_field_type(field) is Decimal else f"${field}"
+
+    def _get_field_type(self, field: str) -> Optional[Type]:
+        ''' Gets the type of the specified field of the queried elements, if known '''
+        field_type = self._element_type
+        for name in field.split("."):
+            if not isclass(field_type):
+                return None
+            try:
+                field_type = get_type_hints(field_type).get(name)
+            except Exception:
+                return None
+            if get_origin(field_type) in (Union, UnionType):
+                type_args = [type_arg for type_arg in get_args(field_type) if type_arg is not type(None)]
+                field_type = type_args[0] if len(type_args) == 1 else None
+        return field_type
+
+    def _build_pipeline(self) -> List[Dict[str, Any]]:
+        pipeline = list(self._pipeline)
+        if self._group_by_clause is not None:
+            # Groups that have not been projected are returned along with their elements
+            pipeline.append({"$group": {"_id": f"${self._group_by_clause}", "items": {"$push": "$$ROOT"}}})
+            pipeline.append({"$project": {"_id": 0, "key": "$_id", "items": 1}})
+        return pipeline
+
+    def _translate_predicate(self, expression: expr) -> Dict[str, Any]:
+        ''' Translates the specified predicate into a native Mongo filter, falling back to a JavaScript $where clause for the conjuncts that cannot be translated '''
+        filter, untranslated_expressions = self._filter_translator.translate_partially(expression)
+        if len(untranslated_expressions) < 1:
+            return filter
+        if any(isinstance(node, ast.Constant) and isinstance(node.value, QueryParameter) for untranslated_expression in untranslated_expressions for node in ast.walk(untranslated_expression)):
+            raise _UncompilableQueryException(f"The expression '{ast.unparse(expression)}' has no native Mongo equivalent, and its parameters cannot be bound once translated")
+        javascript = " && ".join(f"({self._translator.translate(untranslated_expression)})" for untranslated_expression in untranslated_expressions)
+        if len(filter) < 1:
+            return {"$where": javascript}
+        return {"$and": [filter, {"$where": javascript}]}
+
+    def _build_filter(self) -> Dict[str, Any]:
+        where_clauses = [where_clause for where_clause in self._where_clauses if len(where_clause) > 0]
+        if len(where_clauses) < 1:
+            return {}
+        elif len(where_clauses) == 1:
+            return where_clauses[0]
+        return {"$and": where_clauses}
+
 
 class MongoQueryProvider(QueryProvider):
     ''' Represents the Mongo implementation of the QueryProvider '''
 
-    def __init__(self, collection: Collection):
+    def __init__(self, collection: Collection, codec: Optional[MongoEntityCodec] = None, index_manager: Optional[MongoIndexManager] = None, run_async: Optional[Callable[..., Awaitable[Any]]] = None, element_type: Optional[Type] = None):
         self._collection = collection
+        self._codec = codec if codec is not None else MongoEntityCodec()
+        self._index_manager = index_manager
+        self._run_async = run_async if run_async is not None else _run_inline
+        self._element_type = element_type
 
     _collection: Collection
 
+    _codec: MongoEntityCodec
+    ''' Gets the service used to convert the values queries are compared to into their stored representation '''
+
+    _index_manager: Optional[MongoIndexManager]
+    ''' Gets the service used to report the queries that are not backed by any index, if any '''
+
+    _run_async: Callable[..., Awaitable[Any]]
+    ''' Gets the function used to run the blocking Mongo operations performed when streaming query results '''
+
+    _element_type: Optional[Type]
+    ''' Gets the type of the queried elements, if known, used to convert aggregated values to and from their stored representation '''
+
     def create_query(self, element_type: Type,
                      expression: expr) -> Queryable: return MongoQuery[element_type](self, expression)
 
     def execute(self, expression: expr, query_type: Type) -> Any:
-        query = MongoQueryBuilder(
-            self._collection, JavaScriptExpressionTranslator()).build(expression)
+        query_builder = self._create_query_builder()
+        query_builder.visit(expression)
+        return self._execute_query_builder(query_builder, query_type)
+
+    async def execute_async(self, expression: expr, query_type: Type) -> Any: return await self._run_async(self.execute, expression, query_type)
+
+    async def execute_compiled_async(self, executor: Callable[[Mapping[str, Any]], Any], parameters: Mapping[str, Any]) -> Any: return await self._run_async(executor, parameters)
+
+    def compile(self, expression: expr, query_type: Type) -> Callable[[Mapping[str, Any]], Any]:
+        query_builder = self._create_query_builder()
+        try:
+            query_builder.visit(expression)
+        except _UncompilableQueryException:
+            return super().compile(expression, query_type)
+        encode = self._codec.encode_value
+        return lambda parameters: self._execute_query_builder(query_builder.bind(parameters, encode), query_type)
+
+    def _execute_query_builder(self, query_builder: MongoQueryBuilder, query_type: Type) -> Any:
+        ''' Executes the query built by the specified builder '''
+        self._check_filter(query_builder)
+        if query_builder._aggregate_clause is not None:
+            return self._execute_aggregate(query_builder)
+        query = map(self._create_result_decoder(query_builder), query_builder._build_cursor())
         type_ = query_type if isclass(
             query_type) or query_type == List else type(query_type)
         if issubclass(type_, List):
@@ -119,17 +424,126 @@ class MongoQueryProvider(QueryProvider):
         else:
             return next(query, None)
 
+    async def execute_async_iter(self, expression: expr, batch_size: Optional[int] = None) -> AsyncIterator[Any]:
+        batch_size = batch_size if batch_size is not None and batch_size > 0 else _default_batch_size
+        query_builder = self._create_query_builder()
+        query_builder.visit(expression)
+        self._check_filter(query_builder)
+        if query_builder._aggregate_clause is not None:
+            raise Exception(f"The query '{ast.unparse(expression)}' computes an aggregate, and cannot be iterated")
+        decode = self._create_result_decoder(query_builder)
+        cursor = query_builder._build_cursor().batch_size(batch_size)
+        try:
+            while True:
+                batch = await self._run_async(_fetch_batch, cursor, batch_size)
+                for document in batch:
+                    yield decode(document)
+                if len(batch) < batch_size:
+                    break
+        finally:
+            cursor.close()
+
+    def build_filter(self, expression: expr) -> Dict[str, Any]:
+        ''' Builds the Mongo filter the specified query expression translates to '''
+        return self._create_query_builder().build_filter(expression)
+
+    def build_pipeline(self, expression: expr) -> List[Dict[str, Any]]:
+        ''' Builds the Mongo aggregation pipeline the specified query expression translates to, excluding the aggregate it terminates with, if any '''
+        return self._create_query_builder().build_pipeline(expression)
+
+    def explain(self, expression: expr) -> Dict[str, Any]:
+        ''' Explains how Mongo executes the specified query expression '''
+        query_builder = self._create_query_builder()
+        query_builder.visit(expression)
+        if query_builder._requires_pipeline:
+            return self._collection.database.command("explain", {"aggregate": self._collection.name, "pipeline": query_builder._build_pipeline(), "cursor": {}})
+        return query_builder._build_cursor().explain()
+
+    def _check_filter(self, query_builder: MongoQueryBuilder):
+        ''' Reports the query built by the specified builder if it is not backed by any index '''
+        if self._index_manager is not None:
+            self._index_manager.check_filter(self._collection, query_builder._build_filter())
+
+    def _execute_aggregate(self, query_builder: MongoQueryBuilder) -> Any:
+        ''' Computes the aggregate the query built by the specified builder terminates with. Counts and existence checks on plain filters use 'count_documents' and a single-document 'find', other aggregates an aggregation pipeline '''
+        clause = query_builder._aggregate_clause
+        field = query_builder._aggregate_field
+        filter = query_builder._build_filter()
+        skip = query_builder._skip_clause if query_builder._skip_clause is not None else 0
+        if clause == "count":
+            if query_builder._requires_pipeline:
+                return next(self._collection.aggregate([*query_builder._build_pipeline(), {"$count": "count"}]), {"count": 0})["count"]
+            options = dict[str, Any](skip=skip)
+            if query_builder._take_clause is not None:
+                options["limit"] = query_builder._take_clause
+            return self._collection.count_documents(filter, **options)
+        elif clause == "any":
+            if query_builder._requires_pipeline:
+                return next(self._collection.aggregate([*query_builder._build_pipeline(), {"$limit": 1}, {"$project": {"_id": 1}}]), None) is not None
+            return next(self._collection.find(filter, projection={"_id": 1}, skip=skip, limit=1), None) is not None
+        field_type = query_builder._get_field_type(field)
+        if clause == "distinct":
+            if query_builder._requires_pipeline or query_builder._skip_clause is not None or query_builder._take_clause is not None:
+                values = [document["_id"] for document in self._collection.aggregate([*query_builder._build_pipeline(), {"$group": {"_id": f"${field}"}}])]
+            else:
+                values = self._collection.distinct(field, filter)
+            return [self._decode_value(value, field_type) for value in values]
+        document = next(self._collection.aggregate([*query_builder._build_pipeline(), {"$group": {"_id": None, "value": {f"${clause}": query_builder._build_operand(field)}}}]), None)
+        if document is None or document["value"] is None:
+            return 0 if clause == "sum" else None
+        return self._decode_value(document["value"], field_type)
+
+    def _create_result_decoder(self, query_builder: MongoQueryBuilder) -> Callable[[Any], Any]:
+        ''' Creates the function used to decode the documents returned by the query built by the specified builder. Only projections are decoded: projected fields are hydrated into partial instances of the queried type, if known, whose other attributes are unset, and projected groups into dictionaries of decoded values '''
+        if query_builder._select_clause is not None and self._element_type is not None:
+            element_type = self._element_type
+            return lambda document: self._codec.decode(document, element_type)
+        result_types = dict(query_builder._result_types)
+        if len(result_types) < 1:
+            return self._create_document_decoder()
+        return lambda document: {key: self._decode_value(value, result_types.get(key)) for key, value in document.items()}
+
+    def _create_document_decoder(self) -> Callable[[Any], Any]:
+        ''' Creates the function used to decode the documents returned as is, converting the Decimal128 values of the queried type's decimal attributes into decimals, which can be compared, serialized and used to resume paged queries '''
+        decimal_fields = _get_decimal_fields(self._element_type) if self._element_type is not None else ()
+        if len(decimal_fields) < 1:
+            return _decode_as_is
+
+        def decode_document(document: Any) -> Any:
+            for field in decimal_fields:
+                value = document.get(field)
+                if isinstance(value, Decimal128):
+                    document[field] = value.to_decimal()
+            return document
+
+        return decode_document
+
+    def _decode_value(self, value: Any, expected_type: Optional[Type]) -> Any:
+        if expected_type is None:
+            return value.to_decimal() if isinstance(value, Decimal128) else value
+        return self._codec.decode_value(value, expected_type)
+
+    def _create_query_builder(self) -> MongoQueryBuilder:
+        return MongoQueryBuilder(self._collection, JavaScriptExpressionTranslator(), MongoExpressionTranslator(self._encode_value), self._element_type)
+
+    def _encode_value(self, value: Any) -> Any:
+        ''' Encodes the specified value, which queries are compared to, into its stored representation. The parameters of compiled queries are left as is, to be bound on execution '''
+        return value if isinstance(value, QueryParameter) else self._codec.encode_value(value)
+
 
 class MongoRepository(Generic[TEntity, TKey], QueryableRepository[TEntity, TKey]):
     ''' Represents a Mongo implementation of the repository class '''
 
-    def __init__(self, options: MongoRepositoryOptions[TEntity, TKey], mongo_client: MongoClient, serializer: JsonSerializer):
+    def __init__(self, options: MongoRepositoryOptions[TEntity, TKey], mongo_client: MongoClient, serializer: JsonSerializer, codec: Optional[MongoEntityCodec] = None, index_manager: Optional[MongoIndexManager] = None):
         ''' Initializes a new Mongo repository '''
         self._options = options
         self._mongo_client = mongo_client
         self._mongo_database = self._mongo_client[self._options.database_name]
         self._serializer = serializer
+        self._codec = codec if codec is not None else MongoEntityCodec()
+        self._index_manager = index_manager if index_manager is not None else MongoIndexManager()
         self._collection_name = None
+        self._indexed_collections = set[str]()
 
     _options: MongoRepositoryOptions[TEntity, TKey]
     ''' Gets the options used to configure the Mongo repository '''
@@ -143,45 +557,193 @@ class MongoRepository(Generic[TEntity, TKey], QueryableRepository[TEntity, TKey]
     _serializer: JsonSerializer
     ''' Gets the service used to serialize/deserialize to/from JSON '''
 
-    async def contains_async(self, id: TKey) -> bool: return self._get_mongo_collection().find_one({"id": id}, projection={"_id": 1})
+    _codec: MongoEntityCodec
+    ''' Gets the service used to convert entities to and from BSON documents '''
+
+    _indexed_collections: Set[str]
+    ''' Gets the full names of the collections on which the unique index on entity ids has been ensured '''
+
+    _index_manager: MongoIndexManager
+    ''' Gets the service used to manage the indexes declared on the entities, and to report the queries that are not backed by any of them '''
+
+    async def contains_async(self, id: TKey) -> bool: return await self._run_async(self._contains, id)
+
+    async def get_async(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TEntity]: return await self._run_async(self._get, id, fields)
+
+    async def add_async(self, entity: TEntity) -> TEntity: return await self._run_async(self._add, entity)
+
+    async def update_async(self, entity: TEntity) -> TEntity: return await self._run_async(self._update, entity)
+
+    async def remove_async(self, id: TKey) -> None: return await self._run_async(self._remove, id)
 
-    async def get_async(self, id: TKey) -> Optional[TEntity]:
-        attributes_dictionary = self._get_mongo_collection().find_one({"id": id})
+    async def add_many_async(self, entities: List[TEntity], ordered: bool = True) -> List[TEntity]: return await self._run_async(self._add_many, entities, ordered)
+
+    async def update_many_async(self, entities: List[TEntity], ordered: bool = True) -> List[TEntity]: return await self._run_async(self._update_many, entities, ordered)
+
+    async def remove_many_async(self, ids: List[TKey], ordered: bool = True) -> None: return await self._run_async(self._remove_many, ids, ordered)
+
+    async def ensure_indexes_async(self) -> None:
+        ''' Creates or verifies the unique index on entity ids, as well as the indexes declared on the type of entity using the 'index' decorator '''
+        return await self._run_async(self._ensure_indexes)
+
+    async def _run_async(self, operation: Callable[..., Any], *args) -> Any:
+        ''' Runs the specified blocking Mongo operation '''
+        return operation(*args)
+
+    def _contains(self, id: TKey) -> bool: return self._get_mongo_collection().find_one({"id": id}, projection={"_id": 1}) is not None
+
+    def _get(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TEntity]:
+        attributes_dictionary = self._get_mongo_collection().find_one({"id": id}, projection=_build_projection(["id", *fields]) if fields is not None else None)
         if (attributes_dictionary is None):
             return None
-        json = self._serializer.serialize(attributes_dictionary)
-        entity = self._serializer.deserialize_from_text(json, self._get_entity_type())
-        return entity
+        return self._codec.decode(attributes_dictionary, self._get_entity_type())
+
+    def _ensure_indexes(self) -> None:
+        collection = self._get_mongo_collection()
+        self._index_manager.ensure_indexes(collection, getattr(self._get_entity_type(), "__indexes__", []))
+        self._indexed_collections.add(collection.full_name)
 
-    async def add_async(self, entity: TEntity) -> TEntity:
-        if await self.contains_async(entity.id) is not None:
+    def _add(self, entity: TEntity) -> TEntity:
+        try:
+            self._get_writable_mongo_collection().insert_one(self._codec.encode(entity))
+        except DuplicateKeyError:
             raise Exception(f"A {self._get_entity_type().__name__} with the specified id '{entity.id}' already exists")
-        json = self._serializer.serialize_to_text(entity)
-        attributes_dictionary = self._serializer.deserialize_from_text(
-            json, dict)
-        self._get_mongo_collection().insert_one(attributes_dictionary)
         return entity
 
-    async def update_async(self, entity: TEntity) -> TEntity:
-        if not await self.contains_async(entity.id) is not None:
-            raise Exception(f"Failed to find a {self._get_entity_type().__name__} with the specified id '{entity.id}'")
-        query_filter = {"id": entity.id}
-        expected_version = entity.state_version if isinstance(
-            entity, VersionedState) else None
-        if expected_version is not None:
-            query_filter["state_version"] = expected_version
-        json = self._serializer.serialize_to_text(entity)
-        attributes_dictionary = self._serializer.deserialize_from_text(
-            json, dict)
-        self._get_mongo_collection().replace_one(query_filter, attributes_dictionary)
+    def _update(self, entity: TEntity) -> TEntity:
+        collection = self._get_writable_mongo_collection()
+        query_filter, document = self._build_replacement(entity)
+        if collection.replace_one(query_filter, document).matched_count < 1:
+            self._raise_update_failure(collection, entity)
+        if isinstance(entity, VersionedState):
+            entity.state_version = document["state_version"]
         return entity
 
-    async def remove_async(self, id: TKey) -> None:
-        if not await self.contains_async(id) is not None:
+    def _remove(self, id: TKey) -> None:
+        if self._get_writable_mongo_collection().delete_one({"id": id}).deleted_count < 1:
             raise Exception(f"Failed to find a {self._get_entity_type().__name__} with the specified id '{id}'")
-        self._get_mongo_collection().delete_one({"id": id})
 
-    async def query_async(self) -> Queryable[TEntity]: return MongoQuery[TEntity](MongoQueryProvider(self._get_mongo_collection()))
+    def _build_replacement(self, entity: TEntity) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        ''' Builds the filter and the document used to replace the specified entity. Versioned entities are only replaced if their stored version is the expected one, and their version is incremented '''
+        query_filter = {"id": entity.id}
+        document = self._codec.encode(entity)
+        if isinstance(entity, VersionedState):
+            expected_version = entity.state_version if entity.state_version is not None else 0
+            query_filter["state_version"] = expected_version
+            document["state_version"] = expected_version + 1
+        return query_filter, document
+
+    def _raise_update_failure(self, collection: Collection, entity: TEntity):
+        ''' Raises the error that explains why the specified entity could not be replaced. Only called once a write has failed, so successful updates cost a single round trip '''
+        stored_document = collection.find_one({"id": entity.id}, projection={"_id": 0, "state_version": 1})
+        if stored_document is None:
+            raise Exception(f"Failed to find a {self._get_entity_type().__name__} with the specified id '{entity.id}'")
+        raise OptimisticConcurrencyException(entity.id, entity.state_version, stored_document.get("state_version"))
+
+    def _add_many(self, entities: List[TEntity], ordered: bool) -> List[TEntity]:
+        # Ids that are already in use, including ids duplicated within the batch, are rejected by the unique index on ids
+        errors = list[BulkOperationError]()
+        written_entities = self._write_many(list(enumerate(entities)), lambda entity: entity.id, lambda items: self._get_writable_mongo_collection().insert_many([self._codec.encode(entity) for _, entity in items], ordered=ordered), ordered, errors)
+        self._raise_if_any(errors, len(written_entities))
+        return written_entities
+
+    def _update_many(self, entities: List[TEntity], ordered: bool) -> List[TEntity]:
+        entities = list(entities)
+        collection = self._get_writable_mongo_collection()
+        # A single query per batch is enough to attribute missing entities and version conflicts to the items they relate to
+        stored_versions = self._find_stored_versions([entity.id for entity in entities])
+        pending_entities = list[Tuple[int, TEntity]]()
+        errors = list[BulkOperationError]()
+        for index, entity in enumerate(entities):
+            error = self._describe_update_failure(entity, stored_versions)
+            if error is None:
+                pending_entities.append((index, entity))
+                continue
+            errors.append(BulkOperationError(index, entity.id, error))
+            if ordered:
+                break
+        replacements = {entity.id: self._build_replacement(entity) for _, entity in pending_entities}
+        matched_counts = list[int]()
+
+        def replace_many(items: List[Tuple[int, TEntity]]):
+            try:
+                matched_counts.append(collection.bulk_write([ReplaceOne(*replacements[entity.id]) for _, entity in items], ordered=ordered).matched_count)
+            except BulkWriteError as ex:
+                # The replacements that did not fail may still have matched nothing
+                matched_counts.append(ex.details.get("nMatched", 0))
+                raise
+
+        written_entities = self._write_many(pending_entities, lambda entity: entity.id, replace_many, ordered, errors)
+        if len(matched_counts) > 0 and matched_counts[0] < len(written_entities):
+            # Some entities have been modified or removed concurrently, since their versions were read
+            current_versions = self._find_stored_versions([entity.id for entity in written_entities])
+            indexes = {entity.id: index for index, entity in pending_entities}
+            replaced_entities = list[TEntity]()
+            for entity in written_entities:
+                if entity.id in current_versions and (not isinstance(entity, VersionedState) or current_versions[entity.id] == replacements[entity.id][1]["state_version"]):
+                    replaced_entities.append(entity)
+                else:
+                    errors.append(BulkOperationError(indexes[entity.id], entity.id, self._describe_update_failure(entity, current_versions) or str(OptimisticConcurrencyException(entity.id, entity.state_version, current_versions.get(entity.id)))))
+            written_entities = replaced_entities
+        for entity in written_entities:
+            if isinstance(entity, VersionedState):
+                entity.state_version = replacements[entity.id][1]["state_version"]
+        self._raise_if_any(errors, len(written_entities))
+        return written_entities
+
+    def _remove_many(self, ids: List[TKey], ordered: bool) -> None:
+        ids = list(ids)
+        collection = self._get_writable_mongo_collection()
+        # Deletions that match nothing are not errors, so the ids that do not exist must be known beforehand to be reported, and to honor ordering
+        existing_ids = self._find_stored_versions(ids).keys()
+        pending_ids = list[Tuple[int, TKey]]()
+        errors = list[BulkOperationError]()
+        for index, id in enumerate(ids):
+            if id in existing_ids:
+                pending_ids.append((index, id))
+                continue
+            errors.append(BulkOperationError(index, id, f"Failed to find a {self._get_entity_type().__name__} with the specified id '{id}'"))
+            if ordered:
+                break
+        removed_ids = self._write_many(pending_ids, lambda id: id, lambda items: collection.bulk_write([DeleteOne({"id": id}) for _, id in items], ordered=ordered), ordered, errors)
+        self._raise_if_any(errors, len(removed_ids))
+
+    def _find_stored_versions(self, ids: List[TKey]) -> Dict[TKey, Optional[int]]:
+        ''' Gets the stored versions of the entities with the specified ids, in a single round trip. Entities that do not exist are omitted '''
+        return {document["id"]: document.get("state_version") for document in self._get_mongo_collection().find({"id": {"$in": list(ids)}}, projection={"_id": 0, "id": 1, "state_version": 1})}
+
+    def _describe_update_failure(self, entity: TEntity, stored_versions: Dict[TKey, Optional[int]]) -> Optional[str]:
+        ''' Describes why the specified entity cannot be updated, if it cannot, given the stored versions of the entities to update '''
+        if entity.id not in stored_versions:
+            return f"Failed to find a {self._get_entity_type().__name__} with the specified id '{entity.id}'"
+        elif isinstance(entity, VersionedState) and stored_versions[entity.id] != (entity.state_version or 0):
+            return str(OptimisticConcurrencyException(entity.id, entity.state_version, stored_versions[entity.id]))
+        return None
+
+    def _write_many(self, items: List[Tuple[int, Any]], get_id: Callable[[Any], Any], write: Callable[[List[Tuple[int, Any]]], Any], ordered: bool, errors: List[BulkOperationError]) -> List[Any]:
+        ''' Writes the specified indexed items, collecting the errors of the items Mongo rejected, and returns the items that were written '''
+        if len(items) < 1:
+            return []
+        try:
+            write(items)
+        except BulkWriteError as ex:
+            write_errors = ex.details.get("writeErrors", [])
+            failed_indexes = {write_error["index"] for write_error in write_errors}
+            for write_error in write_errors:
+                index, item = items[write_error["index"]]
+                message = f"A {self._get_entity_type().__name__} with the specified id '{get_id(item)}' already exists" if write_error.get("code") == _duplicate_key_error_code else write_error.get("errmsg", "")
+                errors.append(BulkOperationError(index, get_id(item), message))
+            # When ordered, Mongo stops at the first error
+            last_index = min(failed_indexes) if ordered and len(failed_indexes) > 0 else len(items)
+            return [item for i, (_, item) in enumerate(items[:last_index]) if i not in failed_indexes]
+        return [item for _, item in items]
+
+    def _raise_if_any(self, errors: List[BulkOperationError], processed_count: int):
+        if len(errors) > 0:
+            errors.sort(key=lambda error: error.index)
+            raise BulkOperationException(errors, processed_count)
+
+    async def query_async(self) -> Queryable[TEntity]: return MongoQuery[TEntity](MongoQueryProvider(self._get_mongo_collection(), self._codec, self._index_manager, self._run_async, self._get_entity_type()))
 
     def _get_entity_type(self) -> str: return self.__orig_class__.__args__[0]
 
@@ -193,9 +755,22 @@ class MongoRepository(Generic[TEntity, TKey], QueryableRepository[TEntity, TKey]
             collection_name = collection_name[:-3]
         return self._mongo_database[collection_name]
 
+    def _get_writable_mongo_collection(self) -> Collection:
+        ''' Gets the Mongo collection to write to, ensuring, on first use, the unique index on entity ids the write operations rely on to detect duplicates '''
+        collection = self._get_mongo_collection()
+        if collection.full_name not in self._indexed_collections:
+            collection.create_index("id", unique=True)
+            self._indexed_collections.add(collection.full_name)
+        return collection
+
     @staticmethod
     def configure(builder: ApplicationBuilderBase, entity_type: Type, key_type: Type, database_name: str) -> ApplicationBuilderBase:
         ''' Configures the specified application to use a Mongo repository implementation to manage the specified type of entity '''
+        return MongoRepository._configure(builder, entity_type, key_type, database_name, MongoRepository)
+
+    @staticmethod
+    def _configure(builder: ApplicationBuilderBase, entity_type: Type, key_type: Type, database_name: str, repository_type: Type) -> ApplicationBuilderBase:
+        ''' Configures the specified application to use the specified Mongo repository implementation to manage the specified type of entity '''
         connection_string_name = "mongo"
         connection_string = builder.settings.connection_strings.get(
             connection_string_name, None)
@@ -203,22 +778,61 @@ class MongoRepository(Generic[TEntity, TKey], QueryableRepository[TEntity, TKey]
             raise Exception(
                 f"Missing '{connection_string_name}' connection string")
         builder.services.try_add_singleton(MongoClient, singleton=MongoClient(connection_string))
+        builder.services.try_add_singleton(MongoEntityCodec)
+        builder.services.try_add_singleton(MongoIndexManager)
         builder.services.try_add_singleton(MongoRepositoryOptions[entity_type, key_type], singleton=MongoRepositoryOptions[entity_type, key_type](database_name))
-        builder.services.try_add_singleton(Repository[entity_type, key_type], MongoRepository[entity_type, key_type])
+        builder.services.try_add_singleton(Repository[entity_type, key_type], repository_type[entity_type, key_type])
         builder.services.try_add_singleton(QueryableRepository[entity_type, key_type], implementation_factory=lambda provider: provider.get_required_service(Repository[entity_type, key_type]))
+        builder.services.add_singleton(HostedService, implementation_factory=lambda provider: MongoIndexInitializer(provider.get_required_service(Repository[entity_type, key_type])))
         return builder
 
 
+class MongoIndexInitializer(HostedService):
+    ''' Represents the hosted service used to create or verify, at startup, the indexes of the collection managed by a Mongo repository '''
+
+    def __init__(self, repository: MongoRepository):
+        self._repository = repository
+
+    _repository: MongoRepository
+    ''' Gets the repository to create or verify the indexes of '''
+
+    async def start_async(self):
+        await self._repository.ensure_indexes_async()
+
+
+class AsyncMongoRepository(MongoRepository[TEntity, TKey]):
+    ''' Represents a Mongo implementation of the repository class that runs blocking Mongo operations on a dedicated, bounded pool of threads, rather than on the event loop '''
+
+    def __init__(self, options: MongoRepositoryOptions[TEntity, TKey], mongo_client: MongoClient, serializer: JsonSerializer, executor: MongoExecutor, codec: Optional[MongoEntityCodec] = None, index_manager: Optional[MongoIndexManager] = None):
+        ''' Initializes a new asynchronous Mongo repository '''
+        super().__init__(options, mongo_client, serializer, codec, index_manager)
+        self._executor = executor
+
+    _executor: MongoExecutor
+    ''' Gets the service used to run blocking Mongo operations outside of the event loop '''
+
+    async def _run_async(self, operation: Callable[..., Any], *args) -> Any: return await self._executor.run_async(operation, *args)
+
+    @staticmethod
+    def configure(builder: ApplicationBuilderBase, entity_type: Type, key_type: Type, database_name: str) -> ApplicationBuilderBase:
+        ''' Configures the specified application to use an asynchronous Mongo repository implementation to manage the specified type of entity '''
+        builder.services.try_add_singleton(MongoExecutor)
+        return MongoRepository._configure(builder, entity_type, key_type, database_name, AsyncMongoRepository)
+
+
 class FlexibleMongoRepository(MongoRepository[TEntity, TKey], FlexibleRepository[TEntity, TKey]):
     ''' Represents a Mongo implementation of the flexible repository class '''
 
-    def __init__(self, mongo_client: MongoClient, serializer: JsonSerializer):
+    def __init__(self, mongo_client: MongoClient, serializer: JsonSerializer, codec: Optional[MongoEntityCodec] = None, index_manager: Optional[MongoIndexManager] = None):
         ''' Initializes a new Mongo repository '''
         self._mongo_client = mongo_client
         self._database_name = "NOTSETHERE"
         self._mongo_database = self._mongo_client[self._database_name]
         self._serializer = serializer
+        self._codec = codec if codec is not None else MongoEntityCodec()
+        self._index_manager = index_manager if index_manager is not None else MongoIndexManager()
         self._collection_name = ""
+        self._indexed_collections = set[str]()
 
     _mongo_client: MongoClient
     ''' Gets the service used to interact with Mongo '''
@@ -271,8 +885,15 @@ class FlexibleMongoRepository(MongoRepository[TEntity, TKey], FlexibleRepository
         self._collection_name = collection_name
         return await self.remove_async(id)
 
+    async def compile_query_async(self, query: Callable[..., Queryable[TEntity]]) -> CompiledQuery[TEntity]:
+        # The collection flexible repositories query changes over time: their compiled queries cannot be cached
+        return (await self.query_async()).compile_query(query)
+
     async def query_by_collection_name_async(self, collection_name: str) -> Queryable[TEntity]:
-        return MongoQuery[TEntity](MongoQueryProvider(collection_name))
+        if not FlexibleMongoRepository._is_valid_collection_name(collection_name):
+            raise Exception(f"Collection name {collection_name} is invalid!")
+        self._collection_name = collection_name
+        return MongoQuery[TEntity](MongoQueryProvider(self._get_mongo_collection(), self._codec, self._index_manager, self._run_async, self._get_entity_type()))
 
     def _get_mongo_collection(self) -> Collection:
         ''' Gets the Mongo collection to use '''
@@ -325,6 +946,8 @@ class FlexibleMongoRepository(MongoRepository[TEntity, TKey], FlexibleRepository
             raise Exception(
                 f"Missing '{connection_string_name}' connection string")
         builder.services.try_add_singleton(MongoClient, singleton=MongoClient(connection_string))
+        builder.services.try_add_singleton(MongoEntityCodec)
+        builder.services.try_add_singleton(MongoIndexManager)
         builder.services.try_add_singleton(MongoRepositoryOptions[entity_type, key_type], singleton=MongoRepositoryOptions[entity_type, key_type](database_name))
         builder.services.try_add_singleton(Repository[entity_type, key_type], FlexibleMongoRepository[entity_type, key_type])
         builder.services.try_add_singleton(FlexibleRepository[entity_type, key_type], implementation_factory=lambda provider: provider.get_required_service(Repository[entity_type, key_type]))
@@ -1,4 +1,4 @@
-from typing import Any, Generic
+from typing import Any, Generic, List, Optional
 from neuroglia.core.operation_result import OperationResult
 from neuroglia.data.abstractions import TEntity, TKey
 from neuroglia.data.infrastructure.abstractions import QueryableRepository, Repository
@@ -8,12 +8,16 @@ from neuroglia.mediation.mediator import Query, QueryHandler
 class GetByIdQuery(Generic[TEntity, TKey], Query[OperationResult[TEntity]]):
     ''' Represents the query used to get an entity by id'''
 
-    def __init__(self, id: Any):
+    def __init__(self, id: Any, fields: Optional[List[str]] = None):
         self.id = id
+        self.fields = fields
 
     id: Any
     ''' Gets the id of the entity to get '''
 
+    fields: Optional[List[str]] = None
+    ''' Gets the attributes of the entity to get, if not all of them '''
+
 
 class GetByIdQueryHandler(Generic[TEntity, TKey], QueryHandler[GetByIdQuery[TEntity, TKey], OperationResult[TEntity]]):
     ''' Represents the service used to handle GetByIdQuery instances '''
@@ -24,7 +28,7 @@ class GetByIdQueryHandler(Generic[TEntity, TKey], QueryHandler[GetByIdQuery[TEnt
     repository: Repository[TEntity, TKey]
 
     async def handle_async(self, query: GetByIdQuery[TEntity, TKey]) -> OperationResult[TEntity]:
-        entity = await self.repository.get_async(query.id)
+        entity = await self.repository.get_async(query.id, query.fields)
         if entity is None:
             return self.not_found(self.repository.__orig_class__.__args__[0], query.id)
         return self.ok(entity)
@@ -1,4 +1,4 @@
-from typing import Any, Generic
+from typing import Any, Generic, Optional
 from neuroglia.core.operation_result import OperationResult
 from neuroglia.data.abstractions import TEntity, TKey
 from neuroglia.data.infrastructure.abstractions import QueryableRepository
@@ -6,8 +6,17 @@ from neuroglia.mediation.mediator import Query, QueryHandler
 
 
 class ListQuery(Generic[TEntity, TKey], Query[OperationResult[TEntity]]):
-    ''' Represents the query used to get an entity by id'''
-    pass
+    ''' Represents the query used to list entities, optionally one page at a time '''
+
+    def __init__(self, limit: Optional[int] = None, continuation_token: Optional[str] = None):
+        self.limit = limit
+        self.continuation_token = continuation_token
+
+    limit: Optional[int] = None
+    ''' Gets the maximum amount of entities per page, if any. If not set, all entities are listed at once '''
+
+    continuation_token: Optional[str] = None
+    ''' Gets the opaque token, returned with the previous page, used to get the next page, if any '''
 
 
 class ListQueryHandler(Generic[TEntity, TKey], QueryHandler[ListQuery[TEntity, TKey], OperationResult[TEntity]]):
@@ -20,4 +29,9 @@ class ListQueryHandler(Generic[TEntity, TKey], QueryHandler[ListQuery[TEntity, T
 
     async def handle_async(self, query: ListQuery[TEntity, TKey]) -> OperationResult[TEntity]:
         res = await self.repository.query_async()
-        return self.ok(res.to_list())
+        if query.limit is None:
+            return self.ok(await res.to_list_async())
+        try:
+            return self.ok(await res.to_page_async(query.limit, query.continuation_token))
+        except ValueError as ex:
+            return self.bad_request(str(ex))
@@ -1,15 +1,45 @@
 import ast
+import base64
+import binascii
 import inspect
+import json
 import os
+import sys
 from abc import ABC, abstractclassmethod
-from ast import Attribute, Name, NodeTransformer, expr
-from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar
+from ast import Attribute, Lambda, Name, NodeTransformer, expr
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from types import CodeType
+from typing import Any, AsyncIterator, Callable, Dict, Generic, List, Mapping, Optional, Set, Tuple, Type, TypeVar
 
 
 T = TypeVar('T')
 ''' Represents the type of data associated to a queryable '''
 
 
+@dataclass
+class QueryPage(Generic[T]):
+    ''' Represents a page of query results '''
+
+    items: List[T]
+    ''' Gets the results the page is made out of '''
+
+    limit: int
+    ''' Gets the maximum amount of results per page '''
+
+    next_token: Optional[str] = None
+    ''' Gets the opaque token used to get the next page, if any '''
+
+
+@dataclass(frozen=True)
+class QueryParameter:
+    ''' Represents a placeholder, in the expression of a compiled query, for a value that is bound when the query is executed '''
+
+    name: str
+    ''' Gets the name of the parameter '''
+
+
 class QueryProvider(ABC):
     ''' Defines the fundamentals of a service used to create and execute queries associated with the data source '''
 
@@ -23,6 +53,81 @@ class QueryProvider(ABC):
         ''' Executes the specified query expression '''
         raise NotImplementedError()
 
+    async def execute_async(self, expression: expr, query_type: Type) -> Any:
+        ''' Executes the specified query expression asynchronously. Providers whose queries block on I/O run them outside of the event loop, the others execute them as is '''
+        return self.execute(expression, query_type)
+
+    async def execute_compiled_async(self, executor: Callable[[Mapping[str, Any]], Any], parameters: Mapping[str, Any]) -> Any:
+        ''' Executes the specified compiled query with the specified parameter values asynchronously. Providers whose queries block on I/O run them outside of the event loop, the others execute them as is '''
+        return executor(parameters)
+
+    async def execute_async_iter(self, expression: expr, batch_size: Optional[int] = None) -> AsyncIterator[Any]:
+        ''' Executes the specified query expression, lazily yielding its results, which are fetched in batches of the specified size, if any. Providers that cannot stream results yield them once they have all been fetched '''
+        for result in self.execute(expression, List):
+            yield result
+
+    def compile(self, expression: expr, query_type: Type) -> Callable[[Mapping[str, Any]], Any]:
+        ''' Compiles the specified query expression, whose parameters are QueryParameter constants, into a function that executes it with the specified parameter values. Providers that cannot translate queries ahead of time bind the parameter values into the expression, then execute it, every time '''
+        return lambda parameters: self.execute(_bind_parameters(expression, parameters), query_type)
+
+
+class CompiledQuery(Generic[T]):
+    ''' Represents a query whose shape has been built once, and that can be executed repeatedly with different parameter values. Each of its terminal operations is compiled by the query provider on first use '''
+
+    def __init__(self, queryable: 'Queryable[T]', parameter_names: List[str]):
+        self._queryable = queryable
+        self._parameter_names = frozenset(parameter_names)
+        self._executors = dict[str, Callable[[Mapping[str, Any]], Any]]()
+
+    _queryable: 'Queryable[T]'
+    ''' Gets the queryable that defines the shape of the query '''
+
+    _parameter_names: frozenset
+    ''' Gets the names of the parameters of the query '''
+
+    _executors: Dict[str, Callable[[Mapping[str, Any]], Any]]
+    ''' Gets a mapping of the terminal operations of the query to the function compiled to execute them '''
+
+    def to_list(self, **parameters) -> List[T]:
+        ''' Executes the query with the specified parameter values '''
+        return self._get_executor('to_list')(self._validate(parameters))
+
+    async def to_list_async(self, **parameters) -> List[T]:
+        ''' Executes the query with the specified parameter values, without blocking the event loop '''
+        return await self._queryable.provider.execute_compiled_async(self._get_executor('to_list'), self._validate(parameters))
+
+    def first_or_default(self, **parameters) -> Optional[T]:
+        ''' Gets the first result of the query executed with the specified parameter values, if any '''
+        items = self._get_executor('first')(self._validate(parameters))
+        return items[0] if len(items) > 0 else None
+
+    def count(self, **parameters) -> int:
+        ''' Counts the results of the query executed with the specified parameter values '''
+        return self._get_executor('count')(self._validate(parameters))
+
+    def any(self, **parameters) -> bool:
+        ''' Determines whether or not the query executed with the specified parameter values has any result '''
+        return self._get_executor('any')(self._validate(parameters))
+
+    def _validate(self, parameters: Mapping[str, Any]) -> Mapping[str, Any]:
+        if parameters.keys() != self._parameter_names:
+            raise Exception(f"The compiled query expects the parameters {sorted(self._parameter_names)}, got {sorted(parameters.keys())} instead")
+        return parameters
+
+    def _get_executor(self, terminal: str) -> Callable[[Mapping[str, Any]], Any]:
+        executor = self._executors.get(terminal)
+        if executor is None:
+            if terminal == 'to_list':
+                executor = self._queryable.provider.compile(self._queryable.expression, List)
+            elif terminal == 'first':
+                executor = self._queryable.provider.compile(self._queryable.take(1).expression, List)
+            elif terminal == 'count':
+                executor = self._queryable.provider.compile(self._queryable._build_clause('count'), int)
+            else:
+                executor = self._queryable.provider.compile(self._queryable._build_clause('any'), bool)
+            self._executors[terminal] = executor
+        return executor
+
 
 class Queryable(Generic[T]):
     ''' Provides functionality to evaluate queries against a specific data source '''
@@ -43,13 +148,7 @@ class Queryable(Generic[T]):
 
     def first_or_default(self, predicate: Callable[[T], bool] = None) -> T:
         ''' Gets the first element in the sequence that matches the specified predicate, if any '''
-        frame = inspect.currentframe().f_back
-        frame_info = inspect.getframeinfo(frame)
-        variables = {**frame.f_locals}
-        lambda_src = self._get_lambda_source_code(predicate, frame_info.positions.end_col_offset)
-        lambda_tree = ast.parse(lambda_src)
-        lambda_expression = lambda_tree.body[0].value
-        expression = VariableExpressionReplacer(variables).visit(ast.Call(func=ast.Attribute(value=self.expression, attr='first', ctx=ast.Load()), args=[lambda_expression], keywords=[]))
+        expression = self._build_clause('first', self._get_lambda_expression(predicate))
         query = self.provider.create_query(self.get_element_type(), expression)
         return self.provider.execute(query.expression, T)
 
@@ -62,13 +161,7 @@ class Queryable(Generic[T]):
 
     def last_or_default(self, predicate: Callable[[T], bool] = None) -> T:
         ''' Gets the last element in the sequence that matches the specified predicate, if any '''
-        frame = inspect.currentframe().f_back
-        frame_info = inspect.getframeinfo(frame)
-        variables = {**frame.f_locals}
-        lambda_src = self._get_lambda_source_code(predicate, frame_info.positions.end_col_offset)
-        lambda_tree = ast.parse(lambda_src)
-        lambda_expression = lambda_tree.body[0].value
-        expression = VariableExpressionReplacer(variables).visit(ast.Call(func=ast.Attribute(value=self.expression, attr='last', ctx=ast.Load()), args=[lambda_expression], keywords=[]))
+        expression = self._build_clause('last', self._get_lambda_expression(predicate))
         query = self.provider.create_query(self.get_element_type(), expression)
         return self.provider.execute(query.expression, T)
 
@@ -81,35 +174,18 @@ class Queryable(Generic[T]):
 
     def order_by(self, selector: Callable[[T], Any]):
         ''' Orders the sequence using the specified attribute '''
-        selector_source = self._get_lambda_source_code(selector)
-        selector_tree = ast.parse(selector_source)
-        selector_lambda_expression = selector_tree.body[0].value
-        if not isinstance(selector_lambda_expression.body, Attribute):
-            raise Exception("The specified expression must be of type Attribute")
-        expression = ast.Call(func=ast.Attribute(value=self.expression, attr='order_by', ctx=ast.Load()), args=[selector_lambda_expression], keywords=[])
-        return self.provider.create_query(self.get_element_type(), expression)
+        return self.provider.create_query(self.get_element_type(), self._build_clause('order_by', self._get_selector_expression(selector)))
 
     def order_by_descending(self, selector: Callable[[T], Any]):
         ''' Orders the sequence in a descending fashion using the specified attribute '''
-        selector_source = self._get_lambda_source_code(selector)
-        selector_tree = ast.parse(selector_source)
-        selector_lambda_expression = selector_tree.body[0].value
-        if not isinstance(selector_lambda_expression.body, Attribute):
-            raise Exception("The specified expression must be of type Attribute")
-        expression = ast.Call(func=ast.Attribute(value=self.expression, attr='order_by_descending', ctx=ast.Load()), args=[selector_lambda_expression], keywords=[])
-        return self.provider.create_query(self.get_element_type(), expression)
+        return self.provider.create_query(self.get_element_type(), self._build_clause('order_by_descending', self._get_selector_expression(selector)))
 
     def select(self, selector: Callable[[T], Any]):
         ''' Projects each element of a sequence into a new form '''
-        frame = inspect.currentframe().f_back
-        variables = {**frame.f_locals}
-        selector_source = self._get_lambda_source_code(selector)
-        selector_tree = ast.parse(selector_source)
-        selector_lambda_expression = selector_tree.body[0].value
-        if not isinstance(selector_lambda_expression.body, Attribute) and not isinstance(selector_lambda_expression.body, ast.List):
-            raise Exception("The specified expression must be of type Attribute or List[Attribute]")
-        expression = VariableExpressionReplacer(variables).visit(ast.Call(func=ast.Attribute(value=self.expression, attr='select', ctx=ast.Load()), args=[selector_lambda_expression], keywords=[]))
-        return self.provider.create_query(self.get_element_type(), expression)
+        selector_lambda_expression = self._get_lambda_expression(selector)
+        if not isinstance(selector_lambda_expression.body, (Attribute, ast.List, ast.Dict)):
+            raise Exception("The specified expression must be of type Attribute, List[Attribute] or, for grouped sequences, Dict")
+        return self.provider.create_query(self.get_element_type(), self._build_clause('select', selector_lambda_expression))
 
     def skip(self, amount: int):
         ''' Bypasses a specified number of elements in a sequence and then returns the remaining elements. '''
@@ -123,21 +199,172 @@ class Queryable(Generic[T]):
 
     def where(self, predicate: Callable[[T], bool]) -> 'Queryable[T]':
         ''' Filters a sequence of values based on a predicate. '''
-        frame = inspect.currentframe().f_back
-        frame_info = inspect.getframeinfo(frame)
-        variables = {**frame.f_locals}
-        lambda_src = self._get_lambda_source_code(predicate, frame_info.positions.end_col_offset)
-        lambda_tree = ast.parse(lambda_src)
-        lambda_expression = lambda_tree.body[0].value
-        expression = VariableExpressionReplacer(variables).visit(ast.Call(func=ast.Attribute(value=self.expression, attr='where', ctx=ast.Load()), args=[lambda_expression], keywords=[]))
-        return self.provider.create_query(self.get_element_type(), expression)
+        return self.provider.create_query(self.get_element_type(), self._build_clause('where', self._get_lambda_expression(predicate)))
+
+    def count(self) -> int:
+        ''' Counts the elements in the sequence '''
+        return self.provider.execute(self._build_clause('count'), int)
+
+    def any(self) -> bool:
+        ''' Determines whether or not the sequence contains any element '''
+        return self.provider.execute(self._build_clause('any'), bool)
+
+    def sum(self, selector: Callable[[T], Any]) -> Any:
+        ''' Computes the sum of the specified attribute of the elements in the sequence '''
+        return self.provider.execute(self._build_clause('sum', self._get_selector_expression(selector)), Any)
+
+    def min(self, selector: Callable[[T], Any]) -> Any:
+        ''' Gets the minimum value of the specified attribute of the elements in the sequence, if any '''
+        return self.provider.execute(self._build_clause('min', self._get_selector_expression(selector)), Any)
+
+    def max(self, selector: Callable[[T], Any]) -> Any:
+        ''' Gets the maximum value of the specified attribute of the elements in the sequence, if any '''
+        return self.provider.execute(self._build_clause('max', self._get_selector_expression(selector)), Any)
+
+    def distinct(self, selector: Callable[[T], Any]) -> List[Any]:
+        ''' Gets the distinct values of the specified attribute of the elements in the sequence '''
+        return self.provider.execute(self._build_clause('distinct', self._get_selector_expression(selector)), List)
+
+    def distinct_by(self, selector: Callable[[T], Any]) -> 'Queryable[T]':
+        ''' Returns the first element of each set of elements that share the same value for the specified attribute '''
+        return self.provider.create_query(self.get_element_type(), self._build_clause('distinct_by', self._get_selector_expression(selector)))
+
+    def group_by(self, selector: Callable[[T], Any]) -> 'Queryable':
+        ''' Groups the elements of the sequence by the specified attribute. The groups must then be projected using 'select', with a lambda that returns a dictionary whose values are either the group's key (e.g. 'g.key') or an aggregate of its elements (e.g. 'g.count()', 'g.sum(lambda e: e.amount)', 'g.min(...)', 'g.max(...)' or 'g.average(...)') '''
+        return self.provider.create_query(self.get_element_type(), self._build_clause('group_by', self._get_selector_expression(selector)))
+
+    def compile_query(self, query: Callable[..., 'Queryable[T]']) -> CompiledQuery[T]:
+        ''' Compiles the query built by the specified function, which is called once, with the queryable and a QueryParameter for each of its other arguments
+
+            Example:
+                accounts_by_owner = queryable.compile_query(lambda q, owner_id: q.where(lambda a: a.owner_id == owner_id))
+                accounts = accounts_by_owner.to_list(owner_id='...')
+
+            Parameters can be compared to or used as skip/take amounts, but not evaluated: 'lambda a: a.owner_id == owner_id.lower()' cannot be compiled
+        '''
+        parameter_names = list(inspect.signature(query).parameters.keys())[1:]
+        return CompiledQuery[T](query(self, *[QueryParameter(name) for name in parameter_names]), parameter_names)
 
     def to_list(self) -> List[T]:
         ''' Executes the queryable '''
         return self.provider.execute(self.expression, List)
 
+    async def to_list_async(self) -> List[T]:
+        ''' Executes the queryable, without blocking the event loop '''
+        return await self.provider.execute_async(self.expression, List)
+
+    def to_page(self, limit: int, continuation_token: Optional[str] = None) -> QueryPage[T]:
+        ''' Executes the queryable, getting the page of results that follows the specified continuation token, if any, or the first page otherwise
+
+            Pages are seeked rather than skipped: results are ordered by the queryable's order_by clauses, then by id, and each page is filtered to the results that follow the last result of the previous page. Every page is therefore as cheap as the first one, given an index on the ordering fields. Ordering fields must not be null
+
+            Args:
+                limit (int): the maximum amount of results per page
+                continuation_token (Optional[str]): the opaque token returned with the previous page, if any. Raises a ValueError if the token is invalid or does not match the queryable's ordering
+        '''
+        expression, keys = self._build_page_expression(limit, continuation_token)
+        return self._create_page(self.provider.execute(expression, List), limit, keys)
+
+    async def to_page_async(self, limit: int, continuation_token: Optional[str] = None) -> QueryPage[T]:
+        ''' Executes the queryable, without blocking the event loop, getting the page of results that follows the specified continuation token, if any, or the first page otherwise. See to_page '''
+        expression, keys = self._build_page_expression(limit, continuation_token)
+        return self._create_page(await self.provider.execute_async(expression, List), limit, keys)
+
+    def _build_page_expression(self, limit: int, continuation_token: Optional[str]) -> Tuple[expr, List[Tuple[List[str], bool]]]:
+        ''' Builds the expression of the query that gets the page of results that follows the specified continuation token, along with the keys the results are ordered by '''
+        if limit < 1:
+            raise ValueError(f"The page limit must be greater than 0, got '{limit}'")
+        keys = self._get_order_keys()
+        is_ordered_by_id = any(path == ['id'] for path, _ in keys)
+        if not is_ordered_by_id:
+            # Ids break the ties between results with the same ordering values, so that no result is skipped nor repeated
+            keys.append((['id'], False))
+        expression = self.expression
+        if continuation_token is not None:
+            values = _decode_continuation_token(continuation_token)
+            if len(values) != len(keys):
+                raise ValueError("The specified continuation token does not match the ordering of the query")
+            expression = ast.Call(func=ast.Attribute(value=expression, attr='where', ctx=ast.Load()), args=[_build_seek_predicate(keys, values)], keywords=[])
+        if not is_ordered_by_id:
+            expression = ast.Call(func=ast.Attribute(value=expression, attr='order_by', ctx=ast.Load()), args=[_build_lambda(ast.Attribute(value=ast.Name(id=_seek_argument_name, ctx=ast.Load()), attr='id', ctx=ast.Load()))], keywords=[])
+        # One more result than requested is fetched, to determine whether or not there is a next page without an additional query
+        expression = ast.Call(func=ast.Attribute(value=expression, attr='take', ctx=ast.Load()), args=[ast.Constant(value=limit + 1)], keywords=[])
+        return self.provider.create_query(self.get_element_type(), expression).expression, keys
+
+    def _create_page(self, items: List[T], limit: int, keys: List[Tuple[List[str], bool]]) -> QueryPage[T]:
+        ''' Creates the page of the specified results, which include one more result than the specified limit if there is a next page '''
+        if len(items) <= limit:
+            return QueryPage[T](items, limit)
+        items = items[:limit]
+        return QueryPage[T](items, limit, _encode_continuation_token([_get_path_value(items[-1], path) for path, _ in keys]))
+
+    def to_async_iter(self, batch_size: Optional[int] = None) -> AsyncIterator[T]:
+        ''' Executes the queryable, lazily yielding its results, which are fetched in batches of the specified size, if any, rather than all at once '''
+        return self.provider.execute_async_iter(self.expression, batch_size)
+
+    def __aiter__(self) -> AsyncIterator[T]: return self.to_async_iter()
+
     def __str__(self) -> str: return ast.unparse(self.expression)
 
+    def _build_clause(self, clause: str, *args: expr) -> expr:
+        ''' Builds the expression that applies the specified clause to the queryable '''
+        return ast.Call(func=ast.Attribute(value=self.expression, attr=clause, ctx=ast.Load()), args=list(args), keywords=[])
+
+    def _get_selector_expression(self, selector: Callable[[T], Any]) -> Lambda:
+        ''' Gets the expression of the specified lambda, which must select an attribute '''
+        selector_lambda_expression = self._get_lambda_expression(selector, 3)
+        if not isinstance(selector_lambda_expression.body, Attribute):
+            raise Exception("The specified expression must be of type Attribute")
+        return selector_lambda_expression
+
+    def _get_lambda_expression(self, function: Callable, depth: int = 2) -> Lambda:
+        ''' Gets the expression of the specified lambda, in which the variables it references are replaced by their current value
+
+            Lambdas are parsed once, the first time they are used, then cached by code object: subsequent calls only bind the values of the variables the lambda references, which are read from its closure and globals rather than from the calling frame
+
+            Args:
+                function (Callable): the lambda to get the expression of
+                depth (int): the depth, relative to this method, of the frame of the code that passed the lambda to the queryable, used to locate the lambda in its source line on first use
+        '''
+        code = function.__code__
+        cached_expression = _lambda_expressions.get(code)
+        if cached_expression is None:
+            frame_info = inspect.getframeinfo(sys._getframe(depth))
+            lambda_expression = ast.parse(self._get_lambda_source_code(function, frame_info.positions.end_col_offset)).body[0].value
+            free_variables = _get_free_variables(lambda_expression)
+            cached_expression = (lambda_expression, tuple(sorted(free_variables)), _get_binding_nodes(lambda_expression, free_variables))
+            _lambda_expressions[code] = cached_expression
+        lambda_expression, free_variables, binding_nodes = cached_expression
+        if len(free_variables) < 1:
+            return lambda_expression
+        closure = dict(zip(code.co_freevars, function.__closure__ or ()))
+        variables = dict[str, Any]()
+        for name in free_variables:
+            cell = closure.get(name)
+            if cell is not None:
+                try:
+                    variables[name] = cell.cell_contents
+                except ValueError:
+                    pass
+            elif name in function.__globals__:
+                variables[name] = function.__globals__[name]
+        return _bind_variables(lambda_expression, variables, binding_nodes, frozenset()) if len(variables) > 0 else lambda_expression
+
+    def _get_order_keys(self) -> List[Tuple[List[str], bool]]:
+        ''' Gets the path of the fields the queryable is ordered by, and whether or not they are sorted in descending order '''
+        keys = list[Tuple[List[str], bool]]()
+        expression = self.expression
+        while isinstance(expression, ast.Call) and isinstance(expression.func, Attribute):
+            if expression.func.attr in ('order_by', 'order_by_descending') and len(expression.args) == 1 and isinstance(expression.args[0], Lambda):
+                path = list[str]()
+                selector = expression.args[0].body
+                while isinstance(selector, Attribute):
+                    path.insert(0, selector.attr)
+                    selector = selector.value
+                keys.insert(0, (path, expression.func.attr == 'order_by_descending'))
+            expression = expression.func.value
+        return keys
+
     def _get_lambda_source_code(self, function: Callable, max_col_offset: int):
         ''' Gets the source code of the specified lambda 
 
@@ -152,8 +379,14 @@ class Queryable(Generic[T]):
         if len(source_lines) != 1:
             return None
         source_text = os.linesep.join(source_lines).strip()
+        indentation = len(source_lines[0]) - len(source_lines[0].lstrip())
         source_ast = ast.parse(source_text)
-        lambda_node = next((node for node in ast.walk(source_ast) if isinstance(node, ast.Lambda) and node.col_offset <= max_col_offset), None)
+        # Picks the last top-level lambda of the calling expression with the same arguments as the function, so that the lambdas of chained calls (e.g. '.where(...).order_by(...)') and of enclosing lambdas (e.g. 'compile_query(lambda q, owner_id: q.where(...))') are told apart
+        argument_names = list(function.__code__.co_varnames[:function.__code__.co_argcount])
+        lambda_node = None
+        for node in sorted((node for node in ast.walk(source_ast) if isinstance(node, ast.Lambda) and node.end_col_offset + indentation <= max_col_offset and [argument.arg for argument in node.args.args] == argument_names), key=lambda node: node.col_offset):
+            if lambda_node is None or node.col_offset >= lambda_node.end_col_offset:
+                lambda_node = node
         if lambda_node is None:
             return None
         lambda_text = source_text[lambda_node.col_offset:lambda_node.end_col_offset]
@@ -162,14 +395,160 @@ class Queryable(Generic[T]):
 
 class VariableExpressionReplacer(NodeTransformer):
 
-    def __init__(self, variables: Dict[str, Any]):
+    def __init__(self, variables: Mapping[str, Any]):
         super().__init__()
         self.variables = variables
+        self.arguments = set[str]()
 
-    variables: Dict[str, Any] = dict[str, Any]()
+    variables: Mapping[str, Any] = dict[str, Any]()
+
+    arguments: Set[str]
+    ''' Gets the names of the arguments of the lambdas being visited, which must not be replaced '''
+
+    def visit_Lambda(self, node: Lambda) -> Any:
+        arguments = self.arguments
+        self.arguments = arguments | {argument.arg for argument in node.args.args}
+        try:
+            return self.generic_visit(node)
+        finally:
+            self.arguments = arguments
 
     def visit_Name(self, node: Name) -> Any:
-        if not node.id in self.variables.keys():
+        if node.id in self.arguments or not node.id in self.variables.keys():
             return node
         value = self.variables[node.id]
         return ast.Constant(value)
+
+
+_lambda_expressions = dict[CodeType, Tuple[Lambda, Tuple[str, ...], Set[int]]]()
+''' Gets a mapping of the code objects of the lambdas passed to queryables to their parsed expression, to the names of the variables they reference and to the ids of the nodes that lead to these references. Cached expressions are shared, and must therefore never be mutated '''
+
+
+def _get_free_variables(expression: expr) -> Set[str]:
+    ''' Gets the names referenced by the specified lambda expression that are not arguments of any of its lambdas '''
+    arguments = {argument.arg for node in ast.walk(expression) if isinstance(node, Lambda) for argument in node.args.args}
+    return {node.id for node in ast.walk(expression) if isinstance(node, Name) and node.id not in arguments}
+
+
+def _get_binding_nodes(expression: expr, free_variables: Set[str]) -> Set[int]:
+    ''' Gets the ids of the nodes of the specified expression whose subtree references any of the specified variables '''
+    binding_nodes = set[int]()
+
+    def visit(node: ast.AST) -> bool:
+        references = isinstance(node, Name) and node.id in free_variables
+        for child in ast.iter_child_nodes(node):
+            references = visit(child) or references
+        if references:
+            binding_nodes.add(id(node))
+        return references
+
+    visit(expression)
+    return binding_nodes
+
+
+def _bind_variables(node: ast.AST, variables: Mapping[str, Any], binding_nodes: Set[int], arguments: frozenset) -> ast.AST:
+    ''' Replaces the references to the specified variables by their value. Unlike the VariableExpressionReplacer, the specified expression is left untouched: only the nodes that lead to a replaced reference are copied, others are shared '''
+    if id(node) not in binding_nodes:
+        return node
+    elif isinstance(node, Name):
+        return ast.Constant(variables[node.id]) if node.id in variables and node.id not in arguments else node
+    if isinstance(node, Lambda):
+        arguments = arguments | {argument.arg for argument in node.args.args}
+    fields = dict[str, Any]()
+    changed = False
+    for name, value in ast.iter_fields(node):
+        if isinstance(value, ast.AST):
+            bound_value = _bind_variables(value, variables, binding_nodes, arguments)
+        elif isinstance(value, list):
+            bound_value = [_bind_variables(item, variables, binding_nodes, arguments) if isinstance(item, ast.AST) else item for item in value]
+            if all(bound_item is item for bound_item, item in zip(bound_value, value)):
+                bound_value = value
+        else:
+            bound_value = value
+        changed = changed or bound_value is not value
+        fields[name] = bound_value
+    return type(node)(**fields) if changed else node
+
+
+def _bind_parameters(node: ast.AST, parameters: Mapping[str, Any]) -> ast.AST:
+    ''' Replaces the parameters of the specified compiled query expression by the specified values, leaving the expression untouched '''
+    if isinstance(node, ast.Constant):
+        return ast.Constant(parameters[node.value.name]) if isinstance(node.value, QueryParameter) else node
+    fields = dict[str, Any]()
+    changed = False
+    for name, value in ast.iter_fields(node):
+        if isinstance(value, ast.AST):
+            bound_value = _bind_parameters(value, parameters)
+        elif isinstance(value, list):
+            bound_value = [_bind_parameters(item, parameters) if isinstance(item, ast.AST) else item for item in value]
+            if all(bound_item is item for bound_item, item in zip(bound_value, value)):
+                bound_value = value
+        else:
+            bound_value = value
+        changed = changed or bound_value is not value
+        fields[name] = bound_value
+    return type(node)(**fields) if changed else node
+
+
+_seek_argument_name = '__item'
+''' Gets the name of the argument of the lambdas built to seek pages '''
+
+
+def _build_lambda(body: expr) -> Lambda:
+    return ast.Lambda(args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=_seek_argument_name)], kwonlyargs=[], kw_defaults=[], defaults=[]), body=body)
+
+
+def _build_seek_predicate(keys: List[Tuple[List[str], bool]], values: List[Any]) -> Lambda:
+    ''' Builds the predicate matching the results that follow the specified values, given the specified ordering: (k1 > v1) or (k1 == v1 and k2 > v2) or ... '''
+    def build_field(path: List[str]) -> expr:
+        field = ast.Name(id=_seek_argument_name, ctx=ast.Load())
+        for attribute in path:
+            field = ast.Attribute(value=field, attr=attribute, ctx=ast.Load())
+        return field
+
+    disjuncts = list[expr]()
+    for i, (path, descending) in enumerate(keys):
+        conjuncts = [ast.Compare(left=build_field(previous_path), ops=[ast.Eq()], comparators=[ast.Constant(value=values[j])]) for j, (previous_path, _) in enumerate(keys[:i])]
+        conjuncts.append(ast.Compare(left=build_field(path), ops=[ast.Lt() if descending else ast.Gt()], comparators=[ast.Constant(value=values[i])]))
+        disjuncts.append(conjuncts[0] if len(conjuncts) == 1 else ast.BoolOp(op=ast.And(), values=conjuncts))
+    return _build_lambda(disjuncts[0] if len(disjuncts) == 1 else ast.BoolOp(op=ast.Or(), values=disjuncts))
+
+
+def _get_path_value(item: Any, path: List[str]) -> Any:
+    value = item
+    for attribute in path:
+        value = value.get(attribute) if isinstance(value, dict) else getattr(value, attribute, None)
+    if value is None:
+        raise ValueError(f"Failed to page the query: the value of the ordering field '{'.'.join(path)}' is null")
+    return value
+
+
+def _encode_continuation_token(values: List[Any]) -> str:
+    ''' Encodes the specified ordering values into a new opaque continuation token '''
+    def encode_value(value: Any) -> Any:
+        if isinstance(value, datetime): return {'$datetime': value.isoformat()}
+        elif isinstance(value, date): return {'$date': value.isoformat()}
+        elif isinstance(value, Decimal): return {'$decimal': str(value)}
+        elif value is None or isinstance(value, (str, int, float, bool)): return value
+        raise ValueError(f"Failed to page the query: ordering by values of type '{type(value).__name__}' is not supported")
+
+    return base64.urlsafe_b64encode(json.dumps([encode_value(value) for value in values], separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def _decode_continuation_token(token: str) -> List[Any]:
+    ''' Decodes the ordering values encoded by the specified continuation token '''
+    def decode_value(value: Any) -> Any:
+        if isinstance(value, dict) and len(value) == 1:
+            tag, text = next(iter(value.items()))
+            if tag == '$datetime': return datetime.fromisoformat(text)
+            elif tag == '$date': return date.fromisoformat(text)
+            elif tag == '$decimal': return Decimal(text)
+        return value
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ValueError("The specified continuation token is invalid")
+    if not isinstance(values, list):
+        raise ValueError("The specified continuation token is invalid")
+    return [decode_value(value) for value in values]
@@ -2,7 +2,8 @@ from abc import ABC, abstractclassmethod
 from contextlib import contextmanager
 from enum import Enum
 import inspect
-from typing import Any, Callable, ForwardRef, List, Optional, Type, Dict, TypeVar
+from types import UnionType
+from typing import Any, Callable, ForwardRef, Iterable, List, Optional, SupportsIndex, Tuple, Type, Dict, TypeVar, Union, get_args, get_origin
 
 from neuroglia.core.type_extensions import TypeExtensions
 
@@ -26,6 +27,8 @@ ServiceProvider = ForwardRef("ServiceProvider")
 
 ServiceScopeBase = ForwardRef("IServiceScope")
 
+ServiceActivationPlan = ForwardRef("ServiceActivationPlan")
+
 
 class ServiceProviderBase(ABC):
     ''' Defines the fundamentals of a container used to manage and provide instances of dependencies, enabling dependency injection to promote modularity and maintainability. '''
@@ -42,6 +45,14 @@ class ServiceProviderBase(ABC):
         ''' Gets all services of the specified type '''
         raise NotImplementedError()
 
+    def get_service_descriptors(self, type: Type) -> List[ServiceDescriptor]:
+        ''' Gets the descriptors of all services registered for the specified type '''
+        raise NotImplementedError()
+
+    def get_described_service(self, descriptor: ServiceDescriptor) -> any:
+        ''' Gets the service described by the specified descriptor, building it if it has not yet been realized or if its lifetime is transient '''
+        raise NotImplementedError()
+
     def create_scope(self) -> ServiceScopeBase:
         ''' Creates a new service scope '''
         raise NotImplementedError()
@@ -61,22 +72,76 @@ class ServiceScopeBase(ABC):
         raise NotImplementedError()
 
 
+class ServiceActivationPlan:
+    ''' Represents the plan used to activate instances of a specific implementation type, compiled once by a service provider and reused for all subsequent constructions '''
+
+    def __init__(self, implementation_type: Type, dependencies: List[Tuple[str, Type, Any]]):
+        ''' Initializes a new service activation plan '''
+        self.implementation_type = implementation_type
+        self.dependencies = dependencies
+
+    implementation_type: Type
+    ''' Gets the type, possibly a closed generic type, to activate '''
+
+    dependencies: List[Tuple[str, Type, Any]]
+    ''' Gets a list containing the name, the closed type and the default value (inspect.Parameter.empty if required) of the __init__ arguments to inject, in declaration order '''
+
+    def activate(self, service_provider: ServiceProviderBase, service_type: Type) -> any:
+        ''' Activates a new instance of the implementation type, resolving its dependencies from the specified service provider '''
+        service_args = dict[str, any]()
+        for name, dependency_type, default in self.dependencies:
+            dependency = service_provider.get_service(dependency_type)
+            if dependency is None:
+                if default is inspect.Parameter.empty:
+                    raise Exception(f"Failed to build service of type '{service_type.__name__}' because the service provider failed to resolve service '{getattr(dependency_type, '__name__', dependency_type)}'")
+                dependency = default
+            service_args[name] = dependency
+        return self.implementation_type(**service_args)
+
+    @staticmethod
+    def compile(implementation_type: Type) -> ServiceActivationPlan:
+        ''' Compiles a new activation plan for the specified implementation type, substituting the type arguments of generic dependencies with the ones of the implementation type, if any '''
+        is_service_generic = not inspect.isclass(implementation_type)  # if implementation_type is not a class, then it must be a generic type
+        service_type = implementation_type.__origin__ if is_service_generic else implementation_type  # get the type used to determine the __init__ args: the implementation type as is or its generic type definition
+        service_init_args = [param for param in inspect.signature(service_type.__init__).parameters.values() if param.name not in ['self', 'args', 'kwargs']]  # gets the __init__ args and leave out self, args and kwargs
+        service_generic_args = TypeExtensions.get_generic_arguments(implementation_type)  # gets the generic args: we will need them to substitute the type args of potential generic dependencies
+        dependencies = list[Tuple[str, Type, Any]]()
+        for init_arg in service_init_args:
+            dependency_type = init_arg.annotation
+            if get_origin(dependency_type) in (Union, UnionType) and type(None) in get_args(dependency_type):
+                dependency_type = next(arg for arg in get_args(dependency_type) if arg is not type(None))  # resolve optional dependencies as their underlying type
+            if not inspect.isclass(dependency_type) and hasattr(dependency_type, '__origin__'):
+                dependency_generic_args = [service_generic_args[arg.__name__] if type(arg) == TypeVar else arg for arg in dependency_type.__args__]  # replace TypeVar generic arguments by the service's matching generic argument
+                dependency_type = dependency_type.__origin__[*dependency_generic_args]
+            dependencies.append((init_arg.name, dependency_type, init_arg.default))
+        return ServiceActivationPlan(implementation_type, dependencies)
+
+
 class ServiceScope(ServiceScopeBase, ServiceProviderBase):
     ''' Represents the default implementation of the IServiceScope class '''
 
-    def __init__(self, root_service_provider: ServiceProviderBase, scoped_service_descriptors: List[ServiceDescriptor]):
+    def __init__(self, root_service_provider: ServiceProviderBase, scoped_service_descriptors: Dict[Type, List[ServiceDescriptor]], activation_plans: Optional[Dict[Type, ServiceActivationPlan]] = None):
         self._root_service_provider = root_service_provider
         self._scoped_service_descriptors = scoped_service_descriptors
+        self._activation_plans = dict[Type, ServiceActivationPlan]() if activation_plans is None else activation_plans
+        self._realized_scoped_services = dict[Type, List]()
+        self._realized_described_services = dict[ServiceDescriptor, any]()
 
     _root_service_provider: ServiceProviderBase
     ''' Gets the IServiceProvider that has created the service scope '''
 
-    _scoped_service_descriptors: List[ServiceDescriptor]
-    ''' Gets a list containing the configurations of all scoped dependencies '''
+    _scoped_service_descriptors: Dict[Type, List[ServiceDescriptor]]
+    ''' Gets a type/list mapping containing the configurations of all scoped dependencies '''
+
+    _activation_plans: Dict[Type, ServiceActivationPlan]
+    ''' Gets a type/plan mapping containing the compiled activation plans of all implementation types built so far, shared with the root service provider '''
 
-    _realized_scoped_services: Dict[Type, List] = dict[Type, List]()
+    _realized_scoped_services: Dict[Type, List]
     ''' Gets a type/list mapping containing all scoped services that have already been built/resolved '''
 
+    _realized_described_services: Dict[ServiceDescriptor, any]
+    ''' Gets a descriptor/service mapping containing all scoped services that have already been built/resolved by descriptor '''
+
     def get_service_provider(self) -> ServiceProviderBase: return self
 
     def get_service(self, type: Type) -> Optional[any]:
@@ -86,10 +151,10 @@ class ServiceScope(ServiceScopeBase, ServiceProviderBase):
         realized_service = self._root_service_provider.get_service(type) if realized_services is None else realized_services[0]
         if realized_service is not None:
             return realized_service
-        descriptor = next(descriptor for descriptor in self._scoped_service_descriptors if descriptor.service_type == type)
-        if descriptor is None:
+        descriptors = self._scoped_service_descriptors.get(type)
+        if descriptors is None:
             return None
-        return self._build_service(descriptor)
+        return self._build_service(descriptors[0])
 
     def get_required_service(self, type: Type) -> any:
         service = self.get_service(type)
@@ -100,16 +165,29 @@ class ServiceScope(ServiceScopeBase, ServiceProviderBase):
     def get_services(self, type: Type) -> List:
         if type == ServiceProviderBase:
             return [self]
-        service_descriptors = [descriptor for descriptor in self._scoped_service_descriptors if descriptor.service_type == type]
+        service_descriptors = self._scoped_service_descriptors.get(type, [])
         realized_services = self._realized_scoped_services.get(type)
         if realized_services is None:
-            realized_services = List()
+            realized_services = list()
         for descriptor in service_descriptors:
             if any(type(service) == descriptor.service_type for service in realized_services):
                 continue
             realized_services.append(self._build_service(descriptor))
         return realized_services + self._root_service_provider.get_services(type)
 
+    def get_service_descriptors(self, type: Type) -> List[ServiceDescriptor]:
+        return self._scoped_service_descriptors.get(type, []) + self._root_service_provider.get_service_descriptors(type)
+
+    def get_described_service(self, descriptor: ServiceDescriptor) -> any:
+        if descriptor.lifetime != ServiceLifetime.SCOPED:
+            return self._root_service_provider.get_described_service(descriptor)
+        realized_service = self._realized_described_services.get(descriptor)
+        if realized_service is not None:
+            return realized_service
+        service = self._build_service(descriptor)
+        self._realized_described_services[descriptor] = service
+        return service
+
     def _build_service(self, service_descriptor: ServiceDescriptor) -> any:
         ''' Builds a new service provider based on the configured dependencies '''
         if service_descriptor.lifetime == ServiceLifetime.SCOPED:
@@ -119,14 +197,11 @@ class ServiceScope(ServiceScopeBase, ServiceProviderBase):
         elif service_descriptor.implementation_factory is not None:
             service = service_descriptor.implementation_factory(self)
         else:
-            init_args = [param for param in inspect.signature(service_descriptor.implementation_type.__init__).parameters.values() if param.name not in ['self', 'args', 'kwargs']]
-            args = dict[Type, any]()
-            for init_arg in init_args:
-                dependency = self.get_service(init_arg.annotation)
-                if dependency is None and init_arg.default == init_arg.empty and init_arg.name != 'self':
-                    raise Exception(f"Failed to build service of type '{service_descriptor.service_type.__name__}' because the service provider failed to resolve service '{init_arg.annotation}'")
-                args[init_arg.name] = dependency
-            service = service_descriptor.implementation_type(**args)
+            activation_plan = self._activation_plans.get(service_descriptor.implementation_type)
+            if activation_plan is None:
+                activation_plan = ServiceActivationPlan.compile(service_descriptor.implementation_type)
+                self._activation_plans[service_descriptor.implementation_type] = activation_plan
+            service = activation_plan.activate(self, service_descriptor.service_type)
         if service_descriptor.lifetime != ServiceLifetime.TRANSIENT:
             realized_services = self._realized_scoped_services.get(service_descriptor.service_type)
             if realized_services is None:
@@ -141,6 +216,7 @@ class ServiceScope(ServiceScopeBase, ServiceProviderBase):
         for service in self._realized_scoped_services:
             service.__exit__()
         self._realized_scoped_services = dict[Type, List]()
+        self._realized_described_services = dict[ServiceDescriptor, any]()
 
 
 class ServiceProvider(ServiceProviderBase):
@@ -148,26 +224,35 @@ class ServiceProvider(ServiceProviderBase):
 
     def __init__(self, service_descriptors: List[ServiceDescriptor]):
         ''' Initializes a new service provider using the specified service dependency configuration '''
-        self._service_descriptors = service_descriptors
+        self._service_descriptors = dict[Type, List[ServiceDescriptor]]()
+        for descriptor in service_descriptors:
+            self._service_descriptors.setdefault(descriptor.service_type, list[ServiceDescriptor]()).append(descriptor)
+        self._activation_plans = dict[Type, ServiceActivationPlan]()
+        self._realized_services = dict[Type, List]()
+        self._realized_described_services = dict[ServiceDescriptor, any]()
 
-    _service_descriptors: List[ServiceDescriptor]
-    ''' Gets a list containing the configuration of all registered dependencies '''
+    _service_descriptors: Dict[Type, List[ServiceDescriptor]]
+    ''' Gets a type/list mapping containing the configuration of all registered dependencies, keyed by service type (including closed generic types such as 'Repository[User, str]') '''
 
-    _realized_services: Dict[Type, List] = dict[Type, List]()
+    _activation_plans: Dict[Type, ServiceActivationPlan]
+    ''' Gets a type/plan mapping containing the compiled activation plans of all implementation types built so far '''
+
+    _realized_services: Dict[Type, List]
     ''' Gets a type/list mapping containing all services that have already been built/resolved '''
 
+    _realized_described_services: Dict[ServiceDescriptor, any]
+    ''' Gets a descriptor/service mapping containing all non-transient services that have already been built/resolved '''
+
     def get_service(self, type: Type) -> Optional[any]:
         if type == ServiceProviderBase:
             return self
         realized_services = self._realized_services.get(type)
         if realized_services is not None:
             return realized_services[0]
-        if len(self._service_descriptors) < 1:
+        descriptors = self._service_descriptors.get(type)
+        if descriptors is None:
             return None
-        descriptor = next((descriptor for descriptor in self._service_descriptors if descriptor.service_type == type), None)
-        if descriptor is None:
-            return None
-        return self._build_service(descriptor)
+        return self._build_service(descriptors[0])
 
     def get_required_service(self, type: Type) -> any:
         service = self.get_service(type)
@@ -178,7 +263,7 @@ class ServiceProvider(ServiceProviderBase):
     def get_services(self, type: Type) -> List:
         if type == ServiceProviderBase:
             return [self]
-        service_descriptors = [descriptor for descriptor in self._service_descriptors if descriptor.service_type == type]
+        service_descriptors = self._service_descriptors.get(type, [])
         realized_services = self._realized_services.get(type)
         if realized_services is None:
             realized_services = list()
@@ -189,6 +274,15 @@ class ServiceProvider(ServiceProviderBase):
                 realized_services.append(self._build_service(descriptor))
         return realized_services
 
+    def get_service_descriptors(self, type: Type) -> List[ServiceDescriptor]:
+        return self._service_descriptors.get(type, [])
+
+    def get_described_service(self, descriptor: ServiceDescriptor) -> any:
+        realized_service = self._realized_described_services.get(descriptor)
+        if realized_service is not None:
+            return realized_service
+        return self._build_service(descriptor)
+
     def _is_service_instance_of(self, service: Any, type_: Type) -> bool:
         if hasattr(type_, "__origin__"):
             service_type = service.__orig_class__ if hasattr(service, "__orig_class__") else type(service)
@@ -212,35 +306,28 @@ class ServiceProvider(ServiceProviderBase):
         elif service_descriptor.implementation_factory is not None:
             service = service_descriptor.implementation_factory(self)
         else:
-            is_service_generic = not inspect.isclass(service_descriptor.implementation_type)  # if implementation_type is not a class, then it must be a generic type
-            service_generic_type = service_descriptor.implementation_type.__origin__ if is_service_generic else None  # retrieve the generic type, used to determine the __init__ args
-            service_type = service_descriptor.implementation_type if service_generic_type is None else service_generic_type  # get the type used to determine the __init__ args: the implementation type as is or its generic type definition
-            service_init_args = [param for param in inspect.signature(service_type.__init__).parameters.values() if param.name not in ['self', 'args', 'kwargs']]  # gets the __init__ args and leave out self, args and kwargs
-            service_generic_args = TypeExtensions.get_generic_arguments(service_descriptor.implementation_type)  # gets the generic args: we will need them to substitute the type args of potential generic dependencies
-            service_args = dict[Type, any]()
-            for init_arg in service_init_args:
-                is_dependency_generic = not inspect.isclass(init_arg.annotation)
-                dependency_generic_type = init_arg.annotation.__origin__ if is_dependency_generic else None
-                dependency_generic_args = None if dependency_generic_type is None else init_arg.annotation.__args__
-                if dependency_generic_args is not None:
-                    dependency_generic_args = [service_generic_args[arg.__name__] if type(arg) == TypeVar else arg for arg in dependency_generic_args]  # replace TypeVar generic arguments by the service's matching generic argument
-                dependency_type = init_arg.annotation.__origin__[*dependency_generic_args] if is_dependency_generic else init_arg.annotation
-                dependency = self.get_service(dependency_type)
-                if dependency is None and init_arg.default == init_arg.empty and init_arg.name != 'self':
-                    raise Exception(f"Failed to build service of type '{service_descriptor.service_type.__name__}' because the service provider failed to resolve service '{dependency_type.__name__}'")
-                service_args[init_arg.name] = dependency
-            service = service_descriptor.implementation_type(**service_args)
+            activation_plan = self._activation_plans.get(service_descriptor.implementation_type)
+            if activation_plan is None:
+                activation_plan = ServiceActivationPlan.compile(service_descriptor.implementation_type)
+                self._activation_plans[service_descriptor.implementation_type] = activation_plan
+            service = activation_plan.activate(self, service_descriptor.service_type)
         if service_descriptor.lifetime != ServiceLifetime.TRANSIENT:
             realized_services = self._realized_services.get(service_descriptor.service_type)
             if realized_services is None:
                 self._realized_services[service_descriptor.service_type] = [service]
             else:
                 realized_services.append(service)
+            self._realized_described_services[service_descriptor] = service
         return service
 
     @contextmanager
     def create_scope(self) -> ServiceScopeBase:
-        service_scope = ServiceScope(self, [descriptor for descriptor in self._service_descriptors if descriptor.lifetime == ServiceLifetime.SCOPED])
+        scoped_service_descriptors = dict[Type, List[ServiceDescriptor]]()
+        for service_type, descriptors in self._service_descriptors.items():
+            scoped_descriptors = [descriptor for descriptor in descriptors if descriptor.lifetime == ServiceLifetime.SCOPED]
+            if len(scoped_descriptors) > 0:
+                scoped_service_descriptors[service_type] = scoped_descriptors
+        service_scope = ServiceScope(self, scoped_service_descriptors, self._activation_plans)
         try:
             yield service_scope
         finally:
@@ -253,6 +340,7 @@ class ServiceProvider(ServiceProviderBase):
             except:
                 pass
         self._realized_services = dict[Type, List]()
+        self._realized_described_services = dict[ServiceDescriptor, any]()
 
 
 class ServiceDescriptor:
@@ -304,6 +392,85 @@ ServiceCollection = ForwardRef("ServiceCollection")
 class ServiceCollection(List[ServiceDescriptor]):
     ''' Represents a collection of service descriptors used to configure a service provider '''
 
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._registered_service_types = dict[Type, int]()
+        self._register(self)
+
+    _registered_service_types: Dict[Type, int]
+    ''' Gets a mapping of the types of all registered services to the number of descriptors registered for them, used to determine in constant time whether or not a service type has already been registered. Descriptors are counted rather than their types merely recorded, since a service type may be registered several times, and must remain registered until its last descriptor is removed. It is kept in sync by all the methods that modify the collection '''
+
+    def append(self, descriptor: ServiceDescriptor) -> None:
+        super().append(descriptor)
+        self._register([descriptor])
+
+    def extend(self, descriptors: Iterable[ServiceDescriptor]) -> None:
+        descriptors = list(descriptors)
+        super().extend(descriptors)
+        self._register(descriptors)
+
+    def insert(self, index: SupportsIndex, descriptor: ServiceDescriptor) -> None:
+        super().insert(index, descriptor)
+        self._register([descriptor])
+
+    def remove(self, descriptor: ServiceDescriptor) -> None:
+        super().remove(descriptor)
+        self._unregister([descriptor])
+
+    def pop(self, index: SupportsIndex = -1) -> ServiceDescriptor:
+        descriptor = super().pop(index)
+        self._unregister([descriptor])
+        return descriptor
+
+    def clear(self) -> None:
+        super().clear()
+        self._registered_service_types.clear()
+
+    def __iadd__(self, descriptors: Iterable[ServiceDescriptor]) -> ServiceCollection:
+        self.extend(descriptors)
+        return self
+
+    def __imul__(self, count: SupportsIndex) -> ServiceCollection:
+        super().__imul__(count)
+        self._registered_service_types.clear()
+        self._register(self)
+        return self
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Union[ServiceDescriptor, Iterable[ServiceDescriptor]]) -> None:
+        if isinstance(index, slice):
+            replaced_descriptors, value = self[index], list(value)
+            super().__setitem__(index, value)
+            self._unregister(replaced_descriptors)
+            self._register(value)
+            return
+        replaced_descriptor = self[index]
+        super().__setitem__(index, value)
+        self._unregister([replaced_descriptor])
+        self._register([value])
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        removed_descriptors = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        self._unregister(removed_descriptors)
+
+    def _register(self, descriptors: Iterable[ServiceDescriptor]):
+        ''' Records the registration of the specified descriptors '''
+        for descriptor in descriptors:
+            self._registered_service_types[descriptor.service_type] = self._registered_service_types.get(descriptor.service_type, 0) + 1
+
+    def _unregister(self, descriptors: Iterable[ServiceDescriptor]):
+        ''' Records the removal of the specified descriptors '''
+        for descriptor in descriptors:
+            count = self._registered_service_types[descriptor.service_type] - 1
+            if count > 0:
+                self._registered_service_types[descriptor.service_type] = count
+            else:
+                del self._registered_service_types[descriptor.service_type]
+
+    def contains(self, service_type: Type) -> bool:
+        ''' Determines whether or not a service of the specified type has already been registered '''
+        return service_type in self._registered_service_types
+
     def add_singleton(self, service_type: Type, implementation_type: Optional[Type] = None, singleton: any = None, implementation_factory: Callable[[ServiceProvider], any] = None) -> ServiceCollection:
         ''' Registers a new singleton service dependency '''
         self.append(ServiceDescriptor(service_type, implementation_type, singleton, implementation_factory, ServiceLifetime.SINGLETON))
@@ -311,18 +478,18 @@ class ServiceCollection(List[ServiceDescriptor]):
 
     def try_add_singleton(self, service_type: Type, implementation_type: Optional[Type] = None, singleton: any = None, implementation_factory: Callable[[ServiceProvider], any] = None) -> ServiceCollection:
         ''' Attempts to register a new singleton service dependency, if one has not already been registered'''
-        if any(descriptor.service_type == service_type for descriptor in self):
+        if self.contains(service_type):
             return self
         return self.add_singleton(service_type, implementation_type, singleton, implementation_factory)
 
     def add_transient(self, service_type: Type, implementation_type: Optional[Type] = None, implementation_factory: Callable[[ServiceProvider], any] = None) -> ServiceCollection:
         ''' Registers a new transient service dependency '''
-        self.append(ServiceDescriptor(service_type, implementation_type, None, implementation_factory, ServiceLifetime.SINGLETON))
+        self.append(ServiceDescriptor(service_type, implementation_type, None, implementation_factory, ServiceLifetime.TRANSIENT))
         return self
 
     def try_add_transient(self, service_type: Type, implementation_type: Optional[Type] = None, implementation_factory: Callable[[ServiceProvider], any] = None) -> ServiceCollection:
         ''' Attempts to register a new transient service dependency, if one has not already been registered'''
-        if any(descriptor.service_type == service_type for descriptor in self):
+        if self.contains(service_type):
             return self
         return self.add_transient(service_type, implementation_type, implementation_factory)
 
@@ -333,9 +500,10 @@ class ServiceCollection(List[ServiceDescriptor]):
 
     def try_add_scoped(self, service_type: Type, implementation_type: Optional[Type] = None, implementation_factory: Callable[[ServiceProvider], any] = None) -> ServiceCollection:
         ''' Attempts to register a new scoped service dependency, if one has not already been registered'''
-        if any(descriptor.service_type == service_type for descriptor in self):
+        if self.contains(service_type):
             return self
         return self.add_scoped(service_type, implementation_type, implementation_factory)
 
     def build(self) -> ServiceProviderBase:
+        ''' Builds a new service provider, freezing the registered service descriptors into a type-indexed registry '''
         return ServiceProvider(self)
@@ -65,6 +65,7 @@ class CloudEventPublisher(HostedService):
 
     async def on_publish_cloud_event_async(self, e: CloudEvent):
         uri = urlparse(self._options.sink_uri)
+        content = self._json_serializer.serialize(e)
         published = False
         for retries in range(self._options.retry_attempts):
             try:
@@ -74,7 +75,7 @@ class CloudEventPublisher(HostedService):
                 }
                 response = None
                 with httpx.Client() as client:
-                    response = client.post(url=url, headers=headers, content=self._json_serializer.serialize(e))
+                    response = client.post(url=url, headers=headers, content=content)
                     response.raise_for_status()
                     if response is not None and 200 <= response.status_code < 300:
                         log.debug(f"Published cloudevent: {e.type}")
@@ -0,0 +1,176 @@
+import ast
+import operator
+import re
+from ast import Add, And, Attribute, BinOp, BoolOp, Call, Compare, Constant, Div, Eq, FloorDiv, Gt, GtE, In, Is, IsNot, Lambda, Lt, LtE, Mod, Mult, Name, Not, NotEq, NotIn, Or, Sub, Subscript, UnaryOp, USub, cmpop, expr
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class MongoExpressionTranslator:
+    ''' Represents a service used to translate ast expressions into native Mongo query filters '''
+
+    def __init__(self, value_encoder: Optional[Callable[[Any], Any]] = None):
+        self._value_encoder = value_encoder if value_encoder is not None else lambda value: value
+
+    _value_encoder: Callable[[Any], Any]
+    ''' Gets the function used to convert the values the expressions are compared to into their stored Mongo representation '''
+
+    _argument_name: Optional[str] = None
+    ''' Gets the name of the argument of the lambda expression being translated, if any '''
+
+    def translate(self, expression: expr) -> Dict[str, Any]:
+        ''' Translates the specified predicate expression into a new Mongo filter. Raises an exception if the expression cannot be translated '''
+        filter, untranslated_expressions = self.translate_partially(expression)
+        if len(untranslated_expressions) > 0:
+            raise Exception(f"The specified expression '{ast.unparse(untranslated_expressions[0])}' cannot be translated into a native Mongo filter")
+        return filter
+
+    def translate_partially(self, expression: expr) -> Tuple[Dict[str, Any], List[expr]]:
+        ''' Translates as many of the conjuncts of the specified predicate expression as possible into a new Mongo filter, and returns the conjuncts that could not be translated '''
+        self._argument_name = None
+        if isinstance(expression, Lambda):
+            self._argument_name = expression.args.args[0].arg if len(expression.args.args) > 0 else None
+            expression = expression.body
+        conjuncts = expression.values if isinstance(expression, BoolOp) and isinstance(expression.op, And) else [expression]
+        filters = list[Dict[str, Any]]()
+        untranslated_expressions = list[expr]()
+        for conjunct in conjuncts:
+            try:
+                filters.append(self._translate_filter(conjunct))
+            except _UntranslatableExpression:
+                untranslated_expressions.append(conjunct)
+        return self._combine(filters), untranslated_expressions
+
+    def _translate_filter(self, expression: expr) -> Dict[str, Any]:
+        if isinstance(expression, BoolOp):
+            filters = [self._translate_filter(value) for value in expression.values]
+            return self._combine(filters) if isinstance(expression.op, And) else {'$or': filters}
+        elif isinstance(expression, Compare): return self._translate_compare(expression)
+        elif isinstance(expression, Call): return self._translate_call(expression)
+        elif isinstance(expression, UnaryOp) and isinstance(expression.op, Not): return {'$nor': [self._translate_filter(expression.operand)]}
+        elif isinstance(expression, Constant) and expression.value is True: return {}
+        elif self._is_field(expression): return {self._translate_field(expression): {'$exists': True, '$nin': [False, None, 0, '']}}
+        raise _UntranslatableExpression()
+
+    def _translate_compare(self, expression: Compare) -> Dict[str, Any]:
+        filters = list[Dict[str, Any]]()
+        left = expression.left
+        for operator, right in zip(expression.ops, expression.comparators):
+            filters.append(self._translate_comparison(left, operator, right))
+            left = right
+        return self._combine(filters)
+
+    def _translate_comparison(self, left: expr, operator: cmpop, right: expr) -> Dict[str, Any]:
+        if isinstance(operator, (In, NotIn)):
+            if not self._is_field(left) or self._is_field(right):
+                # Membership tests on a field ('value in x.items') are ambiguous between array and substring semantics
+                raise _UntranslatableExpression()
+            values = self._evaluate(right)
+            if isinstance(values, (str, bytes, dict)) or not hasattr(values, '__iter__'):
+                raise _UntranslatableExpression()
+            return {self._translate_field(left): {'$in' if isinstance(operator, In) else '$nin': [self._value_encoder(value) for value in values]}}
+        if not self._is_field(left):
+            if not self._is_field(right):
+                raise _UntranslatableExpression()
+            left, right, operator = right, left, _reversed_operators.get(type(operator), operator)
+        mongo_operator = _comparison_operators.get(type(operator))
+        if mongo_operator is None:
+            raise _UntranslatableExpression()
+        field = self._translate_field(left)
+        if self._is_field(right):
+            return {'$expr': {mongo_operator: [f'${field}', f'${self._translate_field(right)}']}}
+        return {field: {mongo_operator: self._value_encoder(self._evaluate(right))}}
+
+    def _translate_call(self, expression: Call) -> Dict[str, Any]:
+        if not isinstance(expression.func, Attribute) or not self._is_field(expression.func.value) or len(expression.args) != 1:
+            raise _UntranslatableExpression()
+        function_name = expression.func.attr
+        field = self._translate_field(expression.func.value)
+        argument = self._evaluate(expression.args[0])
+        if not isinstance(argument, str):
+            raise _UntranslatableExpression()
+        if function_name == 'startswith': return {field: {'$regex': f'^{re.escape(argument)}'}}
+        elif function_name == 'endswith': return {field: {'$regex': f'{re.escape(argument)}$'}}
+        raise _UntranslatableExpression()
+
+    def _translate_field(self, expression: expr) -> str:
+        path = list[str]()
+        while not isinstance(expression, Name):
+            if isinstance(expression, Attribute):
+                path.append(expression.attr)
+                expression = expression.value
+            elif isinstance(expression, Subscript):
+                index = self._evaluate(expression.slice)
+                if not isinstance(index, (int, str)) or isinstance(index, bool) or isinstance(index, int) and index < 0:
+                    raise _UntranslatableExpression()
+                path.append(str(index))
+                expression = expression.value
+            else:
+                raise _UntranslatableExpression()
+        if len(path) < 1:
+            raise _UntranslatableExpression()
+        path.reverse()
+        return '.'.join(path)
+
+    def _is_field(self, expression: expr) -> bool:
+        ''' Determines whether or not the specified expression references a field of the lambda argument '''
+        while isinstance(expression, (Attribute, Subscript)):
+            expression = expression.value
+        return isinstance(expression, Name) and (self._argument_name is None or expression.id == self._argument_name)
+
+    def _evaluate(self, expression: expr) -> Any:
+        ''' Evaluates the specified expression, which must not reference the lambda argument '''
+        if isinstance(expression, Constant): return expression.value
+        elif isinstance(expression, Attribute) and not self._is_field(expression): return getattr(self._evaluate(expression.value), expression.attr)
+        elif isinstance(expression, Subscript) and not self._is_field(expression): return self._evaluate(expression.value)[self._evaluate(expression.slice)]
+        elif isinstance(expression, (ast.List, ast.Tuple, ast.Set)): return [self._evaluate(element) for element in expression.elts]
+        elif isinstance(expression, UnaryOp) and isinstance(expression.op, USub): return -self._evaluate(expression.operand)
+        elif isinstance(expression, BinOp) and type(expression.op) in _binary_operators: return _binary_operators[type(expression.op)](self._evaluate(expression.left), self._evaluate(expression.right))
+        elif isinstance(expression, Call) and not self._is_field(expression.func):
+            return self._evaluate(expression.func)(*[self._evaluate(argument) for argument in expression.args], **{keyword.arg: self._evaluate(keyword.value) for keyword in expression.keywords})
+        raise _UntranslatableExpression()
+
+    def _combine(self, filters: List[Dict[str, Any]]) -> Dict[str, Any]:
+        filters = [filter for filter in filters if len(filter) > 0]
+        if len(filters) == 0:
+            return {}
+        elif len(filters) == 1:
+            return filters[0]
+        return {'$and': filters}
+
+
+class _UntranslatableExpression(Exception):
+    ''' Represents the exception raised when an expression has no native Mongo equivalent '''
+    pass
+
+
+_comparison_operators = {
+    Eq: '$eq',
+    NotEq: '$ne',
+    Lt: '$lt',
+    LtE: '$lte',
+    Gt: '$gt',
+    GtE: '$gte',
+    Is: '$eq',
+    IsNot: '$ne',
+}
+''' Gets a mapping of Python comparison operators to their Mongo equivalent '''
+
+
+_reversed_operators = {
+    Lt: Gt(),
+    LtE: GtE(),
+    Gt: Lt(),
+    GtE: LtE(),
+}
+''' Gets a mapping of Python comparison operators to the operator to use when swapping their operands '''
+
+
+_binary_operators = {
+    Add: operator.add,
+    Sub: operator.sub,
+    Mult: operator.mul,
+    Div: operator.truediv,
+    FloorDiv: operator.floordiv,
+    Mod: operator.mod,
+}
+''' Gets a mapping of the Python binary operators that can be evaluated when computing the values expressions are compared to '''
@@ -83,5 +83,5 @@ class ExceptionHandlingMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
         except Exception as ex:
             problem_details = ProblemDetails("Internal Server Error", 500, str(ex), "https://www.w3.org/Protocols/HTTP/HTRESP.html#:~:text=Internal%20Error%20500")
-            response_content = self.serializer.serialize_to_text(problem_details)
+            response_content = self.serializer.serialize(problem_details)
             return Response(response_content, 500, media_type="application/json")
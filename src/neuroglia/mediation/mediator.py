@@ -1,13 +1,17 @@
 import asyncio
 import inspect
 import logging
+import time
+import weakref
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
 from types import UnionType
-from typing import Any, Generic, List, Optional, TypeVar
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Generic, Hashable, Iterable, List, Optional, Set, Tuple, Type, TypeVar, Union, get_args, get_origin
 from neuroglia.core import ModuleLoader, OperationResult, TypeFinder, TypeExtensions
 from neuroglia.data.abstractions import DomainEvent
-from neuroglia.dependency_injection.service_provider import ServiceProviderBase
+from neuroglia.dependency_injection.service_provider import ServiceDescriptor, ServiceProviderBase
 from neuroglia.hosting.abstractions import ApplicationBuilderBase
 from neuroglia.integration.models import IntegrationEvent
 
@@ -117,31 +121,361 @@ class IntegrationEventHandler(Generic[TIntegrationEvent], NotificationHandler[TI
     pass
 
 
+class NotificationDispatchStrategy(Enum):
+    ''' Enumerates all supported strategies used to dispatch a notification to its handlers '''
+
+    PARALLEL = 'parallel'
+    ''' Indicates that the handlers of a notification are run concurrently '''
+
+    SEQUENTIAL = 'sequential'
+    ''' Indicates that the handlers of a notification are run one after the other, in registration order '''
+
+
+@dataclass
+class MediatorOptions:
+    ''' Represents the options used to configure a mediator '''
+
+    notification_dispatch_strategy: NotificationDispatchStrategy = NotificationDispatchStrategy.PARALLEL
+    ''' Gets/sets the strategy used to dispatch notifications to their handlers. Defaults to 'PARALLEL' '''
+
+    max_concurrent_notification_handlers: Optional[int] = None
+    ''' Gets/sets the maximum amount of notification handlers, all types and notifications included, that can run concurrently. Unbounded if not set '''
+
+    notification_handler_concurrency_limits: Dict[Type, int] = field(default_factory=dict)
+    ''' Gets/sets a notification handler type/limit mapping used to bound the amount of concurrently running handlers of a specific type '''
+
+    notification_handler_timeout: Optional[float] = None
+    ''' Gets/sets the default deadline, in seconds, after which a notification handler is cancelled. Unbounded if not set '''
+
+    notification_handler_timeouts: Dict[Type, float] = field(default_factory=dict)
+    ''' Gets/sets a notification handler type/deadline mapping used to override the default deadline for specific handler types '''
+
+    raise_on_notification_handler_failure: bool = True
+    ''' Gets/sets a boolean indicating whether or not to raise the first error once all handlers of a notification have run, if any of them failed '''
+
+    coalesced_query_types: Set[Type] = field(default_factory=set)
+    ''' Gets/sets a set containing the types of the queries, generic type definitions included, for which identical in-flight executions should be coalesced into a single one, whose result is shared by all callers '''
+
+    max_coalesced_queries: int = 1024
+    ''' Gets/sets the maximum amount of distinct queries that can be coalesced at the same time. Queries exceeding the limit are executed without coalescing '''
+
+
+@dataclass
+class NotificationHandlingOutcome:
+    ''' Represents the outcome of the handling of a notification by a specific handler '''
+
+    handler_type: Type
+    ''' Gets the type of the handler the outcome is for '''
+
+    succeeded: bool
+    ''' Gets a boolean indicating whether or not the handler has successfully handled the notification '''
+
+    duration: float
+    ''' Gets the time, in seconds, the handler took to handle the notification '''
+
+    error: Optional[Exception] = None
+    ''' Gets the error, if any, that was raised by the handler '''
+
+    timed_out: bool = False
+    ''' Gets a boolean indicating whether or not the handler has been cancelled because it exceeded its deadline '''
+
+
 class Mediator:
     ''' Represents the default implementation of the IMediator class '''
 
     _service_provider: ServiceProviderBase
 
-    def __init__(self, service_provider: ServiceProviderBase):
+    _request_handler_routes: Dict[Type, List[ServiceDescriptor]]
+    ''' Gets a request type/handler descriptors mapping, including closed generic request types such as 'GetByIdQuery[Person, str]' '''
+
+    _unrouted_request_handlers: List[ServiceDescriptor]
+    ''' Gets a list containing the descriptors of the request handlers whose handled request type could not be determined ahead of time, such as handlers registered using a lambda factory '''
+
+    _notification_handlers: Dict[ServiceDescriptor, List[Type]]
+    ''' Gets a handler descriptor/handled notification types mapping for all notification handlers whose handled notification types could be determined ahead of time '''
+
+    _notification_handler_routes: Dict[Type, List[ServiceDescriptor]]
+    ''' Gets a notification type/handler descriptors mapping, lazily populated the first time a notification of a given type is published '''
+
+    _unrouted_notification_handlers: List[ServiceDescriptor]
+    ''' Gets a list containing the descriptors of the notification handlers whose handled notification types could not be determined ahead of time '''
+
+    _options: MediatorOptions
+    ''' Gets the options used to configure the mediator '''
+
+    _notification_handler_semaphores: weakref.WeakKeyDictionary
+    ''' Gets an event loop/semaphores mapping containing the semaphores used to bound the concurrency of notification handlers. Semaphores are bound to the loop they are used on, hence the need to maintain them per loop '''
+
+    _in_flight_queries: weakref.WeakKeyDictionary
+    ''' Gets an event loop/in-flight queries mapping containing the futures of the coalesced queries being executed on each loop, keyed by query type and value '''
+
+    def __init__(self, service_provider: ServiceProviderBase, options: Optional[MediatorOptions] = None):
         self._service_provider = service_provider
+        self._options = MediatorOptions() if options is None else options
+        self._notification_handler_semaphores = weakref.WeakKeyDictionary()
+        self._in_flight_queries = weakref.WeakKeyDictionary()
+        self._build_request_handler_routes()
+        self._build_notification_handler_routes()
 
     async def execute_async(self, request: Request) -> OperationResult:
         ''' Executes the specified request '''
-        handlers: List[RequestHandler] = [candidate for candidate in self._service_provider.get_services(RequestHandler) if self._request_handler_matches(candidate, request)]
+        request_type = request.__orig_class__ if hasattr(request, "__orig_class__") else type(request)
+        coalescing_key = self._get_query_coalescing_key(request, request_type)
+        if coalescing_key is None:
+            return await self._execute_request_async(request, request_type)
+        in_flight_queries: Dict[Hashable, asyncio.Future] = self._in_flight_queries.get(asyncio.get_running_loop())
+        if in_flight_queries is None:
+            in_flight_queries = dict[Hashable, asyncio.Future]()
+            self._in_flight_queries[asyncio.get_running_loop()] = in_flight_queries
+        in_flight_query = in_flight_queries.get(coalescing_key)
+        if in_flight_query is not None:
+            log.debug(f"Coalescing query of type {type(request).__name__} with an identical in-flight query")
+            return await asyncio.shield(in_flight_query)
+        if len(in_flight_queries) >= self._options.max_coalesced_queries:
+            return await self._execute_request_async(request, request_type)
+        # The query is executed by a task of its own, awaited through a shield by every caller, so that cancelling any caller, including the first one, does not cancel the others
+        in_flight_query = asyncio.ensure_future(self._execute_request_async(request, request_type))
+        in_flight_queries[coalescing_key] = in_flight_query
+        in_flight_query.add_done_callback(lambda task: self._complete_in_flight_query(in_flight_queries, coalescing_key, task))
+        return await asyncio.shield(in_flight_query)
+
+    def _complete_in_flight_query(self, in_flight_queries: Dict[Hashable, asyncio.Future], coalescing_key: Hashable, in_flight_query: asyncio.Future):
+        ''' Stops coalescing queries with the specified completed in-flight query '''
+        if in_flight_queries.get(coalescing_key) is in_flight_query:
+            del in_flight_queries[coalescing_key]
+        if not in_flight_query.cancelled():
+            in_flight_query.exception()  # marks the exception, if any, as retrieved, in case all callers have been cancelled
+
+    async def _execute_request_async(self, request: Request, request_type: Type) -> OperationResult:
+        ''' Executes the specified request using its matching handler '''
+        handler = self._get_request_handler(request, request_type)
+        log.info(f"Executing request type {type(request).__name__}")
+        return await handler.handle_async(request)
+
+    def _get_request_handler(self, request: Request, request_type: Type) -> RequestHandler:
+        ''' Gets the handler of the specified request '''
+        handlers: List[RequestHandler] = [self._service_provider.get_described_service(descriptor) for descriptor in self._request_handler_routes.get(request_type, [])]
+        if len(self._unrouted_request_handlers) > 0:
+            candidates = [self._service_provider.get_described_service(descriptor) for descriptor in self._unrouted_request_handlers]
+            handlers.extend(candidate for candidate in candidates if self._request_handler_matches(candidate, request))
         if handlers is None or len(handlers) < 1:
             raise Exception(f"Failed to find a handler for request of type '{type(request).__name__}'")
         elif len(handlers) > 1:
             raise Exception(f"There must be exactly one handler defined for the command of type '{type(request).__name__}'")
-        log.info(f"Executing request type {type(request).__name__}")
-        handler = handlers[0]
-        return await handler.handle_async(request)
+        return handlers[0]
+
+    async def execute_many_async(self, requests: Iterable[Request] | AsyncIterable[Request], max_concurrency: int = 10, stop_on_failure: bool = False) -> List[OperationResult]:
+        ''' Executes the specified requests, then returns their results in input order
+
+            Args:
+                requests (Iterable[Request] | AsyncIterable[Request]): the requests to execute. Streams are consumed lazily, as execution slots become available
+                max_concurrency (int): the maximum amount of requests to execute concurrently
+                stop_on_failure (bool): a boolean indicating whether or not to stop consuming requests after the first failure. Requests already being executed are awaited, and their results returned
 
-    async def publish_async(self, notification: object):
-        ''' Publishes the specified notification '''
-        handlers: List[NotificationHandler] = [candidate for candidate in self._service_provider.get_services(NotificationHandler) if self._notification_handler_matches(candidate, type(notification))]
+            Notes:
+                The handler of each request type is resolved once per batch, then shared by all the requests of that type.
+                Errors raised while executing a request are described by an 'Internal Server Error' result rather than raised.
+        '''
+        if max_concurrency < 1:
+            raise Exception("The maximum concurrency must be greater than or equal to 1")
+        handlers = dict[Type, RequestHandler]()
+        results = dict[int, OperationResult]()
+        indexed_requests = self._enumerate_requests_async(requests)
+        lock = asyncio.Lock()
+        stopped = False
+
+        async def execute_next_requests_async():
+            nonlocal stopped
+            while not stopped:
+                async with lock:
+                    if stopped:
+                        return
+                    try:
+                        index, request = await anext(indexed_requests)
+                    except StopAsyncIteration:
+                        return
+                result = await self._execute_batched_request_async(request, handlers)
+                results[index] = result
+                if stop_on_failure and not result.is_success_status_code():
+                    stopped = True
+
+        await asyncio.gather(*(execute_next_requests_async() for _ in range(max_concurrency)))
+        return [results[index] for index in sorted(results.keys())]
+
+    async def _enumerate_requests_async(self, requests: Iterable[Request] | AsyncIterable[Request]) -> AsyncIterator[Tuple[int, Request]]:
+        ''' Enumerates the specified requests, whether they are synchronously or asynchronously iterable '''
+        index = 0
+        if isinstance(requests, AsyncIterable):
+            async for request in requests:
+                yield index, request
+                index += 1
+        else:
+            for request in requests:
+                yield index, request
+                index += 1
+
+    async def _execute_batched_request_async(self, request: Request, handlers: Dict[Type, RequestHandler]) -> OperationResult:
+        ''' Executes the specified request as part of a batch, reusing the handlers already resolved by the batch '''
+        try:
+            request_type = request.__orig_class__ if hasattr(request, "__orig_class__") else type(request)
+            handler = handlers.get(request_type)
+            if handler is None:
+                handler = self._get_request_handler(request, request_type)
+                handlers[request_type] = handler
+            return await handler.handle_async(request)
+        except Exception as ex:
+            log.error(f"An error occured while executing a request of type '{type(request).__name__}': {ex}")
+            return OperationResult("Internal Server Error", 500, str(ex), "https://www.w3.org/Protocols/HTTP/HTRESP.html#:~:text=Internal%20Error%20500")
+
+    async def publish_async(self, notification: object) -> List[NotificationHandlingOutcome]:
+        ''' Publishes the specified notification, then returns the outcome of its handling by each matching handler '''
+        notification_type = type(notification)
+        descriptors = self._notification_handler_routes.get(notification_type)
+        if descriptors is None:
+            descriptors = [descriptor for descriptor, handled_notification_types in self._notification_handlers.items() if any(handled_notification_type in notification_type.__mro__ for handled_notification_type in handled_notification_types)]
+            self._notification_handler_routes[notification_type] = descriptors
+        handlers: List[NotificationHandler] = [self._service_provider.get_described_service(descriptor) for descriptor in descriptors]
+        if len(self._unrouted_notification_handlers) > 0:
+            candidates = [self._service_provider.get_described_service(descriptor) for descriptor in self._unrouted_notification_handlers]
+            handlers.extend(candidate for candidate in candidates if self._notification_handler_matches(candidate, notification_type))
         if handlers is None or len(handlers) < 1:
-            return
-        await asyncio.gather(*(handler.handle_async(notification) for handler in handlers))
+            return list[NotificationHandlingOutcome]()
+        if self._options.notification_dispatch_strategy == NotificationDispatchStrategy.SEQUENTIAL:
+            outcomes = [await self._handle_notification_async(handler, notification) for handler in handlers]
+        else:
+            outcomes = await asyncio.gather(*(self._handle_notification_async(handler, notification) for handler in handlers))
+        failures = [outcome for outcome in outcomes if not outcome.succeeded]
+        for failure in failures:
+            log.error(f"The handler of type '{failure.handler_type.__name__}' failed to handle a notification of type '{notification_type.__name__}'{' because it exceeded its deadline' if failure.timed_out else ''}: {failure.error}")
+        if len(failures) > 0 and self._options.raise_on_notification_handler_failure:
+            raise failures[0].error
+        return outcomes
+
+    async def _handle_notification_async(self, handler: NotificationHandler, notification: object) -> NotificationHandlingOutcome:
+        ''' Handles the specified notification with the specified handler, honoring the configured concurrency limits and deadlines '''
+        handler_type = type(handler)
+        timeout = self._get_notification_handler_option(self._options.notification_handler_timeouts, handler_type, self._options.notification_handler_timeout)
+        semaphores = self._get_notification_handler_semaphores(handler_type)
+        acquired_semaphores = list[asyncio.Semaphore]()
+        try:
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                acquired_semaphores.append(semaphore)
+            started = time.perf_counter()
+            if timeout is None:
+                await handler.handle_async(notification)
+            else:
+                try:
+                    async with asyncio.timeout(timeout) as deadline:
+                        await handler.handle_async(notification)
+                except TimeoutError as ex:
+                    # Only the handlers that exceeded their deadline time out, as opposed to those that raised a TimeoutError themselves
+                    if not deadline.expired():
+                        raise
+                    return NotificationHandlingOutcome(handler_type, False, time.perf_counter() - started, ex, True)
+            return NotificationHandlingOutcome(handler_type, True, time.perf_counter() - started)
+        except Exception as ex:
+            return NotificationHandlingOutcome(handler_type, False, time.perf_counter() - started, ex)
+        finally:
+            # Only the semaphores acquired before a cancellation, if any, are released
+            for semaphore in reversed(acquired_semaphores):
+                semaphore.release()
+
+    def _get_notification_handler_option(self, values: Dict[Type, Any], handler_type: Type, default: Any = None) -> Any:
+        ''' Gets the value configured for the specified notification handler type or for the closest of its base types, if any '''
+        if len(values) < 1:
+            return default
+        return next((values[base_type] for base_type in handler_type.__mro__ if base_type in values), default)
+
+    def _get_notification_handler_semaphores(self, handler_type: Type) -> List[asyncio.Semaphore]:
+        ''' Gets the semaphores, if any, used to bound the concurrency of the specified notification handler type on the running event loop, in the order they must be acquired: the handler type's own semaphore comes first, so that handlers waiting for a slot of their type do not hold a global slot meanwhile '''
+        if self._options.max_concurrent_notification_handlers is None and len(self._options.notification_handler_concurrency_limits) < 1:
+            return list[asyncio.Semaphore]()
+        loop = asyncio.get_running_loop()
+        loop_semaphores: Dict[Optional[Type], asyncio.Semaphore] = self._notification_handler_semaphores.get(loop)
+        if loop_semaphores is None:
+            loop_semaphores = dict[Optional[Type], asyncio.Semaphore]()
+            self._notification_handler_semaphores[loop] = loop_semaphores
+        semaphores = list[asyncio.Semaphore]()
+        limit = self._get_notification_handler_option(self._options.notification_handler_concurrency_limits, handler_type)
+        if limit is not None:
+            semaphore = loop_semaphores.get(handler_type)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(limit)
+                loop_semaphores[handler_type] = semaphore
+            semaphores.append(semaphore)
+        if self._options.max_concurrent_notification_handlers is not None:
+            semaphore = loop_semaphores.get(None)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._options.max_concurrent_notification_handlers)
+                loop_semaphores[None] = semaphore
+            semaphores.append(semaphore)
+        return semaphores
+
+    def _get_query_coalescing_key(self, request: Request, request_type: Type) -> Optional[Hashable]:
+        ''' Gets the key, made out of its type and value, used to coalesce identical in-flight executions of the specified request, if it is a query for which coalescing has been enabled '''
+        coalesced_query_types = self._options.coalesced_query_types
+        if len(coalesced_query_types) < 1 or not isinstance(request, Query):
+            return None
+        if request_type not in coalesced_query_types and type(request) not in coalesced_query_types:
+            return None
+        try:
+            key = (request_type, tuple(sorted((name, value) for name, value in vars(request).items() if not name.startswith('__'))))
+            hash(key)
+        except TypeError:
+            return None  # the query's value is not hashable, and therefore cannot be coalesced
+        return key
+
+    def _build_request_handler_routes(self):
+        ''' Maps the descriptors of all registered request handlers to the type of request they handle '''
+        self._request_handler_routes = dict[Type, List[ServiceDescriptor]]()
+        self._unrouted_request_handlers = list[ServiceDescriptor]()
+        for descriptor in self._service_provider.get_service_descriptors(RequestHandler):
+            handled_request_type = self._get_handled_request_type(descriptor)
+            if handled_request_type is None:
+                self._unrouted_request_handlers.append(descriptor)
+            else:
+                self._request_handler_routes.setdefault(handled_request_type, list[ServiceDescriptor]()).append(descriptor)
+
+    def _get_handled_request_type(self, descriptor: ServiceDescriptor) -> Optional[Type]:
+        ''' Gets the type of request handled by the described request handler, if it can be determined without building it '''
+        try:
+            implementation_type = descriptor.get_implementation_type()
+            handler_type = TypeExtensions.get_generic_implementation(implementation_type, RequestHandler)
+        except Exception:
+            return None
+        if handler_type is None or not hasattr(handler_type, '__args__') or isinstance(handler_type.__args__[0], TypeVar):
+            return None
+        return handler_type.__args__[0]
+
+    def _build_notification_handler_routes(self):
+        ''' Maps the descriptors of all registered notification handlers to the types of notification they handle '''
+        self._notification_handlers = dict[ServiceDescriptor, List[Type]]()
+        self._notification_handler_routes = dict[Type, List[ServiceDescriptor]]()
+        self._unrouted_notification_handlers = list[ServiceDescriptor]()
+        for descriptor in self._service_provider.get_service_descriptors(NotificationHandler):
+            handled_notification_types = self._get_handled_notification_types(descriptor)
+            if handled_notification_types is None:
+                self._unrouted_notification_handlers.append(descriptor)
+            else:
+                self._notification_handlers[descriptor] = handled_notification_types
+
+    def _get_handled_notification_types(self, descriptor: ServiceDescriptor) -> Optional[List[Type]]:
+        ''' Gets the types of notification handled by the described notification handler, if they can be determined without building it '''
+        try:
+            implementation_type = descriptor.get_implementation_type()
+            candidate_type = implementation_type if inspect.isclass(implementation_type) else implementation_type.__origin__
+            handler_type = next(base for base in candidate_type.__orig_bases__ if (issubclass(base.__origin__, NotificationHandler) if hasattr(base, '__origin__') else issubclass(base, NotificationHandler)))
+        except Exception:
+            return None
+        if not hasattr(handler_type, '__args__'):
+            return None
+        handled_notification_type = handler_type.__args__[0]
+        handled_notification_types = get_args(handled_notification_type) if isinstance(handled_notification_type, UnionType) or get_origin(handled_notification_type) is Union else (handled_notification_type,)
+        handled_notification_types = [t.__origin__ if hasattr(t, '__origin__') else t for t in handled_notification_types]
+        if any(not inspect.isclass(t) for t in handled_notification_types):
+            return None
+        return handled_notification_types
 
     def _request_handler_matches(self, candidate, request_type) -> bool:
         expected_request_type = request_type.__orig_class__ if hasattr(request_type, "__orig_class__") else request_type
@@ -158,16 +492,17 @@ class Mediator:
         handler_type = next(base for base in candidate_type.__orig_bases__ if (issubclass(base.__origin__, NotificationHandler) if hasattr(base, '__origin__') else issubclass(base, NotificationHandler)))
         handled_notification_type = handler_type.__args__[0]
         if isinstance(handled_notification_type, UnionType):
-            return any(issubclass(t, request_type) for t in handled_notification_type.__args__)
+            return any(issubclass(request_type, t) for t in handled_notification_type.__args__)
         else:
-            return issubclass(handled_notification_type.__origin__, request_type) if hasattr(handled_notification_type, '__origin__') else issubclass(handled_notification_type, request_type)
+            return issubclass(request_type, handled_notification_type.__origin__) if hasattr(handled_notification_type, '__origin__') else issubclass(request_type, handled_notification_type)
 
-    def configure(app: ApplicationBuilderBase, modules: List[str] = list[str]()) -> ApplicationBuilderBase:
+    def configure(app: ApplicationBuilderBase, modules: List[str] = list[str](), options: Optional[MediatorOptions] = None) -> ApplicationBuilderBase:
         ''' Registers and configures mediation-related services (command/query/notification handlers) to the specified service collection.
 
             Args:
                 services (ServiceCollection): the service collection to configure
                 modules (List[str]): a list containing the names of the modules to scan for mediation services to register
+                options (Optional[MediatorOptions]): the options used to configure the mediator, if any
         '''
         for module in [ModuleLoader.load(module_name) for module_name in modules]:
             for command_handler_type in TypeFinder.get_types(module, lambda cls: inspect.isclass(cls) and (not hasattr(cls, "__parameters__") or len(cls.__parameters__) < 1) and issubclass(cls, CommandHandler) and cls != CommandHandler, include_sub_modules=True):
@@ -178,5 +513,6 @@ class Mediator:
                 app.services.add_transient(NotificationHandler, domain_event_handler_type)
             for integration_event_handler_type in TypeFinder.get_types(module, lambda cls: inspect.isclass(cls) and issubclass(cls, IntegrationEventHandler) and cls != IntegrationEventHandler, include_sub_packages=True):
                 app.services.add_transient(NotificationHandler, integration_event_handler_type)
+        app.services.try_add_singleton(MediatorOptions, singleton=MediatorOptions() if options is None else options)
         app.services.add_singleton(Mediator)
         return app
@@ -61,7 +61,7 @@ class ControllerBase(Routable):
         content = result.data if result.status >= 200 and result.status < 300 else result
         media_type = "application/json"
         if content is not None:
-            content = self.json_serializer.serialize_to_text(content)
+            content = self.json_serializer.serialize(content)
             media_type = "application/json"
         return Response(status_code=result.status, content=content, media_type=media_type)
 
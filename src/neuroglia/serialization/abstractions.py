@@ -6,13 +6,13 @@ class Serializer(ABC):
     ''' Represents the base class for all serializers '''
 
     @abstractmethod
-    def serialize(self, value: Any) -> bytearray:
-        ''' Serializes the specified value '''
+    def serialize(self, value: Any) -> bytes:
+        ''' Serializes the specified value to bytes '''
         raise NotImplementedError()
 
     @abstractmethod
-    def deserialize(self, input: bytearray, expected_type: Optional[Type]) -> Any:
-        ''' Deserializes the specified input into a new value of the specified type, if any '''
+    def deserialize(self, input: bytes | bytearray | memoryview, expected_type: Optional[Type]) -> Any:
+        ''' Deserializes the specified bytes-like input into a new value of the specified type, if any. Implementations must read the input as is, without requiring callers to copy or decode it first '''
         raise NotImplementedError()
 
 
@@ -1,198 +1,255 @@
 import json
+import threading
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 import typing
 from neuroglia.hosting.abstractions import ApplicationBuilderBase
 from neuroglia.serialization.abstractions import Serializer, TextSerializer
-from typing import Any, Dict, Optional, Type, Union, get_args, get_origin
+from types import UnionType
+from typing import Any, Callable, Dict, Optional, Type, Union, get_args, get_origin
 from dataclasses import is_dataclass, fields
 
 
 class JsonEncoder(json.JSONEncoder):
 
+    _encoders: Dict[type, Callable[[Any], Any]] = dict[type, Callable[[Any], Any]]()
+    """ Gets a mapping of the encoders compiled for each type of object that is not natively JSON serializable """
+
     def default(self, obj):
-        if issubclass(type(obj), Enum):
-            return obj.name
-        elif issubclass(type(obj), datetime):
-            return obj.isoformat()
-        elif hasattr(obj, "__dict__"):
-            filtered_dict = {
-                key: value
-                for key, value in obj.__dict__.items()
-                if not key.startswith("_") and value is not None
-            }
-            return filtered_dict
-        try:
-            return super().default(obj)
-        except Exception:
-            return str(obj)
+        encoder = JsonEncoder._encoders.get(type(obj))
+        if encoder is None:
+            encoder = JsonEncoder._compile_encoder(obj)
+            JsonEncoder._encoders[type(obj)] = encoder
+        return encoder(obj)
+
+    @staticmethod
+    def _compile_encoder(obj: Any) -> Callable[[Any], Any]:
+        """Compiles the encoder used to convert objects of the specified object's type into JSON serializable values"""
+        obj_type = type(obj)
+        if issubclass(obj_type, Enum):
+            return _encode_enum
+        elif issubclass(obj_type, datetime):
+            return obj_type.isoformat
+        elif issubclass(obj_type, Decimal):
+            return str
+        encoders = JsonEncoder._encoders
+        slots = tuple(
+            slot
+            for base_type in reversed(obj_type.__mro__)
+            for slot in _get_slots(base_type)
+            if slot not in ("__dict__", "__weakref__") and not slot.startswith("_")
+        )
+
+        has_dict = hasattr(obj, "__dict__")
+
+        # Values whose type already has a compiled encoder are converted inline, which spares the JSON encoder a callback per value
+        def encode_dict(o: Any, values: Optional[dict] = None) -> dict:
+            values = dict() if values is None else values
+            for key, value in o.__dict__.items():
+                if value is not None and not key.startswith("_"):
+                    encoder = encoders.get(type(value))
+                    values[key] = value if encoder is None else encoder(value)
+            return values
+
+        def encode_slots(o: Any) -> dict:
+            values = dict()
+            for slot in slots:
+                value = getattr(o, slot, None)
+                if value is not None:
+                    encoder = encoders.get(type(value))
+                    values[slot] = value if encoder is None else encoder(value)
+            return encode_dict(o, values) if has_dict else values
+
+        if slots:
+            return encode_slots
+        elif has_dict:
+            return encode_dict
+        return str
+
+
+def _encode_enum(obj: Enum) -> str:
+    return obj.name
+
+
+def _get_slots(obj_type: type) -> tuple:
+    slots = obj_type.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+def _decode_as_is(value: Any) -> Any:
+    return value
 
 
 class JsonSerializer(TextSerializer):
     """Represents the service used to serialize/deserialize to/from JSON"""
 
-    def serialize(self, value: Any) -> bytearray:
-        text = self.serialize_to_text(value)
-        if text is None:
-            return None
-        return text.encode()
+    _object_decoders: Dict[Type, Callable[[dict], Any]]
+    """ Gets a mapping of the root object decoders compiled for each expected type """
+
+    _decoders: Dict[Any, Callable[[Any], Any]]
+    """ Gets a mapping of the nested value decoders compiled for each expected type """
+
+    _lock: threading.RLock
+    """ Gets the lock used to synchronize the compilation of decoders """
+
+    def __init__(self):
+        self._object_decoders = dict[Type, Callable[[dict], Any]]()
+        self._decoders = dict[Any, Callable[[Any], Any]]()
+        self._lock = threading.RLock()
+
+    def serialize(self, value: Any) -> bytes:
+        return json.dumps(value, cls=JsonEncoder).encode()
 
     def serialize_to_text(self, value: Any) -> str:
         return json.dumps(value, cls=JsonEncoder)
 
-    def deserialize(self, input: bytearray, expected_type: Any | None) -> Any:
-        return self.deserialize_from_text(input.decode(), expected_type)
+    def deserialize(self, input: bytes | bytearray | memoryview, expected_type: Any | None = None) -> Any:
+        if not isinstance(input, (bytes, bytearray)):
+            # json.loads only accepts str, bytes and bytearray: other buffers, such as memoryviews, are decoded straight to str, which is the single copy json.loads makes of bytes anyway, rather than being copied to bytes first
+            input = str(input, "utf-8")
+        return self._decode(json.loads(input), expected_type)
 
     def deserialize_from_text(
         self, input: str, expected_type: Optional[Type] = None
     ) -> Any:
-        value = json.loads(input)
+        return self._decode(json.loads(input), expected_type)
+
+    def _decode(self, value: Any, expected_type: Optional[Type]) -> Any:
+        """Decodes the specified parsed JSON value into a new value of the specified type, if any"""
         if expected_type is None or not isinstance(value, dict):
             return value
         elif expected_type == dict:
             return dict(value)
-        fields = {}
-        for base_type in reversed(expected_type.__mro__):
-            if not hasattr(base_type, "__annotations__"):
-                continue
-            for key, field_type in base_type.__annotations__.items():
-                if key in value:
-                    fields[key] = self._deserialize_nested(value[key], field_type)
-        value = object.__new__(expected_type)
-        value.__dict__ = fields
-        return value
+        return self._get_object_decoder(expected_type)(value)
+
+    def _get_object_decoder(self, expected_type: Type) -> Callable[[dict], Any]:
+        """Gets the decoder used to deserialize a root JSON object into an instance of the specified type, compiling it on first use"""
+        decoder = self._object_decoders.get(expected_type)
+        if decoder is not None:
+            return decoder
+        if not isinstance(expected_type, type):
+            decoder = self._get_decoder(expected_type)
+        else:
+            field_decoders = dict[str, Callable[[Any], Any]]()
+            for base_type in reversed(expected_type.__mro__):
+                if not hasattr(base_type, "__annotations__"):
+                    continue
+                for key, field_type in base_type.__annotations__.items():
+                    field_decoders[key] = self._get_decoder(field_type)
+            field_decoders = tuple(field_decoders.items())
+
+            def decoder(value: dict) -> Any:
+                obj = object.__new__(expected_type)
+                obj.__dict__ = {
+                    key: decode(value[key])
+                    for key, decode in field_decoders
+                    if key in value
+                }
+                return obj
+
+        self._object_decoders[expected_type] = decoder
+        return decoder
 
     def _deserialize_nested(self, value: Any, expected_type: Type) -> Any:
         """Recursively deserializes a nested object. Support native types (str, int, float, bool) as well as Generic Types that also include subtypes (typing.Dict, typing.List)."""
+        return self._get_decoder(expected_type)(value)
 
-        # Handle None for Optional types
-        if value is None:
-            return None
+    def _get_decoder(self, expected_type: Any) -> Callable[[Any], Any]:
+        """Gets the decoder used to deserialize nested values of the specified type, compiling it on first use"""
+        try:
+            decoder = self._decoders.get(expected_type)
+        except TypeError:
+            # The type hint is not hashable (e.g. Annotated metadata) and cannot be cached
+            return self._compile_decoder(expected_type)
+        if decoder is not None:
+            return decoder
+        with self._lock:
+            decoder = self._decoders.get(expected_type)
+            if decoder is not None:
+                return decoder
+            compiled_decoder = None
+            # Registers a forwarding decoder first, so that recursive types can reference the decoder being compiled
+            self._decoders[expected_type] = lambda value: compiled_decoder(value)
+            try:
+                compiled_decoder = self._compile_decoder(expected_type)
+            except BaseException:
+                del self._decoders[expected_type]
+                raise
+            self._decoders[expected_type] = compiled_decoder
+            return compiled_decoder
 
+    def _compile_decoder(self, expected_type: Any) -> Callable[[Any], Any]:
+        """Compiles the decoder used to deserialize nested values of the specified type. Reflection happens once, here, rather than for each decoded value"""
         origin_type = get_origin(expected_type)
         if origin_type is not None:
             # This is a generic type (e.g., Optional[SomeType], List[SomeType])
             type_args = get_args(expected_type)
-            if origin_type is Union and type(None) in type_args:
+            if origin_type in (Union, UnionType) and type(None) in type_args:
                 # This is an Optional type
-                non_optional_type = next(t for t in type_args if t is not type(None))
-                return self._deserialize_nested(value, non_optional_type)
+                return self._get_decoder(next(t for t in type_args if t is not type(None)))
 
             elif origin_type in (list, typing.List):
-                # Handle List deserialization
-                if len(type_args) > 0:
-                    # List with type hints (e.g. typing.List[str])
-                    item_type = type_args[0]
-                else:
-                    item_type = type(value[0]) if value else object
-
-                # Deserialize each item in the list
-                return [self._deserialize_nested(v, item_type) for v in value]
+                if len(type_args) < 1:
+                    # List without type hints: JSON values are returned as is
+                    return _decode_as_is
+                item_decoder = self._get_decoder(type_args[0])
+                return lambda value: None if value is None else [item_decoder(v) for v in value]
 
             elif origin_type is dict:
-                # Handle Dict deserialization
-                if len(type_args) > 0:
-                    # Dictionary with type hints (e.g. typing.Dict[str, int])
-                    key_type, val_type = type_args
-                    return {
-                        self._deserialize_nested(k, key_type): self._deserialize_nested(
-                            v, val_type
-                        )
-                        for k, v in value.items()
-                    }
-                else:
-                    # Dictionary without type hints, use the actual type of each value
-                    return {
-                        k: self._deserialize_nested(v, type(v))
-                        for k, v in value.items()
-                    }
-
-        if isinstance(value, dict):
+                if len(type_args) < 2:
+                    # Dictionary without type hints: JSON values are returned as is
+                    return _decode_as_is
+                key_decoder = self._get_decoder(type_args[0])
+                value_decoder = self._get_decoder(type_args[1])
+                return lambda value: None if value is None else {key_decoder(k): value_decoder(v) for k, v in value.items()}
+
+        if isinstance(expected_type, type) and is_dataclass(expected_type):
             # Handle Dataclass deserialization
-            if is_dataclass(expected_type):
-                field_dict = {}
-                for field in fields(expected_type):
-                    if field.name in value:
-                        field_value = self._deserialize_nested(
-                            value[field.name], field.type
-                        )
-                        field_dict[field.name] = field_value
-                value = object.__new__(expected_type)
-                value.__dict__ = field_dict
-                return value
-
-            # If the expected type is a plain dict, we need to deserialize each value in the dict.
-            if hasattr(expected_type, "__args__") and expected_type.__args__:
-                # Dictionary with type hints (e.g. typing.Dict[str, int])
-                key_type, val_type = expected_type.__args__
-                return {
-                    self._deserialize_nested(k, key_type): self._deserialize_nested(
-                        v, val_type
-                    )
-                    for k, v in value.items()
-                }
-            else:
-                # Dictionary without type hints, use the actual type of each value
-                return {
-                    k: self._deserialize_nested(v, type(v)) for k, v in value.items()
+            field_decoders = tuple((field.name, self._get_decoder(field.type)) for field in fields(expected_type))
+
+            def decode_dataclass(value: Any) -> Any:
+                if not isinstance(value, dict):
+                    return value
+                obj = object.__new__(expected_type)
+                obj.__dict__ = {
+                    name: decode(value[name])
+                    for name, decode in field_decoders
+                    if name in value
                 }
+                return obj
 
-        elif isinstance(value, list):
-            # List with type hints (e.g. typing.List[str])
-            if hasattr(expected_type, "__args__") and expected_type.__args__:
-                # Extract the actual type from the generic alias
-                item_type = expected_type.__args__[0]
-                if hasattr(item_type, "__origin__"):  # Check if it's a generic alias
-                    if len(item_type.__args__) == 1:
-                        item_type = item_type.__args__[0]  # Get the actual type
-                    else:
-                        item_type = item_type.__origin__
-
-            else:
-                item_type = type(value[0]) if value else object
-
-            # Deserialize each item in the list
-            items = [self._deserialize_nested(v, item_type) for v in value]
-            values = []
-
-            for item in items:
-                if isinstance(item, (int, str, float, bool)):
-                    # For simple types, the deserialized item is already in the correct form
-                    values.append(item)
-                elif isinstance(item_type, type):
-                    # For complex types or custom classes, instantiate using __new__
-                    new_item = object.__new__(item_type)
-                    if hasattr(new_item, "__dict__"):
-                        # If the new item has a __dict__, we can directly update it
-                        new_item.__dict__.update(item)
-                    elif isinstance(item, dict):
-                        new_item = item
-                    values.append(new_item)
-                else:
-                    # If item_type is not a class type, just use the item as is
-                    values.append(item)
-            return values
+            return decode_dataclass
 
-        elif isinstance(value, str) and expected_type == datetime:
-            return datetime.fromisoformat(value)
+        elif expected_type == datetime:
+            return lambda value: datetime.fromisoformat(value) if isinstance(value, str) else value
 
-        elif (
-            hasattr(expected_type, "__bases__")
-            and expected_type.__bases__
-            and issubclass(expected_type, Enum)
-        ):
+        elif isinstance(expected_type, type) and issubclass(expected_type, Enum):
             # Handle Enum deserialization
+            members_by_value = dict[Any, Enum]()
             for enum_member in expected_type:
-                if enum_member.value == value:
-                    return enum_member
-            raise ValueError(
-                f"Invalid enum value for {
-                             expected_type.__name__}: {value}"
-            )
+                try:
+                    members_by_value.setdefault(enum_member.value, enum_member)
+                except TypeError:
+                    # Unhashable values are matched by equality in decode_enum
+                    pass
 
-        else:
-            # Return the value as is for types that do not require deserialization
-            return value
+            def decode_enum(value: Any) -> Any:
+                if value is None or isinstance(value, (dict, list)):
+                    return value
+                try:
+                    return members_by_value[value]
+                except (KeyError, TypeError):
+                    pass
+                for enum_member in expected_type:
+                    if enum_member.value == value:
+                        return enum_member
+                raise ValueError(f"Invalid enum value for {expected_type.__name__}: {value}")
+
+            return decode_enum
+
+        # Return the value as is for types that do not require deserialization
+        return _decode_as_is
 
     def configure(builder: ApplicationBuilderBase) -> ApplicationBuilderBase:
         """Configures the specified application builder to use the JsonSerializer"""
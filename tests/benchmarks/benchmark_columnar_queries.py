@@ -0,0 +1,53 @@
+''' Measures the cost of analytical queries on entities stored in columns, compared to the same queries evaluated on each entity by the in-memory repository.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_columnar_queries
+'''
+import asyncio
+import timeit
+from neuroglia.data.infrastructure.columnar.columnar_repository import ColumnarRepository
+from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
+from neuroglia.data.queryable import Queryable
+from tests.data import OrderDto
+
+
+def filtered_count(query: Queryable[OrderDto]):
+    return query.where(lambda o: o.quantity > 50 and o.amount < 500.0).count()
+
+
+def filtered_sum(query: Queryable[OrderDto]):
+    return query.where(lambda o: o.customer_id == 'customer_7').sum(lambda o: o.amount)
+
+
+def sorted_page(query: Queryable[OrderDto]):
+    return query.where(lambda o: o.quantity >= 10).order_by_descending(lambda o: o.amount).take(20).to_list()
+
+
+def grouped_sums(query: Queryable[OrderDto]):
+    return query.group_by(lambda o: o.customer_id).select(lambda g: {'customer_id': g.key, 'total': g.sum(lambda o: o.amount)}).to_list()
+
+
+queries = {'filtered count': filtered_count, 'filtered sum': filtered_sum, 'sorted page': sorted_page, 'grouped sums': grouped_sums}
+
+
+async def run(sizes=(10000, 100000), iterations: int = 5):
+    for size in sizes:
+        orders = [OrderDto(str(i), f'customer_{i % 100}', i % 100, (i * 7919) % 1000 + 0.5) for i in range(size)]
+        columnar_repository = ColumnarRepository[OrderDto, str]()
+        memory_repository = MemoryRepository[OrderDto, str]()
+        await columnar_repository.add_many_async(orders)
+        await memory_repository.add_many_async(orders)
+        columnar_query = await columnar_repository.query_async()
+        memory_query = await memory_repository.query_async()
+        for name, query in queries.items():
+            query(columnar_query)
+            columnar = timeit.timeit(lambda: query(columnar_query), number=iterations) / iterations * 1e3
+            if name == 'grouped sums':
+                print(f"{size:>8} entities {name:<15} {'columns':<8} {columnar:>9.2f} ms/query (not supported by the in-memory repository)")
+                continue
+            per_entity = timeit.timeit(lambda: query(memory_query), number=iterations) / iterations * 1e3
+            print(f"{size:>8} entities {name:<15} {'columns':<8} {columnar:>9.2f} ms/query, {'entities':<8} {per_entity:>9.2f} ms/query ({per_entity / columnar:.0f}x)")
+
+
+if __name__ == '__main__':
+    asyncio.run(run())
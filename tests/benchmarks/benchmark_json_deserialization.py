@@ -0,0 +1,80 @@
+''' Measures the cost of deserializing a batch of BankAccountDto-shaped JSON documents, with nested transactions, enums and timestamps, into typed objects.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_json_deserialization
+'''
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+import json
+import time
+from typing import List, Optional
+from neuroglia.serialization.json import JsonSerializer
+
+
+class BankTransactionType(Enum):
+    DEPOSIT = 'deposit'
+    WITHDRAWAL = 'withdrawal'
+    TRANSFER = 'transfer'
+
+
+@dataclass
+class BankTransactionDto:
+
+    type: BankTransactionType
+
+    amount: Decimal
+
+    created_at: datetime
+
+    to_account_id: Optional[str] = None
+
+
+@dataclass
+class BankAccountDto:
+
+    id: str
+
+    owner_id: str
+
+    owner: str
+
+    balance: Decimal
+
+    created_at: datetime
+
+    transactions: List[BankTransactionDto]
+
+
+def build_documents(document_count: int, transaction_count: int) -> List[str]:
+    created_at = datetime(2024, 1, 1)
+    transaction_types = list(BankTransactionType)
+    return [json.dumps({
+        'id': f'account-{i}',
+        'owner_id': f'owner-{i % 1000}',
+        'owner': f'John Doe {i % 1000}',
+        'balance': 100 + i,
+        'created_at': (created_at + timedelta(minutes=i)).isoformat(),
+        'transactions': [{
+            'type': transaction_types[t % len(transaction_types)].value,
+            'amount': 10 + t,
+            'created_at': (created_at + timedelta(minutes=i, seconds=t)).isoformat(),
+            'to_account_id': f'account-{t}' if t % 3 == 0 else None
+        } for t in range(transaction_count)]
+    }) for i in range(document_count)]
+
+
+def run(document_count: int = 100000, transaction_count: int = 3):
+    serializer = JsonSerializer()
+    documents = build_documents(document_count, transaction_count)
+    started = time.perf_counter()
+    accounts = [serializer.deserialize_from_text(document, BankAccountDto) for document in documents]
+    elapsed = time.perf_counter() - started
+    assert accounts[-1].transactions[0].type == BankTransactionType.DEPOSIT
+    print(f"{document_count} documents, {transaction_count} transactions each")
+    print(f"deserialize_from_text: {elapsed / document_count * 1e6:>8.1f} us/document ({elapsed:.2f}s total)")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,90 @@
+''' Measures the cost of serializing nested aggregates with long transaction lists, comparing the previous JsonEncoder behavior (type checks and attribute filtering for each object) with the encoders compiled per type.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_json_serialization
+'''
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+import json
+import time
+from typing import List
+from neuroglia.serialization.json import JsonEncoder, JsonSerializer
+
+
+class LegacyJsonEncoder(json.JSONEncoder):
+
+    def default(self, obj):
+        if issubclass(type(obj), Enum):
+            return obj.name
+        elif issubclass(type(obj), datetime):
+            return obj.isoformat()
+        elif hasattr(obj, "__dict__"):
+            filtered_dict = {
+                key: value
+                for key, value in obj.__dict__.items()
+                if not key.startswith("_") and value is not None
+            }
+            return filtered_dict
+        try:
+            return super().default(obj)
+        except Exception:
+            return str(obj)
+
+
+class BankTransactionType(Enum):
+    DEPOSIT = 'deposit'
+    WITHDRAWAL = 'withdrawal'
+    TRANSFER = 'transfer'
+
+
+@dataclass
+class BankTransactionV1:
+
+    type: BankTransactionType
+
+    amount: Decimal
+
+    created_at: datetime
+
+
+class BankAccountStateV1:
+
+    def __init__(self, id: str, owner_id: str, transactions: List[BankTransactionV1]):
+        self.id = id
+        self.owner_id = owner_id
+        self.balance = sum((transaction.amount for transaction in transactions), Decimal(0))
+        self.created_at = transactions[0].created_at
+        self.transactions = transactions
+        self._pending_events = []
+
+
+def build_accounts(account_count: int, transaction_count: int) -> List[BankAccountStateV1]:
+    created_at = datetime(2024, 1, 1)
+    transaction_types = list(BankTransactionType)
+    return [BankAccountStateV1(f'account-{i}', f'owner-{i % 100}', [
+        BankTransactionV1(transaction_types[t % len(transaction_types)], Decimal(t) / 4, created_at + timedelta(seconds=t))
+        for t in range(transaction_count)
+    ]) for i in range(account_count)]
+
+
+def measure(encoder_type: type, accounts: List[BankAccountStateV1], runs: int) -> tuple[float, str]:
+    started = time.perf_counter()
+    for _ in range(runs):
+        text = json.dumps(accounts, cls=encoder_type)
+    return (time.perf_counter() - started) / runs, text
+
+
+def run(account_count: int = 100, transaction_count: int = 1000, runs: int = 5):
+    accounts = build_accounts(account_count, transaction_count)
+    legacy, legacy_text = measure(LegacyJsonEncoder, accounts, runs)
+    compiled, compiled_text = measure(JsonEncoder, accounts, runs)
+    assert compiled_text == legacy_text == JsonSerializer().serialize_to_text(accounts)
+    print(f"{account_count} aggregates, {transaction_count} transactions each")
+    print(f"previous encoder:    {legacy * 1e3:>8.1f} ms/payload")
+    print(f"per-type encoders:   {compiled * 1e3:>8.1f} ms/payload")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,52 @@
+''' Compares the cost of dispatching a request when every registered handler is built and reflected over (previous behavior) versus using the mediator's routing table, for an increasing amount of registered handlers.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_mediator_dispatch
+'''
+import asyncio
+import time
+import types
+from neuroglia.core import OperationResult
+from neuroglia.dependency_injection.service_provider import ServiceCollection
+from neuroglia.mediation.mediator import Command, CommandHandler, Mediator, RequestHandler
+
+
+async def handle_async(self, command):
+    return self.ok()
+
+
+def build_mediator(count: int):
+    services = ServiceCollection()
+    services.add_singleton(Mediator)
+    command_types = list()
+    for i in range(count):
+        command_type = types.new_class(f'Command{i}', (Command[OperationResult],))
+        handler_type = types.new_class(f'Command{i}Handler', (CommandHandler[command_type, OperationResult],), exec_body=lambda ns: ns.update(handle_async=handle_async))
+        services.add_transient(RequestHandler, handler_type)
+        command_types.append(command_type)
+    provider = services.build()
+    return provider, provider.get_required_service(Mediator), command_types[-1]()
+
+
+async def scan_async(provider, mediator: Mediator, command):
+    handler = next(candidate for candidate in provider.get_services(RequestHandler) if mediator._request_handler_matches(candidate, command))
+    return await handler.handle_async(command)
+
+
+async def run_async(iterations: int = 200):
+    print(f"{'handlers':>9} | {'scan (us)':>12} | {'routed (us)':>12}")
+    for count in [10, 100, 1000]:
+        provider, mediator, command = build_mediator(count)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await scan_async(provider, mediator, command)
+        scan = (time.perf_counter() - started) / iterations * 1e6
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await mediator.execute_async(command)
+        routed = (time.perf_counter() - started) / iterations * 1e6
+        print(f"{count:>9} | {scan:>12.1f} | {routed:>12.1f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(run_async())
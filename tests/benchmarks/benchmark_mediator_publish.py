@@ -0,0 +1,53 @@
+''' Measures the notification fan-out cost while replaying a stream of domain events, comparing the previous behavior (building and matching every registered notification handler for each event) with the mediator's cached fan-out table.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_mediator_publish
+'''
+import asyncio
+import time
+import types
+from neuroglia.data.abstractions import DomainEvent
+from neuroglia.dependency_injection.service_provider import ServiceCollection
+from neuroglia.mediation.mediator import DomainEventHandler, Mediator, NotificationHandler
+
+
+async def handle_async(self, e):
+    pass
+
+
+def build_mediator(handler_count: int):
+    services = ServiceCollection()
+    services.add_singleton(Mediator)
+    event_types = list()
+    for i in range(handler_count):
+        event_type = types.new_class(f'Event{i}DomainEventV1', (DomainEvent[str],))
+        handler_type = types.new_class(f'Event{i}Handler', (DomainEventHandler[event_type],), exec_body=lambda ns: ns.update(handle_async=handle_async))
+        services.add_transient(NotificationHandler, handler_type)
+        event_types.append(event_type)
+    provider = services.build()
+    return provider, provider.get_required_service(Mediator), event_types
+
+
+async def scan_async(provider, mediator: Mediator, e):
+    handlers = [candidate for candidate in provider.get_services(NotificationHandler) if mediator._notification_handler_matches(candidate, type(e))]
+    await asyncio.gather(*(handler.handle_async(e) for handler in handlers))
+
+
+async def run_async(event_count: int = 100000, handler_count: int = 50, scan_event_count: int = 5000):
+    provider, mediator, event_types = build_mediator(handler_count)
+    events = [event_types[i % handler_count](str(i)) for i in range(event_count)]
+    started = time.perf_counter()
+    for e in events[:scan_event_count]:
+        await scan_async(provider, mediator, e)
+    scan = (time.perf_counter() - started) / scan_event_count
+    started = time.perf_counter()
+    for e in events:
+        await mediator.publish_async(e)
+    cached = (time.perf_counter() - started) / event_count
+    print(f"{handler_count} handlers, {event_count} events replayed")
+    print(f"build and match every handler: {scan * 1e6:>8.1f} us/event (estimated {scan * event_count:.1f}s for the full replay, measured on {scan_event_count} events)")
+    print(f"cached fan-out table:          {cached * 1e6:>8.1f} us/event ({cached * event_count:.1f}s for the full replay)")
+
+
+if __name__ == '__main__':
+    asyncio.run(run_async())
@@ -0,0 +1,31 @@
+''' Measures the latency of equality and range queries on in-memory repositories of increasing size, with and without an index on the filtered field.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_memory_queries
+'''
+import asyncio
+import timeit
+from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
+from tests.data import IndexedUserDto, UserDto
+
+
+async def measure_async(repository: MemoryRepository, count: int, iterations: int):
+    await repository.add_many_async([repository._get_entity_type()(str(i), f'name_{i:08d}', f'email_{i}') for i in range(count)])
+    query = await repository.query_async()
+    name = f'name_{count // 2:08d}'
+    lower = f'name_{count - 10:08d}'
+    equality = timeit.timeit(lambda: query.where(lambda u: u.name == name).to_list(), number=iterations) / iterations * 1e6
+    scan = timeit.timeit(lambda: query.where(lambda u: u.name >= lower).to_list(), number=iterations) / iterations * 1e6
+    return equality, scan
+
+
+async def run_async(iterations: int = 100):
+    print(f"{'entities':>10} | {'equality, scan (us)':>20} | {'equality, index (us)':>21} | {'range, scan (us)':>17} | {'range, index (us)':>18}")
+    for count in [1000, 10000, 100000]:
+        scanned_equality, scanned_range = await measure_async(MemoryRepository[UserDto, str](), count, iterations)
+        indexed_equality, indexed_range = await measure_async(MemoryRepository[IndexedUserDto, str](), count, iterations)
+        print(f"{count:>10} | {scanned_equality:>20.1f} | {indexed_equality:>21.1f} | {scanned_range:>17.1f} | {indexed_range:>18.1f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(run_async())
@@ -0,0 +1,40 @@
+''' Measures the time it takes to load documents into Mongo, comparing one add_async call per document, which costs a round trip each, with a single add_many_async call, whose inserts are batched by the driver.
+
+    Requires a running Mongo server, whose connection string can be set using the MONGO_CONNECTION_STRING environment variable.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_mongo_bulk_write
+'''
+import asyncio
+import os
+import time
+from uuid import uuid4
+from pymongo import MongoClient
+from neuroglia.data.infrastructure.mongo.mongo_repository import MongoRepository, MongoRepositoryOptions
+from neuroglia.serialization.json import JsonSerializer
+from tests.data import UserDto
+
+
+async def run_async(document_count: int = 100_000, sample_count: int = 5_000):
+    connection_string = os.getenv('MONGO_CONNECTION_STRING', 'mongodb://localhost:27099')
+    database_name = f'benchmark_{uuid4().hex}'
+    mongo_client = MongoClient(connection_string)
+    repository = MongoRepository[UserDto, str](MongoRepositoryOptions[UserDto, str](database_name), mongo_client, JsonSerializer())
+    try:
+        users = [UserDto(str(uuid4()), f'John Doe {i}', f'john.doe.{i}@email.com') for i in range(document_count)]
+        started = time.perf_counter()
+        for user in users[:sample_count]:
+            await repository.add_async(user)
+        one_by_one = (time.perf_counter() - started) / sample_count * document_count
+        started = time.perf_counter()
+        await repository.add_many_async(users[sample_count:], ordered=False)
+        bulk = (time.perf_counter() - started) / (document_count - sample_count) * document_count
+        print(f"{document_count} documents")
+        print(f"add_async, one by one (extrapolated from {sample_count}): {one_by_one:>8.1f} s")
+        print(f"add_many_async:                                  {bulk:>8.1f} s")
+    finally:
+        mongo_client.drop_database(database_name)
+
+
+if __name__ == '__main__':
+    asyncio.run(run_async())
@@ -0,0 +1,76 @@
+''' Measures request latency and event loop responsiveness when 500 concurrent clients read from Mongo, comparing the MongoRepository, which runs blocking driver calls on the event loop, with the AsyncMongoRepository, which runs them on a bounded pool of threads.
+
+    Requires a running Mongo server, whose connection string can be set using the MONGO_CONNECTION_STRING environment variable.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_mongo_concurrency
+'''
+import asyncio
+import os
+import statistics
+import time
+from typing import List
+from uuid import uuid4
+from pymongo import MongoClient
+from neuroglia.data.infrastructure.mongo.mongo_repository import AsyncMongoRepository, MongoExecutor, MongoRepository, MongoRepositoryOptions
+from neuroglia.serialization.json import JsonSerializer
+from tests.data import UserDto
+
+
+def percentile(values: List[float], percent: int) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def measure_async(repository: MongoRepository, ids: List[str], client_count: int, rounds: int):
+    latencies = list[float]()
+    lags = list[float]()
+    running = True
+
+    async def heartbeat_async():
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - started - 0.001)
+
+    async def client_async(i: int, round_started: float):
+        await repository.get_async(ids[i % len(ids)])
+        latencies.append(time.perf_counter() - round_started)
+
+    heartbeat = asyncio.create_task(heartbeat_async())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        round_started = time.perf_counter()
+        await asyncio.gather(*(client_async(i, round_started) for i in range(client_count)))
+    elapsed = time.perf_counter() - started
+    running = False
+    await heartbeat
+    return elapsed, latencies, lags
+
+
+async def run_async(client_count: int = 500, rounds: int = 10, document_count: int = 1000):
+    connection_string = os.getenv('MONGO_CONNECTION_STRING', 'mongodb://localhost:27099')
+    database_name = f'benchmark_{uuid4().hex}'
+    mongo_client = MongoClient(connection_string)
+    options = MongoRepositoryOptions[UserDto, str](database_name)
+    serializer = JsonSerializer()
+    executor = MongoExecutor()
+    try:
+        repositories = {
+            'MongoRepository': MongoRepository[UserDto, str](options, mongo_client, serializer),
+            'AsyncMongoRepository': AsyncMongoRepository[UserDto, str](options, mongo_client, serializer, executor)
+        }
+        ids = [str(uuid4()) for _ in range(document_count)]
+        for id in ids:
+            await repositories['AsyncMongoRepository'].add_async(UserDto(id, 'John Doe', 'john.doe@email.com'))
+        print(f"{client_count} concurrent clients, {rounds} rounds")
+        for name, repository in repositories.items():
+            elapsed, latencies, lags = await measure_async(repository, ids, client_count, rounds)
+            print(f"{name:<22} {client_count * rounds / elapsed:>8.0f} requests/s | latency p50 {percentile(latencies, 50) * 1e3:>7.1f} ms, p99 {percentile(latencies, 99) * 1e3:>7.1f} ms | event loop lag max {max(lags, default=0) * 1e3:>7.1f} ms, mean {statistics.fmean(lags) * 1e3 if lags else 0:>5.1f} ms")
+    finally:
+        executor.dispose()
+        mongo_client.drop_database(database_name)
+
+
+if __name__ == '__main__':
+    asyncio.run(run_async())
@@ -0,0 +1,82 @@
+''' Measures the client-side cost of Mongo reads and writes for documents with hundreds of nested transactions, comparing the previous JSON round trip with the BSON-native entity codec. BSON encoding and decoding, as performed by the driver, are included in both measurements.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_mongo_entity_codec
+'''
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+import time
+from typing import List
+import bson
+from neuroglia.data.infrastructure.mongo.mongo_entity_codec import MongoEntityCodec
+from neuroglia.serialization.json import JsonSerializer
+
+
+class BankTransactionType(Enum):
+    DEPOSIT = 'DEPOSIT'
+    WITHDRAWAL = 'WITHDRAWAL'
+    TRANSFER = 'TRANSFER'
+
+
+@dataclass
+class BankTransactionDto:
+
+    type: BankTransactionType
+
+    amount: Decimal
+
+    created_at: datetime
+
+
+@dataclass
+class BankAccountDto:
+
+    id: str
+
+    owner_id: str
+
+    owner: str
+
+    balance: Decimal
+
+    transactions: List[BankTransactionDto]
+
+
+def build_accounts(account_count: int, transaction_count: int) -> List[BankAccountDto]:
+    created_at = datetime(2024, 1, 1)
+    transaction_types = list(BankTransactionType)
+    return [BankAccountDto(f'account-{i}', f'owner-{i}', f'John Doe {i}', Decimal(i), [
+        BankTransactionDto(transaction_types[t % len(transaction_types)], Decimal(t) / 4, created_at + timedelta(seconds=t))
+        for t in range(transaction_count)
+    ]) for i in range(account_count)]
+
+
+def measure(action, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        action(item)
+    return (time.perf_counter() - started) / len(items)
+
+
+def run(account_count: int = 200, transaction_count: int = 500):
+    serializer = JsonSerializer()
+    codec = MongoEntityCodec()
+    accounts = build_accounts(account_count, transaction_count)
+    json_documents = [bson.encode(serializer.deserialize_from_text(serializer.serialize_to_text(account), dict)) for account in accounts]
+    bson_documents = [bson.encode(codec.encode(account)) for account in accounts]
+    json_write = measure(lambda account: bson.encode(serializer.deserialize_from_text(serializer.serialize_to_text(account), dict)), accounts)
+    bson_write = measure(lambda account: bson.encode(codec.encode(account)), accounts)
+    json_read = measure(lambda document: serializer.deserialize_from_text(serializer.serialize(bson.decode(document)), BankAccountDto), json_documents)
+    bson_read = measure(lambda document: codec.decode(bson.decode(document), BankAccountDto), bson_documents)
+    assert codec.decode(bson.decode(bson_documents[0]), BankAccountDto) == accounts[0]
+    print(f"{account_count} documents, {transaction_count} transactions each")
+    print(f"write, JSON round trip:    {json_write * 1e3:>8.2f} ms/document")
+    print(f"write, entity codec:       {bson_write * 1e3:>8.2f} ms/document")
+    print(f"read, JSON round trip:     {json_read * 1e3:>8.2f} ms/document")
+    print(f"read, entity codec:        {bson_read * 1e3:>8.2f} ms/document")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,47 @@
+''' Measures the cost of getting the first and the last pages of a large read model, comparing offset pagination (skip/take), whose cost grows with the offset, with keyset pagination (to_page and continuation tokens), whose cost does not.
+
+    Requires a running Mongo server, whose connection string can be set using the MONGO_CONNECTION_STRING environment variable.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_mongo_paging
+'''
+import asyncio
+import os
+import time
+from uuid import uuid4
+from pymongo import MongoClient
+from neuroglia.data.infrastructure.mongo.mongo_repository import MongoRepository, MongoRepositoryOptions
+from neuroglia.serialization.json import JsonSerializer
+from tests.data import UserDto
+
+
+def measure(action, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        action()
+    return (time.perf_counter() - started) / runs
+
+
+async def run_async(document_count: int = 200_000, limit: int = 50, runs: int = 20):
+    connection_string = os.getenv('MONGO_CONNECTION_STRING', 'mongodb://localhost:27099')
+    database_name = f'benchmark_{uuid4().hex}'
+    mongo_client = MongoClient(connection_string)
+    repository = MongoRepository[UserDto, str](MongoRepositoryOptions[UserDto, str](database_name), mongo_client, JsonSerializer())
+    try:
+        await repository.add_many_async([UserDto(f'{i:08d}', f'John Doe {i}', f'john.doe.{i}@email.com') for i in range(document_count)], ordered=False)
+        query = (await repository.query_async()).order_by(lambda u: u.id)
+        last_offset = document_count - limit
+        # The token of the last page is the one returned with the page that precedes it
+        previous_page_id = f'{last_offset - limit:08d}'
+        last_page_token = query.where(lambda u: u.id >= previous_page_id).to_page(limit).next_token
+        print(f"{document_count} documents, {limit} per page")
+        print(f"first page, skip/take:      {measure(lambda: query.skip(0).take(limit).to_list(), runs) * 1e3:>8.2f} ms")
+        print(f"last page, skip/take:       {measure(lambda: query.skip(last_offset).take(limit).to_list(), runs) * 1e3:>8.2f} ms")
+        print(f"first page, keyset:         {measure(lambda: query.to_page(limit), runs) * 1e3:>8.2f} ms")
+        print(f"last page, keyset:          {measure(lambda: query.to_page(limit, last_page_token), runs) * 1e3:>8.2f} ms")
+    finally:
+        mongo_client.drop_database(database_name)
+
+
+if __name__ == '__main__':
+    asyncio.run(run_async())
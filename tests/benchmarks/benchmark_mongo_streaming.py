@@ -0,0 +1,53 @@
+''' Measures the peak memory allocated while exporting a large read model, comparing Queryable.to_list, which materializes every document at once, with async iteration, which fetches documents in batches.
+
+    Requires a running Mongo server, whose connection string can be set using the MONGO_CONNECTION_STRING environment variable.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_mongo_streaming
+'''
+import asyncio
+import os
+import time
+import tracemalloc
+from uuid import uuid4
+from pymongo import MongoClient
+from neuroglia.data.infrastructure.mongo.mongo_repository import MongoRepository, MongoRepositoryOptions
+from neuroglia.serialization.json import JsonSerializer
+from tests.data import UserDto
+
+
+async def export_async(query, streamed: bool, batch_size: int) -> tuple[int, float, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = 0
+    if streamed:
+        async for _ in query.to_async_iter(batch_size=batch_size):
+            count += 1
+    else:
+        for _ in query.to_list():
+            count += 1
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+async def run_async(document_count: int = 200_000, batch_size: int = 1000):
+    connection_string = os.getenv('MONGO_CONNECTION_STRING', 'mongodb://localhost:27099')
+    database_name = f'benchmark_{uuid4().hex}'
+    mongo_client = MongoClient(connection_string)
+    repository = MongoRepository[UserDto, str](MongoRepositoryOptions[UserDto, str](database_name), mongo_client, JsonSerializer())
+    try:
+        await repository.add_many_async([UserDto(str(uuid4()), f'John Doe {i}', f'john.doe.{i}@email.com') for i in range(document_count)], ordered=False)
+        query = await repository.query_async()
+        print(f"{document_count} documents")
+        for name, streamed in (('to_list', False), (f'to_async_iter({batch_size})', True)):
+            count, elapsed, peak = await export_async(query, streamed, batch_size)
+            assert count == document_count
+            print(f"{name:<22} {elapsed:>7.2f} s | peak memory {peak / 2**20:>8.1f} MiB")
+    finally:
+        mongo_client.drop_database(database_name)
+
+
+if __name__ == '__main__':
+    asyncio.run(run_async())
@@ -0,0 +1,31 @@
+''' Measures the cost of building queries from lambdas, when their parsed expressions are cached by code object and when they are parsed on every call.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_queryable_expressions
+'''
+import timeit
+from neuroglia.data import queryable as queryable_module
+from neuroglia.data.queryable import Queryable
+from tests.data import UserDto
+from tests.services import RecordingQueryProvider
+
+
+def build_query(queryable: Queryable[UserDto], name: str, email: str):
+    return queryable.where(lambda u: u.name == name and u.email != email).order_by(lambda u: u.email)
+
+
+def build_query_uncached(queryable: Queryable[UserDto], name: str, email: str):
+    queryable_module._lambda_expressions.clear()
+    return build_query(queryable, name, email)
+
+
+def run(iterations: int = 10000):
+    queryable = Queryable[UserDto](RecordingQueryProvider())
+    uncached = timeit.timeit(lambda: build_query_uncached(queryable, 'John Doe', 'john.doe@email.com'), number=iterations) / iterations * 1e6
+    cached = timeit.timeit(lambda: build_query(queryable, 'John Doe', 'john.doe@email.com'), number=iterations) / iterations * 1e6
+    print(f"{'parsed on every call':<22} {uncached:>10.1f} us/query")
+    print(f"{'cached by code object':<22} {cached:>10.1f} us/query ({uncached / cached:.0f}x)")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,42 @@
+''' Measures the latency of service resolution against containers of increasing size.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_service_provider
+'''
+import timeit
+from typing import Generic, TypeVar
+from neuroglia.dependency_injection.service_provider import ServiceCollection, ServiceDescriptor, ServiceLifetime
+
+T = TypeVar('T')
+
+
+class Service(Generic[T]):
+    pass
+
+
+class Dependency:
+    pass
+
+
+def build_services(count: int):
+    services = ServiceCollection()
+    for i in range(count):
+        entity_type = type(f'Entity{i}', (object,), {})
+        services.try_add_singleton(Service[entity_type], singleton=Service[entity_type]())
+    services.append(ServiceDescriptor(Dependency, Dependency, lifetime=ServiceLifetime.TRANSIENT))
+    return services
+
+
+def run(iterations: int = 10000):
+    print(f"{'descriptors':>12} | {'try_add (us)':>12} | {'get_service (us)':>16} | {'miss (us)':>10}")
+    for count in [10, 100, 1000, 5000]:
+        services = build_services(count)
+        provider = services.build()
+        registration = timeit.timeit(lambda: services.try_add_singleton(Dependency), number=iterations) / iterations * 1e6
+        resolution = timeit.timeit(lambda: provider.get_service(Dependency), number=iterations) / iterations * 1e6
+        miss = timeit.timeit(lambda: provider.get_service(ServiceCollection), number=iterations) / iterations * 1e6
+        print(f"{count:>12} | {registration:>12.3f} | {resolution:>16.3f} | {miss:>10.3f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,27 @@
+''' Compares the throughput of transient service resolution when reflecting over the implementation type on every construction (previous behavior) versus reusing a compiled activation plan.
+
+    Usage:
+        PYTHONPATH=./src python -m tests.benchmarks.benchmark_transient_activation
+'''
+import timeit
+from neuroglia.data.infrastructure.abstractions import Repository
+from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
+from neuroglia.data.queries.generic import GetByIdQueryHandler
+from neuroglia.dependency_injection.service_provider import ServiceActivationPlan, ServiceCollection
+from tests.data import UserDto
+
+
+def run(iterations: int = 20000):
+    services = ServiceCollection()
+    services.add_singleton(Repository[UserDto, str], MemoryRepository[UserDto, str])
+    services.add_transient(GetByIdQueryHandler[UserDto, str])
+    provider = services.build()
+    implementation_type = GetByIdQueryHandler[UserDto, str]
+    reflected = timeit.timeit(lambda: ServiceActivationPlan.compile(implementation_type).activate(provider, implementation_type), number=iterations)
+    compiled = timeit.timeit(lambda: provider.get_service(implementation_type), number=iterations)
+    print(f"reflection per construction: {iterations / reflected:>10.0f} ops/s")
+    print(f"compiled activation plan:    {iterations / compiled:>10.0f} ops/s ({reflected / compiled:.1f}x)")
+
+
+if __name__ == '__main__':
+    run()
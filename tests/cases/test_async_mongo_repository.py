@@ -0,0 +1,93 @@
+import threading
+from uuid import uuid4
+from pymongo import MongoClient
+import pytest
+from neuroglia.data.infrastructure.abstractions import QueryableRepository, Repository
+from neuroglia.data.infrastructure.mongo.mongo_repository import AsyncMongoRepository, MongoExecutor, MongoRepositoryOptions
+from neuroglia.dependency_injection.service_provider import ServiceCollection, ServiceProvider
+from neuroglia.serialization.json import JsonSerializer
+
+from tests.data import UserDto
+
+
+class TestAsyncMongoRepository:
+
+    _mongo_database_name = 'test'
+
+    _service_provider: ServiceProvider
+    _mongo_client: MongoClient
+    _repository: QueryableRepository[UserDto, str]
+
+    @pytest.mark.asyncio
+    async def test_add_get_remove_should_work(self):
+        # arrange
+        self._setup()
+        user = UserDto(str(uuid4()), 'John Doe', 'john.doe@email.com')
+
+        # act
+        await self._repository.add_async(user)
+        result = await self._repository.get_async(user.id)
+        await self._repository.remove_async(user.id)
+        exists = await self._repository.contains_async(user.id)
+
+        # assert
+        assert isinstance(self._repository, AsyncMongoRepository)
+        assert result is not None, f"failed to find the user with the specified id '{user.id}'"
+        assert vars(result) == vars(user)
+        assert not exists, f"expected the user with the specified id '{user.id}' to be removed"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_should_run_outside_of_event_loop(self):
+        # arrange
+        self._setup()
+        await self._repository.add_many_async([UserDto(str(i), f'name_{i}', f'email_{i}') for i in range(5)])
+        query = await self._repository.query_async()
+        compiled_query = await self._repository.compile_query_async(lambda q, name: q.where(lambda u: u.name == name))
+        thread_names = list[str]()
+        executor = self._service_provider.get_required_service(MongoExecutor)
+        run_async = executor.run_async
+
+        def record(operation, *args):
+            thread_names.append(threading.current_thread().name)
+            return operation(*args)
+
+        executor.run_async = lambda operation, *args: run_async(record, operation, *args)
+
+        # act
+        users = await query.where(lambda u: u.name != 'name_0').order_by(lambda u: u.name).to_list_async()
+        page = await query.order_by(lambda u: u.name).to_page_async(3)
+        next_page = await query.order_by(lambda u: u.name).to_page_async(3, page.next_token)
+        named_users = await compiled_query.to_list_async(name='name_1')
+
+        # assert
+        assert [user['id'] for user in users] == ['1', '2', '3', '4'], f"unexpected users {[user['id'] for user in users]}"
+        assert [user['id'] for user in page.items + next_page.items] == ['0', '1', '2', '3', '4'], "expected the pages to contain all users"
+        assert [user['id'] for user in named_users] == ['1'], f"unexpected users {[user['id'] for user in named_users]}"
+        assert len(thread_names) == 4 and all(name.startswith('mongo') for name in thread_names), f"expected the queries to run on the threads of the Mongo executor, got {thread_names} instead"
+
+        # clean
+        self._teardown()
+
+    def _setup(self) -> None:
+        self._service_provider = TestAsyncMongoRepository._build_services()
+        self._mongo_client = self._service_provider.get_required_service(MongoClient)
+        self._repository = self._service_provider.get_required_service(QueryableRepository[UserDto, str])
+
+    @staticmethod
+    def _build_services() -> ServiceProvider:
+        connection_string = 'mongodb://localhost:27099'
+        services = ServiceCollection()
+        services.add_singleton(JsonSerializer)
+        services.add_singleton(MongoExecutor)
+        services.add_singleton(MongoRepositoryOptions[UserDto, str], singleton=MongoRepositoryOptions[UserDto, str](TestAsyncMongoRepository._mongo_database_name))
+        services.add_singleton(MongoClient, singleton=MongoClient(connection_string))
+        services.add_singleton(Repository[UserDto, str], AsyncMongoRepository[UserDto, str])
+        services.add_singleton(QueryableRepository[UserDto, str], implementation_factory=lambda provider: provider.get_required_service(Repository[UserDto, str]))
+        return services.build()
+
+    def _teardown(self):
+        self._mongo_client.drop_database(TestAsyncMongoRepository._mongo_database_name)
+        self._service_provider.dispose()
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from neuroglia.data.infrastructure.abstractions import QueryableRepository, Repository
+from neuroglia.data.infrastructure.caching.caching_repository import CachingRepository, CachingRepositoryOptions
+from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
+from neuroglia.dependency_injection.service_provider import ServiceCollection
+from neuroglia.hosting.abstractions import ApplicationBuilder
+
+from tests.data import UserDto, VersionedUserDto
+from tests.services import SlowMemoryRepository
+
+
+class TestCachingRepository:
+
+    @pytest.mark.asyncio
+    async def test_get_should_be_served_from_cache(self):
+        # arrange
+        inner_repository = SlowMemoryRepository[UserDto, str]()
+        inner_repository.delay = 0
+        await inner_repository.add_async(UserDto('1', 'John Doe', 'john.doe@email.com'))
+        repository = CachingRepository[UserDto, str](inner_repository, CachingRepositoryOptions())
+
+        # act
+        user = await repository.get_async('1')
+        user.name = 'Jane Doe'
+        cached_user = await repository.get_async('1')
+        missing_user = await repository.get_async('2')
+        cached_missing_user = await repository.get_async('2')
+
+        # assert
+        assert cached_user == UserDto('1', 'John Doe', 'john.doe@email.com'), f"expected the cached user not to have been modified, got {cached_user} instead"
+        assert missing_user is None and cached_missing_user is None, "expected the missing user not to be found"
+        assert inner_repository.get_count == 2, f"expected 2 lookups to reach the decorated repository, got {inner_repository.get_count} instead"
+        assert (repository.hits, repository.misses) == (2, 2), f"expected 2 hits and 2 misses, got {(repository.hits, repository.misses)} instead"
+
+    @pytest.mark.asyncio
+    async def test_modifications_should_invalidate_cache(self):
+        # arrange
+        repository = CachingRepository[UserDto, str](MemoryRepository[UserDto, str](), CachingRepositoryOptions())
+        await repository.get_async('1')
+
+        # act
+        await repository.add_async(UserDto('1', 'John Doe', 'john.doe@email.com'))
+        added_user = await repository.get_async('1')
+        await repository.update_async(UserDto('1', 'Jane Doe', 'jane.doe@email.com'))
+        updated_user = await repository.get_async('1')
+        await repository.remove_async('1')
+        removed_user = await repository.get_async('1')
+
+        # assert
+        assert added_user.name == 'John Doe', f"expected the negative lookup to have been invalidated, got {added_user} instead"
+        assert updated_user.name == 'Jane Doe', f"expected the updated user, got {updated_user} instead"
+        assert removed_user is None, f"expected the removed user not to be found, got {removed_user} instead"
+
+    @pytest.mark.asyncio
+    async def test_entries_should_be_evicted_and_expire(self):
+        # arrange
+        inner_repository = SlowMemoryRepository[UserDto, str]()
+        inner_repository.delay = 0
+        await inner_repository.add_many_async([UserDto(str(i), f'name_{i}', f'email_{i}') for i in range(3)])
+        repository = CachingRepository[UserDto, str](inner_repository, CachingRepositoryOptions(capacity=2, time_to_live=0.05))
+
+        # act
+        for id in ['0', '1', '0', '2', '0', '1']:
+            await repository.get_async(id)
+        evicted_get_count = inner_repository.get_count
+        await asyncio.sleep(0.1)
+        await repository.get_async('0')
+
+        # assert
+        assert evicted_get_count == 4, f"expected the least recently used user to have been evicted, got {evicted_get_count} lookups instead"
+        assert repository.evictions == 2, f"expected 2 evictions, got {repository.evictions} instead"
+        assert inner_repository.get_count == 5, "expected the expired entry to have been looked up again"
+
+    @pytest.mark.asyncio
+    async def test_lookups_concurrent_with_updates_should_not_be_cached(self):
+        # arrange
+        inner_repository = SlowMemoryRepository[VersionedUserDto, str]()
+        await inner_repository.add_async(VersionedUserDto('1', 'John Doe', 1))
+        repository = CachingRepository[VersionedUserDto, str](inner_repository, CachingRepositoryOptions())
+
+        # act
+        pending_lookup = asyncio.create_task(repository.get_async('1'))
+        await asyncio.sleep(0)
+        await repository.update_async(VersionedUserDto('1', 'Jane Doe', 2))
+        stale_user = await pending_lookup
+        user = await repository.get_async('1')
+        repository._put('1', VersionedUserDto('1', 'John Doe', 1), repository._generation)
+        cached_user = await repository.get_async('1')
+
+        # assert
+        assert stale_user.name == 'John Doe', "expected the pending lookup to have returned the user as it was when it started"
+        assert user.name == 'Jane Doe', f"expected the stale user not to have been cached, got {user} instead"
+        assert cached_user.state_version == 2, f"expected the older version not to have replaced the cached one, got {cached_user} instead"
+
+    def test_configure_should_decorate_configured_repository(self):
+        # arrange
+        builder = ApplicationBuilder()
+        builder.services = ServiceCollection()
+        MemoryRepository.configure(builder, UserDto, str)
+
+        # act
+        CachingRepository.configure(builder, UserDto, str, CachingRepositoryOptions(capacity=10))
+        provider = builder.services.build()
+        repository = provider.get_required_service(Repository[UserDto, str])
+
+        # assert
+        assert isinstance(repository, CachingRepository), f"expected a caching repository, got {type(repository).__name__} instead"
+        assert isinstance(repository._repository, MemoryRepository), f"expected the memory repository to be decorated, got {type(repository._repository).__name__} instead"
+        assert provider.get_required_service(QueryableRepository[UserDto, str]) is repository, "expected the queryable repository to be the caching repository"
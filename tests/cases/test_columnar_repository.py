@@ -0,0 +1,136 @@
+from decimal import Decimal
+import pytest
+
+# The columnar repository requires the optional 'columnar' extra
+pytest.importorskip("numpy")
+
+from neuroglia.data.infrastructure.columnar.columnar_repository import ColumnarRepository
+
+from tests.data import AccountDto, OrderDto, UserDto
+
+
+class TestColumnarRepository:
+
+    @pytest.mark.asyncio
+    async def test_add_get_update_remove_should_work(self):
+        # arrange
+        repository = ColumnarRepository[OrderDto, str]()
+        orders = [OrderDto(str(i), f'customer_{i % 3}', i, i * 1.5) for i in range(2000)]
+        await repository.add_many_async(orders)
+
+        # act
+        await repository.remove_async('0')
+        order = await repository.get_async('1999')
+        order.quantity = 1
+        order.shipped = True
+        await repository.update_async(order)
+        updated_order = await repository.get_async('1999')
+        partial_order = await repository.get_async('5', ['amount'])
+
+        # assert
+        assert not await repository.contains_async('0'), "expected the order to have been removed"
+        assert updated_order == OrderDto('1999', 'customer_1', 1, 1999 * 1.5, True), f"unexpected order {updated_order}"
+        assert (partial_order.id, partial_order.amount, hasattr(partial_order, 'customer_id')) == ('5', 7.5, False), f"expected a partial order, got {vars(partial_order)} instead"
+
+    @pytest.mark.asyncio
+    async def test_query_should_work(self):
+        # arrange
+        repository = ColumnarRepository[UserDto, str]()
+        await repository.add_many_async([UserDto(str(i), f'name_{i % 3}', f'email_{i}') for i in range(10)])
+        query = await repository.query_async()
+
+        # act
+        users = query.where(lambda u: u.name != 'name_0').order_by(lambda u: u.name).order_by_descending(lambda u: u.email).skip(1).take(3).to_list()
+        count = query.where(lambda u: u.email.startswith('email_1') and u.name == 'name_1').count()
+        user = query.first_or_default(lambda u: u.email == 'email_4')
+
+        # assert
+        assert [user.email for user in users] == ['email_4', 'email_1', 'email_8'], f"unexpected users {[user.email for user in users]}"
+        assert count == 1, f"expected 1 user, got {count} instead"
+        assert user.id == '4', f"expected the user with id '4', got '{user}' instead"
+
+    @pytest.mark.asyncio
+    async def test_query_native_columns_should_work(self):
+        # arrange
+        repository = ColumnarRepository[OrderDto, str]()
+        await repository.add_many_async([OrderDto(str(i), f'customer_{i % 3}', i, i * 1.5, i % 2 == 0 if i < 6 else None) for i in range(10)])
+        query = await repository.query_async()
+
+        # act
+        ids = query.where(lambda o: 2 <= o.quantity < 8 and (o.shipped or o.amount > 9) and o.customer_id in ['customer_0', 'customer_1']).select(lambda o: [o.id]).to_list()
+        unshipped_ids = query.where(lambda o: o.shipped is None or not o.shipped).select(lambda o: [o.id]).to_list()
+        total = query.where(lambda o: o.customer_id == 'customer_1').sum(lambda o: o.quantity)
+        largest = query.max(lambda o: o.amount)
+        totals = query.where(lambda o: o.quantity >= 8).group_by(lambda o: o.quantity).select(lambda g: {'quantity': g.key, 'total': g.sum(lambda o: o.amount)}).to_list()
+        latest = query.order_by_descending(lambda o: o.shipped).order_by(lambda o: o.amount).select(lambda o: [o.id]).to_list()
+
+        # assert
+        assert [order.id for order in ids] == ['4', '7'], f"unexpected orders {[order.id for order in ids]}"
+        assert [order.id for order in unshipped_ids] == ['1', '3', '5', '6', '7', '8', '9'], f"unexpected orders {[order.id for order in unshipped_ids]}"
+        assert total == 12 and isinstance(total, int), f"expected a total of 12, got {total!r} instead"
+        assert largest == 13.5, f"expected a maximum of 13.5, got {largest!r} instead"
+        assert totals == [{'quantity': 8, 'total': 12.0}, {'quantity': 9, 'total': 13.5}], f"unexpected totals {totals}"
+        assert [order.id for order in latest] == ['0', '2', '4', '1', '3', '5', '6', '7', '8', '9'], f"unexpected order {[order.id for order in latest]}"
+
+    @pytest.mark.asyncio
+    async def test_query_group_by_should_work(self):
+        # arrange
+        repository = ColumnarRepository[AccountDto, str]()
+        await repository.add_many_async([AccountDto(str(i), f'owner_{i % 2}', Decimal(i) / 10) for i in range(5)])
+        query = await repository.query_async()
+
+        # act
+        balances = query.group_by(lambda a: a.owner_id).select(lambda g: {'owner_id': g.key, 'total': g.sum(lambda a: a.balance), 'count': g.count(), 'lowest': g.min(lambda a: a.balance)}).to_list()
+
+        # assert
+        assert balances == [{'owner_id': 'owner_0', 'total': Decimal('0.6'), 'count': 3, 'lowest': Decimal('0')}, {'owner_id': 'owner_1', 'total': Decimal('0.4'), 'count': 2, 'lowest': Decimal('0.1')}], f"unexpected balances {balances}"
+
+    @pytest.mark.asyncio
+    async def test_assigning_other_types_to_native_columns_should_preserve_values(self):
+        # arrange
+        repository = ColumnarRepository[OrderDto, str]()
+        await repository.add_async(OrderDto('1', 'customer_1', 1, 1.5))
+
+        # act
+        await repository.add_async(OrderDto('2', 'customer_1', 2 ** 70, Decimal('2.25')))
+        query = await repository.query_async()
+        orders = query.where(lambda o: o.quantity > 1).to_list()
+
+        # assert
+        assert [(order.quantity, order.amount) for order in orders] == [(2 ** 70, Decimal('2.25'))], f"unexpected orders {orders}"
+
+    @pytest.mark.asyncio
+    async def test_query_with_invalid_predicate_should_fail(self):
+        # arrange
+        repository = ColumnarRepository[UserDto, str]()
+        await repository.add_async(UserDto('1', 'John Doe', 'john.doe@email.com'))
+        query = await repository.query_async()
+
+        # act & assert
+        with pytest.raises(TypeError):
+            query.where(lambda u: u.name.startswith(1)).to_list()
+        with pytest.raises(AttributeError, match="no stored attribute 'nickname'"):
+            query.where(lambda u: u.nickname == 'John').to_list()
+
+    @pytest.mark.asyncio
+    async def test_remove_should_preserve_order(self):
+        # arrange
+        repository = ColumnarRepository[OrderDto, str]()
+        await repository.add_many_async([OrderDto(str(i), f'customer_{i % 3}', i, i * 1.5) for i in range(10)])
+
+        # act
+        await repository.remove_async('0')
+        query = await repository.query_async()
+        ids = [order.id for order in query.to_list()]
+        first, last = query.first_or_default(lambda o: o.quantity < 5), query.last_or_default(lambda o: o.quantity > 5)
+        for id in ['2', '4', '6', '8']:
+            await repository.remove_async(id)
+        await repository.add_async(OrderDto('10', 'customer_1', 10, 15.0))
+        compacted_ids = [order.id for order in query.to_list()]
+        order = await repository.get_async('9')
+
+        # assert
+        assert ids == [str(i) for i in range(1, 10)], f"expected the orders in the order they have been added, got {ids} instead"
+        assert (first.id, last.id) == ('1', '9'), f"expected the first and last orders to be '1' and '9', got {(first.id, last.id)} instead"
+        assert compacted_ids == ['1', '3', '5', '7', '9', '10'], f"expected the orders in the order they have been added, got {compacted_ids} instead"
+        assert order == OrderDto('9', 'customer_0', 9, 13.5), f"unexpected order {order}"
@@ -0,0 +1,34 @@
+import pytest
+from neuroglia.data.abstractions import IndexDefinition, index
+
+from tests.data import IndexedUserDto
+
+
+class TestIndexDeclaration:
+
+    def test_index_should_declare_indexes(self):
+        # act
+        indexes = IndexedUserDto.__indexes__
+
+        # assert
+        assert IndexDefinition([("name", 1), ("created_at", -1)], name="name_created_at") in indexes, "expected a compound index on 'name' and descending 'created_at'"
+        assert IndexDefinition([("email", 1)], unique=True) in indexes, "expected a unique index on 'email'"
+        assert IndexDefinition([("name", 1)]) in indexes, "expected an index on 'name'"
+
+    def test_index_should_not_alter_base_type_indexes(self):
+        # arrange
+        @index("expires_at", expire_after_seconds=3600)
+        class ExpiringUserDto(IndexedUserDto):
+            pass
+
+        # act
+        indexes = ExpiringUserDto.__indexes__
+
+        # assert
+        assert len(indexes) == len(IndexedUserDto.__indexes__) + 1, f"expected {len(IndexedUserDto.__indexes__) + 1} indexes, got {len(indexes)} instead"
+        assert IndexDefinition([("expires_at", 1)], expire_after_seconds=3600) not in IndexedUserDto.__indexes__, "expected the indexes of the base type to be left untouched"
+
+    def test_index_with_expiration_on_several_fields_should_fail(self):
+        # act & assert
+        with pytest.raises(Exception):
+            index("name", "created_at", expire_after_seconds=3600)
@@ -5,12 +5,13 @@ import uuid
 from neuroglia.data.infrastructure.abstractions import Repository
 from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
 from neuroglia.dependency_injection.service_provider import ServiceCollection
-from neuroglia.mediation.mediator import Mediator, NotificationHandler, RequestHandler
-from samples.openbank.application.queries.generic import GetByIdQuery, GetByIdQueryHandler
+from neuroglia.mediation.mediator import Mediator, MediatorOptions, NotificationDispatchStrategy, NotificationHandler, RequestHandler
+from neuroglia.data.queries.generic import GetByIdQuery, GetByIdQueryHandler
 from samples.openbank.integration.models.person import AddressDto, PersonDto
 from samples.openbank.integration.person_gender import PersonGender
-from tests.data import GreetCommand, UserCreatedDomainEventV1, UserDto
-from tests.services import GreetCommandHandler, UserCreatedDomainEventV1Handler
+from tests.data import GetUserQuery, GreetCommand, UserCreatedDomainEventV1, UserEmailChangedDomainEventV1, UserDto
+from tests.services import FailingUserEmailChangedDomainEventV1Handler, GetUserQueryHandler, GreetCommandHandler, SlowUserEmailChangedDomainEventV1Handler, TimingOutUserEmailChangedDomainEventV1Handler, UserCreatedDomainEventV1Handler, UserDomainEventsHandler
+import asyncio
 import pytest
 
 
@@ -35,6 +36,24 @@ class TestMediator:
         assert result.status is 200, f"expected status '200', got '{result.status}'"
         assert result.data == greetings, f"expected greetings '{greetings}', got '{result.data}'"
 
+    @pytest.mark.asyncio
+    async def test_execute_command_should_only_build_matching_handler(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(RequestHandler, GetByIdQueryHandler[UserDto, str])  # cannot be built: no Repository[UserDto, str] has been registered
+        services.add_transient(RequestHandler, GreetCommandHandler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        command = GreetCommand(greetings='Hello, world!')
+
+        # act
+        result = await mediator.execute_async(command)
+
+        # assert
+        assert result is not None, 'result is none'
+        assert result.status is 200, f"expected status '200', got '{result.status}'"
+
     @pytest.mark.asyncio
     async def test_execute_query_should_work(self):
         # arrange
@@ -56,6 +75,87 @@ class TestMediator:
         assert result.status is 200, f"expected status '200', got '{result.status}'"
         assert result.data == person, f"expected person dto '{person}', got '{result.data}'"
 
+    @pytest.mark.asyncio
+    async def test_execute_identical_queries_should_coalesce(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(MediatorOptions, singleton=MediatorOptions(coalesced_query_types={GetUserQuery}))
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(RequestHandler, GetUserQueryHandler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        GetUserQueryHandler.executions = 0
+
+        # act
+        results = await asyncio.gather(*(mediator.execute_async(GetUserQuery('john.doe')) for _ in range(5)), mediator.execute_async(GetUserQuery('jane.doe')))
+
+        # assert
+        assert GetUserQueryHandler.executions == 2, f"expected 2 executions, got {GetUserQueryHandler.executions}"
+        assert all(result.data.id == 'john.doe' for result in results[:5]), 'expected coalesced queries to share the same result'
+        assert results[5].data.id == 'jane.doe', 'expected distinct queries not to be coalesced'
+
+    @pytest.mark.asyncio
+    async def test_cancelling_first_coalesced_query_should_not_cancel_others(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(MediatorOptions, singleton=MediatorOptions(coalesced_query_types={GetUserQuery}))
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(RequestHandler, GetUserQueryHandler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        GetUserQueryHandler.executions = 0
+        leader = asyncio.create_task(mediator.execute_async(GetUserQuery('john.doe')))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(mediator.execute_async(GetUserQuery('john.doe')))
+        await asyncio.sleep(0)
+
+        # act
+        leader.cancel()
+        result = await follower
+
+        # assert
+        assert leader.cancelled(), 'expected the first query to have been cancelled'
+        assert result.data.id == 'john.doe', 'expected the coalesced query to get the result of the shared execution'
+        assert GetUserQueryHandler.executions == 1, f"expected 1 execution, got {GetUserQueryHandler.executions}"
+
+    @pytest.mark.asyncio
+    async def test_execute_many_should_return_results_in_input_order(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(RequestHandler, GetUserQueryHandler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        user_ids = [str(i) for i in range(20)]
+
+        async def stream_queries_async():
+            for user_id in user_ids:
+                yield GetUserQuery(user_id)
+
+        # act
+        results = await mediator.execute_many_async(stream_queries_async(), max_concurrency=4)
+
+        # assert
+        assert [result.data.id for result in results] == user_ids, 'expected results to be returned in input order'
+
+    @pytest.mark.asyncio
+    async def test_execute_many_should_stop_on_failure(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(RequestHandler, GetUserQueryHandler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        requests = [GetUserQuery('1'), GreetCommand('Hello, world!'), GetUserQuery('2'), GetUserQuery('3')]
+
+        # act
+        results = await mediator.execute_many_async(requests, max_concurrency=1, stop_on_failure=True)
+
+        # assert
+        assert len(results) == 2, f"expected 2 results, got {len(results)}"
+        assert results[0].status == 200, f"expected status '200', got '{results[0].status}'"
+        assert results[1].status == 500, f"expected status '500', got '{results[1].status}'"
+
     @pytest.mark.asyncio
     async def test_publish_notification_should_work(self):
         # arrange
@@ -73,10 +173,109 @@ class TestMediator:
 
         # act
         await mediator.publish_async(e)
-        user = repository.get_async(user_id)
+        user = await repository.get_async(user_id)
 
         # assert
         assert user is not None, 'user is None'
         assert user.id == user_id, f"expected user id to be '{user_id}', but found '{user.id}'"
         assert user.name == user_name, f"expected user name to be '{user_name}', but found '{user.name}'"
         assert user.email == user_email, f"expected user id to be '{user_email}', but found '{user.email}'"
+
+    @pytest.mark.asyncio
+    async def test_publish_notification_should_only_build_matching_handlers(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(NotificationHandler, UserCreatedDomainEventV1Handler)  # cannot be built: no Repository[UserDto, str] has been registered
+        services.add_singleton(NotificationHandler, UserDomainEventsHandler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        e = UserEmailChangedDomainEventV1(str(uuid4()), 'john.doe@email.com')
+
+        # act
+        await mediator.publish_async(e)
+
+        # assert
+        assert e in UserDomainEventsHandler.handled_events, 'expected the union handler to have handled the event'
+
+    @pytest.mark.asyncio
+    async def test_publish_notification_should_report_outcome_per_handler(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(MediatorOptions, singleton=MediatorOptions(notification_handler_timeouts={SlowUserEmailChangedDomainEventV1Handler: 0.01}, raise_on_notification_handler_failure=False))
+        services.add_singleton(Mediator, Mediator)
+        services.add_singleton(NotificationHandler, UserDomainEventsHandler)
+        services.add_singleton(NotificationHandler, SlowUserEmailChangedDomainEventV1Handler)
+        services.add_singleton(NotificationHandler, FailingUserEmailChangedDomainEventV1Handler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+
+        # act
+        outcomes = await mediator.publish_async(UserEmailChangedDomainEventV1(str(uuid4()), 'john.doe@email.com'))
+
+        # assert
+        outcomes = {outcome.handler_type: outcome for outcome in outcomes}
+        assert len(outcomes) == 3, f"expected 3 outcomes, got {len(outcomes)}"
+        assert outcomes[UserDomainEventsHandler].succeeded, 'expected the union handler to succeed'
+        assert outcomes[SlowUserEmailChangedDomainEventV1Handler].timed_out, 'expected the slow handler to time out'
+        assert not outcomes[FailingUserEmailChangedDomainEventV1Handler].succeeded, 'expected the failing handler to fail'
+        assert outcomes[FailingUserEmailChangedDomainEventV1Handler].error is not None, 'expected the failing handler to report its error'
+
+    @pytest.mark.asyncio
+    async def test_publish_notification_should_not_report_handler_timeout_errors_as_timed_out(self):
+        for timeouts in [dict(), {TimingOutUserEmailChangedDomainEventV1Handler: 1}]:
+            # arrange
+            services = ServiceCollection()
+            services.add_singleton(MediatorOptions, singleton=MediatorOptions(notification_handler_timeouts=timeouts, raise_on_notification_handler_failure=False))
+            services.add_singleton(Mediator, Mediator)
+            services.add_singleton(NotificationHandler, TimingOutUserEmailChangedDomainEventV1Handler)
+            mediator: Mediator = services.build().get_service(Mediator)
+
+            # act
+            outcomes = await mediator.publish_async(UserEmailChangedDomainEventV1(str(uuid4()), 'john.doe@email.com'))
+
+            # assert
+            assert not outcomes[0].succeeded, 'expected the handler to fail'
+            assert not outcomes[0].timed_out, f"expected the handler not to be reported as timed out with timeouts {timeouts}"
+            assert isinstance(outcomes[0].error, TimeoutError), f"expected the handler to report its own error, got {outcomes[0].error!r} instead"
+
+    @pytest.mark.asyncio
+    async def test_publish_notification_should_honor_handler_concurrency_limit(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(MediatorOptions, singleton=MediatorOptions(NotificationDispatchStrategy.SEQUENTIAL, notification_handler_concurrency_limits={SlowUserEmailChangedDomainEventV1Handler: 1}))
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(NotificationHandler, SlowUserEmailChangedDomainEventV1Handler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        SlowUserEmailChangedDomainEventV1Handler.max_running = 0
+
+        # act
+        await asyncio.gather(*(mediator.publish_async(UserEmailChangedDomainEventV1(str(uuid4()), 'john.doe@email.com')) for _ in range(5)))
+
+        # assert
+        assert SlowUserEmailChangedDomainEventV1Handler.max_running == 1, f"expected at most 1 concurrent handler, got {SlowUserEmailChangedDomainEventV1Handler.max_running}"
+
+    @pytest.mark.asyncio
+    async def test_cancelling_notification_waiting_for_handler_slot_should_release_acquired_slots(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(MediatorOptions, singleton=MediatorOptions(max_concurrent_notification_handlers=2, notification_handler_concurrency_limits={SlowUserEmailChangedDomainEventV1Handler: 1}))
+        services.add_singleton(Mediator, Mediator)
+        services.add_transient(NotificationHandler, SlowUserEmailChangedDomainEventV1Handler)
+        service_provider = services.build()
+        mediator: Mediator = service_provider.get_service(Mediator)
+        running_publication = asyncio.create_task(mediator.publish_async(UserEmailChangedDomainEventV1(str(uuid4()), 'john.doe@email.com')))
+        await asyncio.sleep(0.01)
+        waiting_publication = asyncio.create_task(mediator.publish_async(UserEmailChangedDomainEventV1(str(uuid4()), 'john.doe@email.com')))
+        await asyncio.sleep(0.01)
+
+        # act
+        waiting_publication.cancel()
+        await running_publication
+        semaphores = mediator._notification_handler_semaphores[asyncio.get_running_loop()]
+
+        # assert
+        assert waiting_publication.cancelled(), 'expected the waiting publication to have been cancelled'
+        assert semaphores[None]._value == 2, f"expected all global slots to have been released, got {semaphores[None]._value} free slots"
+        assert semaphores[SlowUserEmailChangedDomainEventV1Handler]._value == 1, 'expected the handler slot to have been released'
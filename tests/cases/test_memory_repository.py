@@ -0,0 +1,135 @@
+import ast
+from uuid import uuid4
+import pytest
+from neuroglia.data.infrastructure.abstractions import BulkOperationException
+from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
+
+from tests.data import IndexedUserDto, UserDto
+
+
+class TestMemoryRepository:
+
+    @pytest.mark.asyncio
+    async def test_add_many_should_work(self):
+        # arrange
+        repository = MemoryRepository[UserDto, str]()
+        users = [UserDto(str(uuid4()), f'name_{i}', f'email_{i}') for i in range(10)]
+
+        # act
+        results = await repository.add_many_async(users)
+
+        # assert
+        assert results == users, f"expected the added users to be returned, got '{results}' instead"
+        assert all([await repository.contains_async(user.id) for user in users]), "expected all users to have been added"
+
+    @pytest.mark.asyncio
+    async def test_add_many_ordered_should_stop_at_first_failed_item(self):
+        # arrange
+        repository = MemoryRepository[UserDto, str]()
+        existing_user = UserDto(str(uuid4()), 'John Doe', 'john.doe@email.com')
+        await repository.add_async(existing_user)
+        users = [UserDto(str(uuid4()), 'Jane Doe', 'jane.doe@email.com'), existing_user, UserDto(str(uuid4()), 'Jim Doe', 'jim.doe@email.com')]
+
+        # act
+        with pytest.raises(BulkOperationException) as ex:
+            await repository.add_many_async(users)
+
+        # assert
+        assert [(error.index, error.id) for error in ex.value.errors] == [(1, existing_user.id)], f"expected the item at index 1 to fail, got '{ex.value.errors}' instead"
+        assert ex.value.processed_count == 1, f"expected 1 processed item, got '{ex.value.processed_count}' instead"
+        assert not await repository.contains_async(users[2].id), "expected the items following the failed one not to have been added"
+
+    @pytest.mark.asyncio
+    async def test_remove_many_unordered_should_report_failed_items(self):
+        # arrange
+        repository = MemoryRepository[UserDto, str]()
+        users = [UserDto(str(uuid4()), f'name_{i}', f'email_{i}') for i in range(3)]
+        await repository.add_many_async(users)
+        ids = [users[0].id, str(uuid4()), users[1].id, str(uuid4()), users[2].id]
+
+        # act
+        with pytest.raises(BulkOperationException) as ex:
+            await repository.remove_many_async(ids, ordered=False)
+
+        # assert
+        assert [error.index for error in ex.value.errors] == [1, 3], f"expected the items at index 1 and 3 to fail, got '{ex.value.errors}' instead"
+        assert ex.value.processed_count == 3, f"expected 3 processed items, got '{ex.value.processed_count}' instead"
+        assert all([not await repository.contains_async(user.id) for user in users]), "expected all existing users to have been removed"
+
+    @pytest.mark.asyncio
+    async def test_repositories_should_not_share_entities(self):
+        # arrange
+        repository = MemoryRepository[UserDto, str]()
+        other_repository = MemoryRepository[UserDto, str]()
+        user = UserDto(str(uuid4()), 'John Doe', 'john.doe@email.com')
+
+        # act
+        await repository.add_async(user)
+
+        # assert
+        assert not await other_repository.contains_async(user.id), "expected repositories not to share their entities"
+
+    @pytest.mark.asyncio
+    async def test_query_should_work(self):
+        # arrange
+        repository = MemoryRepository[UserDto, str]()
+        await repository.add_many_async([UserDto(str(i), f'name_{i % 3}', f'email_{i}') for i in range(10)])
+        query = await repository.query_async()
+
+        # act
+        users = query.where(lambda u: u.name != 'name_0').order_by(lambda u: u.name).order_by_descending(lambda u: u.email).skip(1).take(3).to_list()
+        count = query.where(lambda u: u.email.startswith('email_1')).count()
+        user = query.first_or_default(lambda u: u.email == 'email_4')
+
+        # assert
+        assert [user.email for user in users] == ['email_4', 'email_1', 'email_8'], f"unexpected users {[user.email for user in users]}"
+        assert count == 1, f"expected 1 user, got {count} instead"
+        assert user.id == '4', f"expected the user with id '4', got '{user}' instead"
+
+    @pytest.mark.asyncio
+    async def test_compiled_queries_capturing_variables_should_not_be_cached(self):
+        # arrange
+        repository = MemoryRepository[UserDto, str]()
+        await repository.add_many_async([UserDto(str(i), f'name_{i % 3}', f'email_{i}') for i in range(10)])
+        users_by_name = dict[str, list]()
+
+        # act
+        for name in ['name_0', 'name_1']:
+            compiled_query = await repository.compile_query_async(lambda q: q.where(lambda u: u.name == name))
+            users_by_name[name] = compiled_query.to_list()
+
+        # assert
+        assert [user.id for user in users_by_name['name_0']] == ['0', '3', '6', '9'], f"unexpected users {users_by_name['name_0']}"
+        assert [user.id for user in users_by_name['name_1']] == ['1', '4', '7'], f"expected the captured value of the second call to be used, got {users_by_name['name_1']} instead"
+
+    @pytest.mark.asyncio
+    async def test_query_on_indexed_fields_should_use_indexes(self):
+        # arrange
+        repository = MemoryRepository[IndexedUserDto, str]()
+        await repository.add_many_async([IndexedUserDto(str(i), f'name_{i}', f'email_{i}') for i in range(10)])
+        user = await repository.get_async('2')
+        user.name = 'name_renamed'
+        await repository.update_async(user)
+        query = await repository.query_async()
+
+        # act
+        equal_users = query.where(lambda u: u.name == 'name_renamed' and u.email == 'email_2').to_list()
+        stale_users = query.where(lambda u: u.name == 'name_2').to_list()
+        range_users = query.where(lambda u: 'name_7' < u.name and u.id != '9').to_list()
+        lookup = repository._find(ast.parse("lambda u: u.name >= 'name_7'").body[0].value)
+
+        # assert
+        assert [user.id for user in equal_users] == ['2'], f"unexpected users {equal_users}"
+        assert stale_users == [], f"expected the updated user to have been reindexed, got {stale_users} instead"
+        assert [user.id for user in range_users] == ['8', '2'], f"unexpected users {range_users}"
+        assert [user.id for user in lookup] == ['7', '8', '9', '2'], f"expected the range to be served by the index, got {lookup} instead"
+
+    @pytest.mark.asyncio
+    async def test_add_violating_unique_index_should_fail(self):
+        # arrange
+        repository = MemoryRepository[IndexedUserDto, str]()
+        await repository.add_async(IndexedUserDto(str(uuid4()), 'John Doe', 'john.doe@email.com'))
+
+        # act & assert
+        with pytest.raises(Exception):
+            await repository.add_async(IndexedUserDto(str(uuid4()), 'Jane Doe', 'john.doe@email.com'))
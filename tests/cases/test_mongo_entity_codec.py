@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import bson
+from bson import Decimal128
+from bson.codec_options import CodecOptions
+from neuroglia.data.infrastructure.mongo.mongo_entity_codec import MongoEntityCodec
+from tests.data import UserBalanceDto, UserMembershipDto, UserProfileDto, UserRole
+
+
+class TestMongoEntityCodec:
+
+    _codec: MongoEntityCodec = MongoEntityCodec()
+
+    def test_encode_decode_should_work(self):
+        # arrange
+        profile = UserProfileDto("fake_id", UserRole.ADMIN, datetime(2024, 1, 1, 12), [UserMembershipDto("fake_group", UserRole.MEMBER, datetime(2024, 2, 1, 8, 30))])
+
+        # act
+        document = self._codec.encode(profile)
+        decoded = self._codec.decode(dict(document, _id="fake_object_id"), UserProfileDto)
+
+        # assert
+        assert document == dict(id="fake_id", role="ADMIN", created_at=datetime(2024, 1, 1, 12), memberships=[dict(group="fake_group", role="MEMBER", joined_at=datetime(2024, 2, 1, 8, 30))])
+        assert decoded == profile
+
+    def test_encode_decode_slotted_entity_should_work(self):
+        # arrange
+        balance = UserBalanceDto("fake_user_id", Decimal("12.50"), UserRole.MEMBER, datetime(2024, 1, 1, 12))
+
+        # act
+        document = self._codec.encode(balance)
+        decoded = self._codec.decode(document, UserBalanceDto)
+
+        # assert
+        assert document == dict(user_id="fake_user_id", amount=Decimal128("12.50"), role="MEMBER", updated_at=datetime(2024, 1, 1, 12))
+        assert decoded == balance
+
+    def test_decode_legacy_document_should_work(self):
+        # arrange
+        document = dict(_id="fake_object_id", user_id="fake_user_id", amount="12.50", role="member", updated_at="2024-01-01T12:00:00")
+
+        # act
+        decoded = self._codec.decode(document, UserBalanceDto)
+
+        # assert
+        assert decoded == UserBalanceDto("fake_user_id", Decimal("12.50"), UserRole.MEMBER, datetime(2024, 1, 1, 12))
+
+    def test_encode_decode_timezone_aware_datetime_should_preserve_instant(self):
+        # arrange
+        updated_at = datetime(2024, 1, 1, 14, 0, 0, 123456, tzinfo=timezone(timedelta(hours=2)))
+        balance = UserBalanceDto("fake_user_id", Decimal("12.50"), UserRole.MEMBER, updated_at)
+
+        # act
+        encoded = self._codec.encode(balance)
+        document = bson.encode(encoded)
+        decoded = self._codec.decode(bson.decode(document), UserBalanceDto)
+        tz_aware_decoded = self._codec.decode(bson.decode(document, CodecOptions(tz_aware=True)), UserBalanceDto)
+
+        # assert
+        assert encoded["updated_at"] == datetime(2024, 1, 1, 12, 0, 0, 123000, tzinfo=timezone.utc), f"expected the datetime to be encoded as stored, got {encoded['updated_at']!r} instead"
+        assert decoded.updated_at == datetime(2024, 1, 1, 12, 0, 0, 123000), f"expected a naive datetime in UTC, truncated to milliseconds, got {decoded.updated_at!r} instead"
+        assert tz_aware_decoded.updated_at == updated_at.replace(microsecond=123000), f"expected the same instant, got {tz_aware_decoded.updated_at!r} instead"
+        assert tz_aware_decoded.updated_at.utcoffset() == timedelta(0), "expected a datetime in UTC"
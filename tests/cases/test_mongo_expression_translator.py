@@ -0,0 +1,55 @@
+import ast
+from datetime import datetime
+from neuroglia.data.infrastructure.mongo.mongo_entity_codec import MongoEntityCodec
+from neuroglia.data.queryable import VariableExpressionReplacer
+from neuroglia.expressions.mongo_expression_translator import MongoExpressionTranslator
+from tests.data import UserRole
+
+
+class TestMongoExpressionTranslator:
+
+    _translator: MongoExpressionTranslator = MongoExpressionTranslator(MongoEntityCodec().encode_value)
+
+    def test_translate_comparison_should_work(self):
+        # arrange
+        expression = self._parse("lambda u: u.name == 'John Doe' and u.role != UserRole.ADMIN and 18 <= u.age < 65", UserRole=UserRole)
+
+        # act
+        filter = self._translator.translate(expression)
+
+        # assert
+        assert filter == {'$and': [{'name': {'$eq': 'John Doe'}}, {'role': {'$ne': 'ADMIN'}}, {'$and': [{'age': {'$gte': 18}}, {'age': {'$lt': 65}}]}]}
+
+    def test_translate_membership_and_string_functions_should_work(self):
+        # arrange
+        expression = self._parse("lambda u: u.id in ids or u.name.startswith('fake.') and not u.address.city.endswith(suffix)", ids=['1', '2'], suffix='ville')
+
+        # act
+        filter = self._translator.translate(expression)
+
+        # assert
+        assert filter == {'$or': [{'id': {'$in': ['1', '2']}}, {'$and': [{'name': {'$regex': '^fake\\.'}}, {'$nor': [{'address.city': {'$regex': 'ville$'}}]}]}]}
+
+    def test_translate_evaluated_values_should_work(self):
+        # arrange
+        expression = self._parse("lambda u: u.created_at > datetime(2024, 1, 1) and u.memberships[0].group == query.group", datetime=datetime, query=type('Query', (), dict(group='fake_group')))
+
+        # act
+        filter = self._translator.translate(expression)
+
+        # assert
+        assert filter == {'$and': [{'created_at': {'$gt': datetime(2024, 1, 1)}}, {'memberships.0.group': {'$eq': 'fake_group'}}]}
+
+    def test_translate_partially_should_return_untranslatable_conjuncts(self):
+        # arrange
+        expression = self._parse("lambda u: u.name.lower() == 'john doe' and u.id == '1'")
+
+        # act
+        filter, untranslated_expressions = self._translator.translate_partially(expression)
+
+        # assert
+        assert filter == {'id': {'$eq': '1'}}
+        assert [ast.unparse(untranslated_expression) for untranslated_expression in untranslated_expressions] == ["u.name.lower() == 'john doe'"]
+
+    def _parse(self, source: str, **variables) -> ast.Lambda:
+        return VariableExpressionReplacer(dict(variables, u='not_an_argument')).visit(ast.parse(source).body[0].value)
@@ -1,13 +1,15 @@
+from decimal import Decimal
 from uuid import uuid4
 from pymongo import MongoClient
 import pytest
-from neuroglia.data.infrastructure.abstractions import QueryableRepository, Repository
+from neuroglia.data.infrastructure.abstractions import BulkOperationException, OptimisticConcurrencyException, QueryableRepository, Repository
+from neuroglia.data.infrastructure.mongo.mongo_index_manager import MongoIndexManager
 from neuroglia.data.infrastructure.mongo.mongo_repository import MongoRepository, MongoRepositoryOptions
 from neuroglia.dependency_injection.service_provider import ServiceCollection, ServiceProvider
 from neuroglia.serialization.json import JsonSerializer
 from neuroglia.serialization.abstractions import Serializer, TextSerializer
 
-from tests.data import UserDto
+from tests.data import AccountDto, IndexedUserDto, UserDto, VersionedUserDto
 
 
 class TestMongoRepository:
@@ -114,6 +116,195 @@ class TestMongoRepository:
         # clean
         self._teardown()
 
+    @pytest.mark.asyncio
+    async def test_query_async_iteration_should_work(self):
+        # arrange
+        self._setup()
+        count = 25
+        await self._repository.add_many_async([UserDto(str(uuid4()), f'fake_name_{i}', f'fake_email_{i}') for i in range(count)])
+        query = (await self._repository.query_async()).where(lambda u: u.name.startswith('fake'))
+
+        # act
+        results = [result async for result in query]
+        batched_results = [result async for result in query.to_async_iter(batch_size=10)]
+
+        # assert
+        assert len(results) == count, f"expected to yield {count} items, yielded '{len(results)}' instead"
+        assert len(batched_results) == count, f"expected to yield {count} items in batches, yielded '{len(batched_results)}' instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_to_page_should_work(self):
+        # arrange
+        self._setup()
+        count = 25
+        limit = 10
+        await self._repository.add_many_async([UserDto(str(uuid4()), f'fake_name_{i % 5}', f'fake_email_{i}') for i in range(count)])
+        query = (await self._repository.query_async()).where(lambda u: u.name.startswith('fake')).order_by_descending(lambda u: u.name)
+
+        # act
+        pages = [query.to_page(limit)]
+        while pages[-1].next_token is not None:
+            pages.append(query.to_page(limit, pages[-1].next_token))
+        results = [item for page in pages for item in page.items]
+
+        # assert
+        assert [len(page.items) for page in pages] == [10, 10, 5], f"expected pages of 10, 10 and 5 items, got '{[len(page.items) for page in pages]}' instead"
+        assert len({result['id'] for result in results}) == count, f"expected {count} distinct items, got '{len({result['id'] for result in results})}' instead"
+        assert [result['name'] for result in results] == sorted([result['name'] for result in results], reverse=True), "expected items to be ordered by descending name"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_count_and_any_should_work(self):
+        # arrange
+        self._setup()
+        await self._repository.add_many_async([UserDto(str(uuid4()), f'name_{i % 3}', f'email_{i}') for i in range(10)])
+        query = await self._repository.query_async()
+
+        # act
+        count = query.where(lambda u: u.name == 'name_0').count()
+        skipped_count = query.skip(8).count()
+        any = query.where(lambda u: u.name == 'name_1').any()
+        none = query.where(lambda u: u.name == 'fake').any()
+
+        # assert
+        assert count == 4, f"expected 4 users, got {count} instead"
+        assert skipped_count == 2, f"expected 2 users, got {skipped_count} instead"
+        assert any, "expected a user named 'name_1' to exist"
+        assert not none, "expected no user named 'fake' to exist"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_aggregates_should_work(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[AccountDto, str](MongoRepositoryOptions[AccountDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+        await repository.add_many_async([AccountDto(str(uuid4()), f'owner_{i % 2}', Decimal(f'{i}.10')) for i in range(4)])
+        query = await repository.query_async()
+
+        # act
+        total = query.sum(lambda a: a.balance)
+        owner_total = query.where(lambda a: a.owner_id == 'owner_1').sum(lambda a: a.balance)
+        minimum = query.min(lambda a: a.balance)
+        maximum = query.max(lambda a: a.balance)
+        empty_total = query.where(lambda a: a.owner_id == 'fake').sum(lambda a: a.balance)
+        owner_ids = query.distinct(lambda a: a.owner_id)
+
+        # assert
+        assert total == Decimal('6.40'), f"expected a total of 6.40, got {total} instead"
+        assert owner_total == Decimal('4.20'), f"expected a total of 4.20, got {owner_total} instead"
+        assert minimum == Decimal('0.10') and maximum == Decimal('3.10'), f"expected balances between 0.10 and 3.10, got {minimum} and {maximum} instead"
+        assert empty_total == 0, f"expected a total of 0, got {empty_total} instead"
+        assert sorted(owner_ids) == ['owner_0', 'owner_1'], f"expected owners 'owner_0' and 'owner_1', got {owner_ids} instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_on_decimals_should_compare_numerically(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[AccountDto, str](MongoRepositoryOptions[AccountDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+        await repository.add_many_async([AccountDto(str(i), 'owner', Decimal(balance)) for i, balance in enumerate(['1000', '9', '100', '50'])])
+        query = await repository.query_async()
+
+        # act
+        balances = [account.balance for account in query.where(lambda a: a.balance > Decimal(20)).select(lambda a: [a.balance]).to_list()]
+        ordered_balances = [account.balance for account in query.order_by(lambda a: a.balance).select(lambda a: [a.balance]).to_list()]
+        first_page = query.order_by(lambda a: a.balance).to_page(2)
+        second_page = query.order_by(lambda a: a.balance).to_page(2, first_page.next_token)
+
+        # assert
+        assert sorted(balances) == [Decimal('50'), Decimal('100'), Decimal('1000')], f"expected the balances greater than 20, got {balances} instead"
+        assert ordered_balances == [Decimal('9'), Decimal('50'), Decimal('100'), Decimal('1000')], f"expected balances in numeric order, got {ordered_balances} instead"
+        assert [account['id'] for account in first_page.items + second_page.items] == ['1', '3', '2', '0'], f"expected pages in numeric order, got {first_page.items + second_page.items} instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_group_by_should_work(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[AccountDto, str](MongoRepositoryOptions[AccountDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+        await repository.add_many_async([AccountDto(str(uuid4()), f'owner_{i % 2}', Decimal(f'{i}.10')) for i in range(4)])
+        query = await repository.query_async()
+
+        # act
+        groups = query.group_by(lambda a: a.owner_id).select(lambda g: {'owner_id': g.key, 'count': g.count(), 'total': g.sum(lambda a: a.balance)}).to_list()
+        accounts = query.order_by(lambda a: a.balance).distinct_by(lambda a: a.owner_id).to_list()
+
+        # assert
+        assert sorted(groups, key=lambda group: group['owner_id']) == [{'owner_id': 'owner_0', 'count': 2, 'total': Decimal('2.20')}, {'owner_id': 'owner_1', 'count': 2, 'total': Decimal('4.20')}], f"unexpected groups {groups}"
+        assert sorted((account['owner_id'], account['balance']) for account in accounts) == [('owner_0', Decimal('0.10')), ('owner_1', Decimal('1.10'))], f"expected the first account of each owner, got {accounts} instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_compiled_query_should_work(self):
+        # arrange
+        self._setup()
+        await self._repository.add_many_async([UserDto(str(uuid4()), f'name_{i % 3}', f'email_{i}') for i in range(10)])
+        compiled_query = await self._repository.compile_query_async(lambda q, name: q.where(lambda u: u.name == name and u.email != 'fake'))
+
+        # act
+        users = compiled_query.to_list(name='name_0')
+        other_users = compiled_query.to_list(name='name_1')
+        count = compiled_query.count(name='name_2')
+        user = compiled_query.first_or_default(name='fake')
+
+        # assert
+        assert sorted(user['email'] for user in users) == ['email_0', 'email_3', 'email_6', 'email_9'], f"unexpected users {users}"
+        assert len(other_users) == 3, f"expected 3 users, got {len(other_users)} instead"
+        assert count == 3, f"expected 3 users, got {count} instead"
+        assert user is None, f"expected no user, got {user} instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_select_should_hydrate_partial_entities(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[AccountDto, str](MongoRepositoryOptions[AccountDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+        await repository.add_many_async([AccountDto(str(i), f'owner_{i}', Decimal(f'{i}.10')) for i in range(3)])
+        query = await repository.query_async()
+
+        # act
+        accounts = query.order_by(lambda a: a.id).select(lambda a: [a.id, a.balance]).to_list()
+
+        # assert
+        assert all(isinstance(account, AccountDto) for account in accounts), f"expected instances of AccountDto, got {accounts} instead"
+        assert [(account.id, account.balance) for account in accounts] == [('0', Decimal('0.10')), ('1', Decimal('1.10')), ('2', Decimal('2.10'))], f"unexpected accounts {accounts}"
+        assert not any(hasattr(account, 'owner_id') for account in accounts), "expected the attributes that were not selected to be unset"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_get_with_fields_should_only_load_specified_fields(self):
+        # arrange
+        self._setup()
+        user = UserDto(str(uuid4()), 'John Doe', 'john.doe@email.com')
+        await self._repository.add_async(user)
+
+        # act
+        result = await self._repository.get_async(user.id, ['name'])
+
+        # assert
+        assert result.id == user.id and result.name == user.name, f"expected the id and name of the user, got {result.__dict__} instead"
+        assert not hasattr(result, 'email'), "expected the email of the user not to have been loaded"
+
+        # clean
+        self._teardown()
+
     @pytest.mark.asyncio
     async def test_remove_should_work(self):
         # arrange
@@ -131,6 +322,224 @@ class TestMongoRepository:
         # clean
         self._teardown()
 
+    @pytest.mark.asyncio
+    async def test_add_existing_should_fail(self):
+        # arrange
+        self._setup()
+        user = UserDto(str(uuid4()), 'John Doe', 'john.doe@email.com')
+        await self._repository.add_async(user)
+
+        # act & assert
+        with pytest.raises(Exception):
+            await self._repository.add_async(UserDto(user.id, 'Jane Doe', 'jane.doe@email.com'))
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_update_versioned_should_increment_version(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[VersionedUserDto, str](MongoRepositoryOptions[VersionedUserDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+        user = VersionedUserDto(str(uuid4()), 'John Doe')
+        await repository.add_async(user)
+        user.name = 'Jane Doe'
+
+        # act
+        await repository.update_async(user)
+        result = await repository.get_async(user.id)
+
+        # assert
+        assert user.state_version == 1, f"expected version 1, got '{user.state_version}' instead"
+        assert result.state_version == 1, f"expected stored version 1, got '{result.state_version}' instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_update_stale_should_raise_concurrency_exception(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[VersionedUserDto, str](MongoRepositoryOptions[VersionedUserDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+        user = VersionedUserDto(str(uuid4()), 'John Doe')
+        await repository.add_async(user)
+        stale_user = VersionedUserDto(user.id, 'Jim Doe')
+        await repository.update_async(user)
+
+        # act
+        with pytest.raises(OptimisticConcurrencyException) as ex:
+            await repository.update_async(stale_user)
+
+        # assert
+        assert ex.value.expected_version == 0, f"expected version 0, got '{ex.value.expected_version}' instead"
+        assert ex.value.actual_version == 1, f"expected stored version 1, got '{ex.value.actual_version}' instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_ensure_indexes_should_create_declared_indexes(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[IndexedUserDto, str](MongoRepositoryOptions[IndexedUserDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+
+        # act
+        await repository.ensure_indexes_async()
+        await repository.ensure_indexes_async()
+        indexes = {tuple(information["key"]): information for information in self._mongo_client[TestMongoRepository._mongo_database_name]["indexeduser"].index_information().values()}
+
+        # assert
+        assert (("id", 1),) in indexes and indexes[(("id", 1),)].get("unique"), "expected a unique index on 'id'"
+        assert (("name", 1),) in indexes, "expected an index on 'name'"
+        assert indexes[(("email", 1),)].get("unique"), "expected a unique index on 'email'"
+        assert (("name", 1), ("created_at", -1)) in indexes, "expected a compound index on 'name' and 'created_at'"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_ensure_indexes_should_ignore_special_indexes(self):
+        # arrange
+        self._setup()
+        collection = self._mongo_client[TestMongoRepository._mongo_database_name]["indexeduser"]
+        collection.create_index([("email", "hashed")])
+        collection.create_index([("location", "2dsphere")])
+        repository = MongoRepository[IndexedUserDto, str](MongoRepositoryOptions[IndexedUserDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+
+        # act
+        await repository.ensure_indexes_async()
+        indexes = {tuple(information["key"]) for information in collection.index_information().values()}
+
+        # assert
+        assert {(("email", "hashed"),), (("location", "2dsphere"),), (("email", 1),)} <= indexes, f"expected the special indexes to have been left untouched, got {indexes} instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_query_on_unindexed_field_should_be_reported(self):
+        # arrange
+        self._setup()
+        index_manager = MongoIndexManager()
+        repository = MongoRepository[IndexedUserDto, str](MongoRepositoryOptions[IndexedUserDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer(), index_manager=index_manager)
+        await repository.ensure_indexes_async()
+        query = await repository.query_async()
+
+        # act
+        query.where(lambda u: u.name == 'John Doe').to_list()
+        query.where(lambda u: u.email.endswith('@email.com')).to_list()
+        query.where(lambda u: u.id == 'fake' or u.created_at is None).to_list()
+        collection_scans = index_manager.get_collection_scans()
+
+        # assert
+        assert [collection_scan.fields for collection_scan in collection_scans] == [['created_at', 'id']], f"expected a single collection scan on 'created_at' and 'id', got '{collection_scans}' instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_add_many_should_work(self):
+        # arrange
+        self._setup()
+        users = [UserDto(str(uuid4()), f'name_{i}', f'email_{i}') for i in range(10)]
+
+        # act
+        await self._repository.add_many_async(users)
+        query = await self._repository.query_async()
+        results = query.where(lambda u: u.name.startswith('name_')).to_list()
+
+        # assert
+        assert len(results) == len(users), f"expected to match {len(users)} items, matched '{len(results)}' instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_add_many_unordered_should_report_failed_items(self):
+        # arrange
+        self._setup()
+        existing_user = UserDto(str(uuid4()), 'John Doe', 'john.doe@email.com')
+        await self._repository.add_async(existing_user)
+        users = [UserDto(str(uuid4()), 'Jane Doe', 'jane.doe@email.com'), existing_user, UserDto(str(uuid4()), 'Jim Doe', 'jim.doe@email.com')]
+
+        # act
+        with pytest.raises(BulkOperationException) as ex:
+            await self._repository.add_many_async(users, ordered=False)
+
+        # assert
+        assert [error.index for error in ex.value.errors] == [1], f"expected the item at index 1 to fail, got '{ex.value.errors}' instead"
+        assert ex.value.processed_count == 2, f"expected 2 processed items, got '{ex.value.processed_count}' instead"
+        assert await self._repository.contains_async(users[2].id), f"failed to find the user with the specified id '{users[2].id}'"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_update_many_should_work(self):
+        # arrange
+        self._setup()
+        users = [UserDto(str(uuid4()), f'name_{i}', f'email_{i}') for i in range(10)]
+        await self._repository.add_many_async(users)
+        for user in users:
+            user.name = 'Jane Doe'
+
+        # act
+        await self._repository.update_many_async(users)
+        results = [await self._repository.get_async(user.id) for user in users]
+
+        # assert
+        assert all(result.name == 'Jane Doe' for result in results), "expected all users to have been updated"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_update_many_with_rejected_and_concurrently_removed_entities_should_report_both(self):
+        # arrange
+        self._setup()
+        repository = MongoRepository[IndexedUserDto, str](MongoRepositoryOptions[IndexedUserDto, str](TestMongoRepository._mongo_database_name), self._mongo_client, JsonSerializer())
+        await repository.ensure_indexes_async()
+        users = [IndexedUserDto(str(i), f'name_{i}', f'email_{i}') for i in range(4)]
+        await repository.add_many_async(users)
+        find_stored_versions = repository._find_stored_versions
+
+        def find_stored_versions_then_remove(ids):
+            # Simulates the removal of an entity after its version has been read, and before it is replaced
+            repository._find_stored_versions = find_stored_versions
+            stored_versions = find_stored_versions(ids)
+            repository._get_mongo_collection().delete_one({"id": '2'})
+            return stored_versions
+
+        repository._find_stored_versions = find_stored_versions_then_remove
+        users[1].email = 'email_0'
+        for user in users:
+            user.name = 'Jane Doe'
+
+        # act & assert
+        with pytest.raises(BulkOperationException) as ex:
+            await repository.update_many_async(users, ordered=False)
+        assert [error.id for error in ex.value.errors] == ['1', '2'], f"expected the rejected and the removed users to be reported, got {ex.value.errors} instead"
+        assert ex.value.processed_count == 2, f"expected 2 users to have been updated, got {ex.value.processed_count} instead"
+
+        # clean
+        self._teardown()
+
+    @pytest.mark.asyncio
+    async def test_remove_many_should_work(self):
+        # arrange
+        self._setup()
+        users = [UserDto(str(uuid4()), f'name_{i}', f'email_{i}') for i in range(10)]
+        await self._repository.add_many_async(users)
+
+        # act
+        await self._repository.remove_many_async([user.id for user in users])
+
+        # assert
+        assert all([not await self._repository.contains_async(user.id) for user in users]), "expected all users to have been removed"
+
+        # clean
+        self._teardown()
+
     def _setup(self) -> None:
         self._service_provider = TestMongoRepository._build_services()
         self._mongo_client = self._service_provider.get_required_service(MongoClient)
@@ -0,0 +1,107 @@
+import ast
+import pytest
+from neuroglia.data.queryable import Queryable
+
+from tests.data import UserDto
+from tests.services import RecordingQueryProvider
+
+
+class TestQueryable:
+
+    def test_chained_lambdas_should_be_told_apart(self):
+        # arrange
+        queryable = Queryable[UserDto](RecordingQueryProvider())
+
+        # act
+        query = queryable.where(lambda u: u.name == 'John Doe').order_by_descending(lambda u: u.email)
+
+        # assert
+        assert ast.unparse(query.expression) == "__query.where(lambda u: u.name == 'John Doe').order_by_descending(lambda u: u.email)", f"unexpected expression '{ast.unparse(query.expression)}'"
+
+    def test_to_page_should_seek_after_continuation_token(self):
+        # arrange
+        users = [UserDto(str(i), f'name_{i}', f'email_{i}') for i in range(3)]
+        provider = RecordingQueryProvider(users)
+        query = Queryable[UserDto](provider).order_by_descending(lambda u: u.name)
+
+        # act
+        first_page = query.to_page(2)
+        query.to_page(2, first_page.next_token)
+        seek_expression = ast.unparse(provider.executed_expressions[-1])
+
+        # assert
+        assert first_page.items == users[:2], f"expected the first 2 users, got '{first_page.items}' instead"
+        assert first_page.next_token is not None, "expected a continuation token"
+        assert "__item.name < 'name_1' or (__item.name == 'name_1' and __item.id > '1')" in seek_expression, f"unexpected seek expression '{seek_expression}'"
+        assert seek_expression.endswith(".order_by(lambda __item: __item.id).take(3)"), f"unexpected seek expression '{seek_expression}'"
+
+    def test_to_page_with_last_page_should_not_return_continuation_token(self):
+        # arrange
+        users = [UserDto(str(i), f'name_{i}', f'email_{i}') for i in range(2)]
+        query = Queryable[UserDto](RecordingQueryProvider(users))
+
+        # act
+        page = query.to_page(2)
+
+        # assert
+        assert page.items == users, f"expected all users, got '{page.items}' instead"
+        assert page.next_token is None, f"expected no continuation token, got '{page.next_token}' instead"
+
+    def test_to_page_with_invalid_continuation_token_should_fail(self):
+        # arrange
+        query = Queryable[UserDto](RecordingQueryProvider())
+
+        # act & assert
+        with pytest.raises(ValueError):
+            query.to_page(10, 'not-a-token')
+
+    def test_aggregates_should_terminate_expression(self):
+        # arrange
+        provider = RecordingQueryProvider()
+        queryable = Queryable[UserDto](provider)
+
+        # act
+        queryable.where(lambda u: u.name == 'John Doe').count()
+        queryable.distinct(lambda u: u.email)
+        queryable.group_by(lambda u: u.name).select(lambda g: {'name': g.key, 'count': g.count()}).to_list()
+        expressions = [ast.unparse(expression) for expression in provider.executed_expressions]
+
+        # assert
+        assert expressions == [
+            "__query.where(lambda u: u.name == 'John Doe').count()",
+            "__query.distinct(lambda u: u.email)",
+            "__query.group_by(lambda u: u.name).select(lambda g: {'name': g.key, 'count': g.count()})"
+        ], f"unexpected expressions '{expressions}'"
+
+    def test_cached_lambda_should_bind_current_values(self):
+        # arrange
+        queryable = Queryable[UserDto](RecordingQueryProvider())
+
+        # act
+        expressions = list[str]()
+        for name in ['John Doe', 'Jane Doe']:
+            expressions.append(ast.unparse(queryable.where(lambda u: u.name == name).expression))
+
+        # assert
+        assert expressions == ["__query.where(lambda u: u.name == 'John Doe')", "__query.where(lambda u: u.name == 'Jane Doe')"], f"unexpected expressions '{expressions}'"
+
+    def test_compiled_query_should_bind_parameters(self):
+        # arrange
+        provider = RecordingQueryProvider()
+        compiled_query = Queryable[UserDto](provider).compile_query(lambda q, name, amount: q.where(lambda u: u.name == name).take(amount))
+
+        # act
+        compiled_query.to_list(name='John Doe', amount=10)
+        compiled_query.to_list(name='Jane Doe', amount=5)
+        expressions = [ast.unparse(expression) for expression in provider.executed_expressions]
+
+        # assert
+        assert expressions == ["__query.where(lambda u: u.name == 'John Doe').take(10)", "__query.where(lambda u: u.name == 'Jane Doe').take(5)"], f"unexpected expressions '{expressions}'"
+
+    def test_compiled_query_with_missing_parameter_should_fail(self):
+        # arrange
+        compiled_query = Queryable[UserDto](RecordingQueryProvider()).compile_query(lambda q, name: q.where(lambda u: u.name == name))
+
+        # act & assert
+        with pytest.raises(Exception):
+            compiled_query.to_list()
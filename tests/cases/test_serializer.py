@@ -1,6 +1,10 @@
+from datetime import datetime
+from decimal import Decimal
+import json
+import pytest
 import uuid
 from neuroglia.serialization.json import JsonSerializer
-from tests.data import TestData, UserDto
+from tests.data import TestData, UserBalanceDto, UserDto, UserMembershipDto, UserProfileDto, UserRole
 
 
 class TestJsonSerializer:
@@ -21,3 +25,53 @@ class TestJsonSerializer:
 
         # assert
         assert vars(to_serialize) == vars(deserialized)
+
+    def test_serialize_slotted_dataclass_should_work(self):
+        # arrange
+        balances = [UserBalanceDto("fake_user_id", Decimal("12.50"), UserRole.MEMBER, datetime(2024, 1, 1, 12)) for _ in range(2)]
+
+        # act
+        serialized = json.loads(self._serializer.serialize_to_text(balances))
+
+        # assert
+        for balance in serialized:
+            assert balance == dict(user_id="fake_user_id", amount="12.50", role="MEMBER", updated_at="2024-01-01T12:00:00")
+
+    def test_deserialize_nested_typed_values_should_work(self):
+        # arrange
+        json = '{"id": "fake_id", "role": "admin", "created_at": "2024-01-01T12:00:00", "memberships": [{"group": "fake_group", "role": "member", "joined_at": "2024-02-01T08:30:00", "expires_at": null}]}'
+
+        # act
+        deserialized = [self._serializer.deserialize_from_text(json, UserProfileDto) for _ in range(2)]
+
+        # assert
+        for profile in deserialized:
+            assert profile.role == UserRole.ADMIN
+            assert profile.created_at == datetime(2024, 1, 1, 12)
+            assert len(profile.memberships) == 1
+            membership = profile.memberships[0]
+            assert isinstance(membership, UserMembershipDto)
+            assert membership.role == UserRole.MEMBER
+            assert membership.joined_at == datetime(2024, 2, 1, 8, 30)
+            assert membership.expires_at is None
+
+    def test_deserialize_invalid_enum_value_should_raise(self):
+        # arrange
+        json = '{"id": "fake_id", "role": "fake_role", "created_at": "2024-01-01T12:00:00", "memberships": []}'
+
+        # act & assert
+        with pytest.raises(ValueError):
+            self._serializer.deserialize_from_text(json, UserProfileDto)
+
+    def test_deserialize_bytes_like_input_should_work(self):
+        # arrange
+        data = self._serializer.serialize(UserDto("fake_id", "John Doe", "john.doe@email.com"))
+
+        # act
+        deserialized = [self._serializer.deserialize(input, UserDto) for input in (data, bytearray(data), memoryview(data))]
+
+        # assert
+        assert isinstance(data, bytes)
+        for user in deserialized:
+            assert isinstance(user, UserDto)
+            assert vars(user) == dict(id="fake_id", name="John Doe", email="john.doe@email.com")
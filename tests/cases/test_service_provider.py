@@ -1,4 +1,8 @@
+from neuroglia.data.infrastructure.abstractions import Repository
+from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
+from neuroglia.data.queries.generic import GetByIdQueryHandler
 from neuroglia.dependency_injection.service_provider import ServiceProviderBase, ServiceCollection
+from tests.data import UserDto
 from tests.services import FileLogger, LoggerBase, NullLogger, PrintLogger
 import pytest
 
@@ -91,6 +95,75 @@ class TestServiceProvider:
         # assert
         assert len(loggers) == 3, f'expected 3 loggers, got {len(loggers)}'
 
+    def test_get_closed_generic_service_should_work(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(Repository[UserDto, int], MemoryRepository[UserDto, int])
+        services.add_singleton(Repository[UserDto, str], MemoryRepository[UserDto, str])
+        service_provider = services.build()
+
+        # act
+        repository = service_provider.get_service(Repository[UserDto, str])
+
+        # assert
+        assert repository is not None, 'repository is none'
+        assert repository.__orig_class__ == MemoryRepository[UserDto, str], f"expected repository of type 'MemoryRepository[UserDto, str]', got '{repository.__orig_class__}'"
+
+    def test_try_add_registered_service_should_be_ignored(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(LoggerBase, PrintLogger)
+
+        # act
+        services.try_add_singleton(LoggerBase, FileLogger)
+        services.try_add_transient(LoggerBase, NullLogger)
+        logger = services.build().get_service(LoggerBase)
+
+        # assert
+        assert len(services) == 1, f'expected 1 service descriptor, got {len(services)}'
+        assert isinstance(logger, PrintLogger), f"logger is not of expected type '{PrintLogger.__name__}'"
+
+    def test_contains_should_reflect_list_modifications(self):
+        # arrange
+        services = ServiceCollection()
+        other_services = ServiceCollection()
+        other_services.add_singleton(LoggerBase, PrintLogger)
+        other_services.add_singleton(PrintLogger)
+
+        # act & assert
+        services += other_services
+        assert services.contains(LoggerBase) and services.contains(PrintLogger), "expected the added services to be registered"
+        services.insert(0, other_services[0])
+        services.pop(0)
+        assert services.contains(LoggerBase), "expected the service to remain registered while one of its descriptors is left"
+        services.remove(services[0])
+        assert not services.contains(LoggerBase), "expected the removed service not to be registered"
+        services[0] = other_services[0]
+        assert services.contains(LoggerBase) and not services.contains(PrintLogger), "expected the replaced service not to be registered"
+        services.extend(other_services)
+        del services[1:]
+        assert services.contains(LoggerBase) and not services.contains(PrintLogger), "expected the deleted services not to be registered"
+        services.clear()
+        services.try_add_singleton(LoggerBase, FileLogger)
+        assert len(services) == 1, f'expected 1 service descriptor, got {len(services)}'
+
+    def test_get_transient_generic_service_should_work(self):
+        # arrange
+        services = ServiceCollection()
+        services.add_singleton(Repository[UserDto, str], MemoryRepository[UserDto, str])
+        services.add_transient(GetByIdQueryHandler[UserDto, str])
+        service_provider = services.build()
+        repository = service_provider.get_required_service(Repository[UserDto, str])
+
+        # act
+        handler1 = service_provider.get_required_service(GetByIdQueryHandler[UserDto, str])
+        handler2 = service_provider.get_required_service(GetByIdQueryHandler[UserDto, str])
+
+        # assert
+        assert handler1 is not handler2, 'expected a new transient instance per resolution'
+        assert handler1.repository is repository, 'expected the generic dependency to resolve to the registered singleton'
+        assert handler2.repository is repository, 'expected the generic dependency to resolve to the registered singleton'
+
     def test_create_scope_should_work(self):
         pass
 
@@ -2,7 +2,7 @@ from typing import List
 from neuroglia.core import TypeExtensions
 from neuroglia.core.operation_result import OperationResult
 from neuroglia.mediation.mediator import RequestHandler
-from samples.openbank.application.queries.generic import GetByIdQuery, GetByIdQueryHandler
+from neuroglia.data.queries.generic import GetByIdQuery, GetByIdQueryHandler
 from tests.data import UserDto
 
 
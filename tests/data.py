@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
 from multipledispatch import dispatch
 import uuid
-from neuroglia.data.abstractions import DomainEvent, AggregateRoot, AggregateState, Identifiable
-from neuroglia.mediation.mediator import Command
+from neuroglia.data.abstractions import DomainEvent, AggregateRoot, AggregateState, Identifiable, VersionedState, index
+from neuroglia.mediation.mediator import Command, Query
 
 
 class UserCreatedDomainEventV1(DomainEvent[str]):
@@ -66,12 +69,110 @@ class UserDto(Identifiable):
     email: str
 
 
+@index("name")
+@index("email", unique=True)
+@index("name", "-created_at", name="name_created_at")
+@dataclass
+class IndexedUserDto(Identifiable):
+
+    id: str
+
+    name: str
+
+    email: str
+
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class VersionedUserDto(Identifiable, VersionedState):
+
+    id: str
+
+    name: str
+
+    state_version: int = 0
+
+
+@dataclass
+class AccountDto(Identifiable):
+
+    id: str
+
+    owner_id: str
+
+    balance: Decimal
+
+
+@dataclass
+class OrderDto(Identifiable):
+
+    id: str
+
+    customer_id: str
+
+    quantity: int
+
+    amount: float
+
+    shipped: Optional[bool] = None
+
+
 @dataclass
 class GreetCommand(Command):
 
     greetings: str
 
 
+@dataclass
+class GetUserQuery(Query):
+
+    user_id: str
+
+
+class UserRole(Enum):
+    ADMIN = 'admin'
+    MEMBER = 'member'
+
+
+@dataclass
+class UserMembershipDto:
+
+    group: str
+
+    role: UserRole
+
+    joined_at: datetime
+
+    expires_at: Optional[datetime] = None
+
+
+@dataclass
+class UserProfileDto:
+
+    id: str
+
+    role: UserRole
+
+    created_at: datetime
+
+    memberships: List[UserMembershipDto]
+
+
+@dataclass(slots=True)
+class UserBalanceDto:
+
+    user_id: str
+
+    amount: Decimal
+
+    role: UserRole
+
+    updated_at: datetime
+
+    note: Optional[str] = None
+
+
 class TestData:
 
     id: str
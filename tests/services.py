@@ -1,8 +1,14 @@
 from abc import ABC, abstractclassmethod
+import asyncio
+import copy
+from typing import Generic, List, Optional
 from neuroglia.core.operation_result import OperationResult
-from neuroglia.mediation.mediator import CommandHandler, DomainEventHandler
+from neuroglia.mediation.mediator import CommandHandler, DomainEventHandler, QueryHandler
+from neuroglia.data.abstractions import TEntity, TKey
 from neuroglia.data.infrastructure.abstractions import Repository
-from tests.data import UserCreatedDomainEventV1, UserDto, GreetCommand
+from neuroglia.data.infrastructure.memory.memory_repository import MemoryRepository
+from neuroglia.data.queryable import QueryProvider, Queryable
+from tests.data import GetUserQuery, UserCreatedDomainEventV1, UserEmailChangedDomainEventV1, UserDto, GreetCommand
 
 
 class LoggerBase(ABC):
@@ -39,6 +45,16 @@ class GreetCommandHandler(CommandHandler[GreetCommand, OperationResult[str]]):
         return result
 
 
+class GetUserQueryHandler(QueryHandler[GetUserQuery, OperationResult[UserDto]]):
+
+    executions: int = 0
+
+    async def handle_async(self, query: GetUserQuery) -> OperationResult[UserDto]:
+        GetUserQueryHandler.executions += 1
+        await asyncio.sleep(0.01)
+        return self.ok(UserDto(query.user_id, 'John Doe', 'john.doe@email.com'))
+
+
 class UserCreatedDomainEventV1Handler(DomainEventHandler[UserCreatedDomainEventV1]):
 
     def __init__(self, users: Repository[UserDto, str]):
@@ -48,3 +64,68 @@ class UserCreatedDomainEventV1Handler(DomainEventHandler[UserCreatedDomainEventV
 
     async def handle_async(self, e: UserCreatedDomainEventV1):
         await self.users.add_async(UserDto(e.aggregate_id, e.name, e.email))
+
+
+class UserDomainEventsHandler(DomainEventHandler[UserCreatedDomainEventV1 | UserEmailChangedDomainEventV1]):
+
+    handled_events: list = list()
+
+    async def handle_async(self, e: UserCreatedDomainEventV1 | UserEmailChangedDomainEventV1):
+        self.handled_events.append(e)
+
+
+class SlowUserEmailChangedDomainEventV1Handler(DomainEventHandler[UserEmailChangedDomainEventV1]):
+
+    running: int = 0
+
+    max_running: int = 0
+
+    delay: float = 0.05
+
+    async def handle_async(self, e: UserEmailChangedDomainEventV1):
+        SlowUserEmailChangedDomainEventV1Handler.running += 1
+        SlowUserEmailChangedDomainEventV1Handler.max_running = max(SlowUserEmailChangedDomainEventV1Handler.max_running, SlowUserEmailChangedDomainEventV1Handler.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            SlowUserEmailChangedDomainEventV1Handler.running -= 1
+
+
+class FailingUserEmailChangedDomainEventV1Handler(DomainEventHandler[UserEmailChangedDomainEventV1]):
+
+    async def handle_async(self, e: UserEmailChangedDomainEventV1):
+        raise Exception('Failed to handle the event')
+
+
+class TimingOutUserEmailChangedDomainEventV1Handler(DomainEventHandler[UserEmailChangedDomainEventV1]):
+
+    async def handle_async(self, e: UserEmailChangedDomainEventV1):
+        raise TimeoutError('Timed out waiting for a remote service')
+
+
+class RecordingQueryProvider(QueryProvider):
+
+    def __init__(self, results: list = None):
+        self.results = results if results is not None else []
+        self.executed_expressions = []
+
+    def create_query(self, element_type, expression):
+        return Queryable[element_type](self, expression)
+
+    def execute(self, expression, query_type):
+        self.executed_expressions.append(expression)
+        return list(self.results)
+
+
+class SlowMemoryRepository(Generic[TEntity, TKey], MemoryRepository[TEntity, TKey]):
+    ''' Represents an in-memory repository whose lookups return the entity as it was when they started, after a delay, like a lookup running concurrently with a modification '''
+
+    delay: float = 0.05
+
+    get_count: int = 0
+
+    async def get_async(self, id: TKey, fields: Optional[List[str]] = None) -> Optional[TEntity]:
+        self.get_count += 1
+        entity = copy.deepcopy(await super().get_async(id, fields))
+        await asyncio.sleep(self.delay)
+        return entity